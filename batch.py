@@ -0,0 +1,297 @@
+"""
+Batch mode: run the crew for many LinkedIn profiles concurrently with a bounded worker pool.
+
+Input is a CSV (header: url,name,current_work) or JSONL file with the same fields. Each report is
+written to reports/ as soon as its run finishes, and a JSONL manifest records every finished person
+so a crashed or interrupted batch can be restarted and skips people that already completed.
+"""
+from __future__ import annotations
+
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from pipeline import DEFAULT_PROCESS, PROCESSES
+from prefetch import DEFAULT_AHEAD, Prefetcher
+from report_store import REPORT_DIR, save_telemetry
+from tools.urls import normalize_linkedin_url
+
+DEFAULT_MANIFEST = os.path.join(REPORT_DIR, "batch_manifest.jsonl")
+
+
+def _url_key(url: str) -> str:
+    """
+    Key used to match people between the input file and the manifest: the normalized profile URL, so
+    country subdomains, locale paths and tracking query strings do not make the same person new.
+    """
+    return normalize_linkedin_url(url)
+
+
+def load_people(path: str) -> list[dict]:
+    """
+    Read people from a CSV (with a url,name,current_work header) or a JSONL file.
+    Rows without a url are skipped; empty name/current_work become None.
+    """
+    people = []
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.lower().endswith((".jsonl", ".ndjson")):
+            rows = [json.loads(line) for line in f if line.strip()]
+        else:
+            rows = list(csv.DictReader(f))
+    for row in rows:
+        url = (row.get("url") or row.get("linkedin_url") or "").strip()
+        if not url:
+            continue
+        people.append({
+            "url": url,
+            "name": (row.get("name") or "").strip() or None,
+            "current_work": (row.get("current_work") or "").strip() or None,
+        })
+    return people
+
+
+def load_completed(manifest_path: str) -> set[str]:
+    """Return the URL keys of people recorded as done in the manifest (later records win)."""
+    status_by_key = {}
+    if not os.path.exists(manifest_path):
+        return set()
+    with open(manifest_path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Partially written line from a crash; the person is simply re-run.
+            status_by_key[_url_key(record.get("url", ""))] = record.get("status")
+    return {key for key, status in status_by_key.items() if status == "done"}
+
+
+def _append_manifest(manifest_path: str, record: dict) -> None:
+    os.makedirs(os.path.dirname(manifest_path) or ".", exist_ok=True)
+    with open(manifest_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def run_one(
+    person: dict,
+    report_dir: str = REPORT_DIR,
+    refresh: bool = False,
+    interests_buffer=None,
+    process: str = DEFAULT_PROCESS,
+) -> dict:
+    """
+    Run the crew for one person and save the report. Top-level so process pools can pickle it.
+    interests_buffer (thread executor only) collects my_interests.md appends for one write at the end.
+    Returns a manifest record; failures are captured rather than raised so one bad profile
+    does not stop the batch.
+    """
+    from main import research_person
+    from telemetry import RunTelemetry
+
+    started = time.perf_counter()
+    record = {"url": person["url"], "name": person.get("name")}
+    telemetry = RunTelemetry(person["url"], name=person.get("name"))
+    report_path = None
+    try:
+        _, report_path, mode = research_person(
+            person["url"],
+            name=person.get("name"),
+            current_work=person.get("current_work"),
+            verbose=False,
+            refresh=refresh,
+            telemetry=telemetry,
+            interests_buffer=interests_buffer,
+            report_dir=report_dir,
+            process=process,
+        )
+        record["mode"] = mode
+        if report_path:
+            record.update(status="done", report_path=report_path)
+        else:
+            record.update(status="failed", error="Crew produced no output")
+    except Exception as e:
+        record.update(status="failed", error="{}: {}".format(type(e).__name__, e))
+    try:
+        telemetry_path = save_telemetry(
+            telemetry, person["url"], name=person.get("name"), report_path=report_path, report_dir=report_dir
+        )
+        record["telemetry_path"] = telemetry_path
+        summary = telemetry.summary()
+        record["cost_usd"] = summary["cost_usd"]["total"]
+        if summary["budget"] and summary["budget"]["exceeded"]:
+            record["budget_exceeded"] = summary["budget"]["exceeded"]
+    except OSError as e:
+        print("Could not write telemetry for {}: {}".format(person["url"], e))
+    record["seconds"] = round(time.perf_counter() - started, 2)
+    record["finished_at"] = datetime.now().isoformat(timespec="seconds")
+    return record
+
+
+def run_batch(
+    people: list[dict],
+    workers: int = 4,
+    executor: str = "thread",
+    manifest_path: str = DEFAULT_MANIFEST,
+    report_dir: str = REPORT_DIR,
+    refresh: bool = False,
+    dry_run: bool = False,
+    process: str = DEFAULT_PROCESS,
+    prefetch_ahead: int = DEFAULT_AHEAD,
+) -> list[dict]:
+    """
+    Run the crew for every person not already completed in the manifest.
+    executor is "thread" (shares one interpreter and imports) or "process" (isolates runs).
+    refresh=True ignores cached Proxycurl profiles and Firecrawl results and forces full runs.
+    dry_run=True only reports who would run; crewai is never imported.
+    process is "hierarchical" or "pipeline" (see pipeline.py).
+    prefetch_ahead is how many queued people beyond the running ones get their profile and first
+    searches fetched into the tool caches in the background (see prefetch.py); 0 disables it.
+    Returns the manifest records written by this invocation.
+    """
+    from main import validate_linkedin_url
+
+    completed = load_completed(manifest_path)
+    seen = set()
+    pending = []
+    for person in people:
+        url_error = validate_linkedin_url(person["url"])
+        if url_error:
+            print("Skipping: {}".format(url_error))
+            continue
+        key = _url_key(person["url"])
+        if key in completed or key in seen:
+            continue
+        seen.add(key)
+        pending.append(person)
+
+    skipped = len(people) - len(pending)
+    print("Batch: {} people, {} already done, duplicate or invalid, {} to run with {} {} workers".format(
+        len(people), skipped, len(pending), workers, executor))
+    if dry_run:
+        for person in pending:
+            print("  would run: {} {}".format(person["url"], person.get("name") or ""))
+        return []
+    if not pending:
+        return []
+
+    # Threads share one buffer of my_interests.md appends, written once when the batch ends, so runs
+    # do not contend for the file. Processes cannot share it and append directly (under a file lock).
+    interests_buffer = None
+    if executor != "process":
+        from tools.interests import InterestBuffer
+
+        interests_buffer = InterestBuffer()
+
+    # The first `workers` people start at once; prefetch the queue behind them (not with --refresh,
+    # whose runs bypass the caches).
+    prefetcher = None
+    if prefetch_ahead > 0 and not refresh and len(pending) > workers:
+        prefetcher = Prefetcher(pending[workers:], ahead=prefetch_ahead, report_dir=report_dir).start()
+
+    pool_cls = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+    records = []
+    started = time.perf_counter()
+    try:
+        with pool_cls(max_workers=workers) as pool:
+            futures = {pool.submit(run_one, person, report_dir, refresh, interests_buffer, process): person for person in pending}
+            for future in as_completed(futures):
+                record = future.result()
+                # Only this (main) thread writes the manifest, so appends never interleave.
+                _append_manifest(manifest_path, record)
+                records.append(record)
+                if prefetcher:
+                    # Each finished run frees a worker for the next queued person.
+                    prefetcher.advance(len(records))
+                print("[{}/{}] {} {} ({}s){}".format(
+                    len(records), len(pending), record["status"].upper(), record["url"], record["seconds"],
+                    " -> " + record["report_path"] if record.get("report_path") else " - " + record.get("error", "")))
+    finally:
+        if prefetcher:
+            prefetcher.stop()
+            print("Prefetched {people} people ({profiles} profiles, {queries} searches, {errors} errors)".format(
+                **prefetcher.stats))
+        # After the pool has shut down, so appends from every finished run are included.
+        if interests_buffer is not None and len(interests_buffer):
+            added = interests_buffer.flush()
+            print("Added {} new interest(s) to my_interests.md".format(len(added)))
+
+    elapsed = time.perf_counter() - started
+    done = sum(1 for r in records if r["status"] == "done")
+    print("\nBatch finished: {} done, {} failed in {:.1f}s ({:.1f} runs/hour)".format(
+        done, len(records) - done, elapsed, len(records) / elapsed * 3600 if elapsed else 0.0))
+    return records
+
+
+if __name__ == "__main__":
+    import argparse
+
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass  # .env not loaded if python-dotenv not installed
+
+    parser = argparse.ArgumentParser(
+        description="Run the Conversation Starter crew for many LinkedIn profiles in parallel."
+    )
+    parser.add_argument("input", help="CSV (url,name,current_work header) or JSONL file of people to research")
+    parser.add_argument("--workers", type=int, default=4, help="Number of crews to run at once (default: 4)")
+    parser.add_argument(
+        "--executor",
+        choices=["thread", "process"],
+        default="thread",
+        help="Worker pool type: threads share imports; processes isolate runs (default: thread)",
+    )
+    parser.add_argument(
+        "--manifest",
+        default=DEFAULT_MANIFEST,
+        help="JSONL manifest of finished people; completed entries are skipped on resume (default: {})".format(DEFAULT_MANIFEST),
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore cached LinkedIn profiles and web search results and call the APIs again",
+    )
+    parser.add_argument(
+        "--process",
+        choices=PROCESSES,
+        default=DEFAULT_PROCESS,
+        help="hierarchical (Orchestrator manager) or pipeline (fixed task DAG, no manager calls) (default: {})".format(
+            DEFAULT_PROCESS),
+    )
+    parser.add_argument(
+        "--prefetch",
+        type=int,
+        default=DEFAULT_AHEAD,
+        help="Queued people whose LinkedIn profile and first web searches are fetched into the caches while "
+             "earlier runs are busy; 0 disables (default: {})".format(DEFAULT_AHEAD),
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only list who would run (after manifest and URL checks); does not load crewai",
+    )
+    args = parser.parse_args()
+
+    from main import missing_env_keys
+
+    missing = missing_env_keys()
+    if missing and not args.dry_run:
+        parser.error("Missing required environment variables: {} (set them in .env)".format(", ".join(missing)))
+
+    run_batch(
+        load_people(args.input),
+        workers=max(1, args.workers),
+        executor=args.executor,
+        manifest_path=args.manifest,
+        refresh=args.refresh,
+        dry_run=args.dry_run,
+        process=args.process,
+        prefetch_ahead=max(0, args.prefetch),
+    )
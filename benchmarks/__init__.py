@@ -0,0 +1,3 @@
+"""
+Offline benchmark harness: stand-in API servers, a scripted LLM and synthetic profiles.
+"""
@@ -0,0 +1,73 @@
+"""
+Synthetic people for offline benchmarks. Everything is derived deterministically from the index,
+so the stand-in Proxycurl server can rebuild a profile from its LinkedIn slug alone.
+"""
+from __future__ import annotations
+
+import random
+
+FIRST_NAMES = ["Ada", "Grace", "Alan", "Linus", "Margaret", "Ken", "Barbara", "Dennis", "Frances", "Edsger"]
+LAST_NAMES = ["Lovelace", "Hopper", "Turing", "Torvalds", "Hamilton", "Thompson", "Liskov", "Ritchie", "Allen", "Dijkstra"]
+COMPANIES = ["Acme Inc", "Globex Corp", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Enterprises", "Hooli", "Pied Piper"]
+TITLES = ["Software Engineer", "Senior Engineer", "Staff Engineer", "Engineering Manager", "Director of Engineering", "VP Engineering", "CTO"]
+SCHOOLS = ["MIT", "Stanford University", "ETH Zurich", "University of Waterloo", "IIT Bombay"]
+SKILLS = ["Python", "Distributed Systems", "Leadership", "Kubernetes", "Machine Learning", "Product Strategy", "Go", "Rust"]
+
+SLUG_PREFIX = "bench-person-"
+
+
+def person(index: int) -> dict:
+    """Batch-style input row (url, name, current_work) for synthetic person index."""
+    profile = profile_for(index)
+    current = profile["experiences"][0]
+    return {
+        "url": f"https://www.linkedin.com/in/{SLUG_PREFIX}{index}/",
+        "name": profile["full_name"],
+        "current_work": f"{current['title']} at {current['company']}",
+    }
+
+
+def corpus(size: int) -> list[dict]:
+    return [person(i) for i in range(size)]
+
+
+def index_from_url(linkedin_url: str) -> int | None:
+    """Recover the synthetic index from a profile URL, or None if it is not a benchmark profile."""
+    slug = linkedin_url.rstrip("/").split("/")[-1]
+    if not slug.startswith(SLUG_PREFIX):
+        return None
+    try:
+        return int(slug[len(SLUG_PREFIX):])
+    except ValueError:
+        return None
+
+
+def profile_for(index: int) -> dict:
+    """Proxycurl-shaped profile JSON. Role counts vary from 2 to 30 to cover stub and senior profiles."""
+    rng = random.Random(index)
+    full_name = f"{FIRST_NAMES[index % len(FIRST_NAMES)]} {LAST_NAMES[(index // len(FIRST_NAMES)) % len(LAST_NAMES)]}"
+    year = 2025
+    experiences = []
+    for _ in range(rng.choice([2, 3, 5, 8, 12, 30])):
+        years = rng.randint(1, 4)
+        experiences.append({
+            "title": rng.choice(TITLES),
+            "company": rng.choice(COMPANIES),
+            "starts_at": {"year": year - years, "month": rng.randint(1, 12)},
+            "ends_at": None if not experiences else {"year": year, "month": rng.randint(1, 12)},
+            "description": " ".join(rng.choice(SKILLS) for _ in range(rng.randint(5, 40))),
+        })
+        year -= years
+    return {
+        "full_name": full_name,
+        "headline": f"{experiences[0]['title']} at {experiences[0]['company']}",
+        "summary": f"{full_name} builds {rng.choice(SKILLS).lower()} products and mentors engineers.",
+        "experiences": experiences,
+        "education": [{"school": rng.choice(SCHOOLS), "degree_name": "BSc", "field_of_study": "Computer Science"}],
+        "skills": rng.sample(SKILLS, k=5),
+        "languages": ["English"],
+        "certifications": [],
+        "volunteer_work": [{"title": "Mentor", "company": "Code Club"}] if index % 3 == 0 else [],
+        "accomplishment_publications": [{"name": f"Notes on {rng.choice(SKILLS)}"}] if index % 4 == 0 else [],
+        "accomplishment_projects": [{"title": f"Open-source {rng.choice(SKILLS)} toolkit"}] if index % 2 == 0 else [],
+    }
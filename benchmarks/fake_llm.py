@@ -0,0 +1,139 @@
+"""
+Scripted stand-in for the OpenAI chat model. Produces replies (tool calls, delegations and final
+answers) from the prompt alone, so a whole crew can run without network access. Requests that pass
+native tool schemas ("tools", as CrewAI 1.x sends them) get native tool calls; others get CrewAI's
+ReAct text format.
+"""
+from __future__ import annotations
+
+import json
+import re
+import uuid
+
+# Task description fragment -> coworker role the manager delegates that task to.
+DELEGATION_RULES = [
+    ("Produce a summary of this person's career vibe", "Web Researcher"),
+    ("Read my_interests.md", "Personal Context Agent"),
+    ("You receive the Web Researcher's summary", "Research Evidence Filter"),
+    ("Evaluate the FILTERED research", "Review & Critique Agent"),
+    ("Produce a Markdown report", "Question Architect"),
+]
+MAX_STEPS = 3
+
+
+def _text(message: dict) -> str:
+    content = message.get("content") or ""
+    return content if isinstance(content, str) else json.dumps(content)
+
+
+def _action(tool: str, args: dict) -> tuple:
+    return ("tool", tool, args)
+
+
+def _final(answer: str) -> tuple:
+    return ("final", answer)
+
+
+def _tool_key(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+
+
+def _observations(messages: list[dict]) -> list[str]:
+    """
+    Tool results seen so far: native "tool" messages, or the 'Observation: ...' text CrewAI appends
+    after the opening system/user prompt in ReAct mode.
+    """
+    found = []
+    for message in messages[2:]:
+        if message.get("role") == "tool":
+            found.append(_text(message).strip())
+            continue
+        for chunk in _text(message).split("Observation:")[1:]:
+            found.append(chunk.strip())
+    return found
+
+
+def respond(messages: list[dict], tools: list[dict] | None = None) -> dict:
+    """
+    Next assistant message for a CrewAI conversation. tools are the request's native tool schemas;
+    with them, tool use is answered with tool_calls instead of ReAct text.
+    """
+    if tools:
+        native = {_tool_key(t.get("function", {}).get("name", "")): t["function"]["name"] for t in tools
+                  if t.get("function", {}).get("name")}
+        decision = _decide(messages, set(native.values()))
+        if decision[0] == "tool":
+            return {"role": "assistant", "content": None, "tool_calls": [{
+                "id": "call_" + uuid.uuid4().hex[:12],
+                "type": "function",
+                "function": {"name": native[_tool_key(decision[1])], "arguments": json.dumps(decision[2])},
+            }]}
+        return {"role": "assistant", "content": decision[1]}
+
+    prompt = "\n".join(_text(m) for m in messages[:2])
+    decision = _decide(messages, set(re.findall(r"Tool Name: (.+?)\n", prompt)))
+    if decision[0] == "tool":
+        tool, args = decision[1], decision[2]
+        content = f"Thought: I should use {tool}.\nAction: {tool}\nAction Input: {json.dumps(args)}"
+    else:
+        content = f"Thought: I now know the final answer\nFinal Answer: {decision[1]}"
+    return {"role": "assistant", "content": content}
+
+
+def _decide(messages: list[dict], available: set[str]) -> tuple:
+    """("tool", name, args) or ("final", answer); available tools are matched by name in either format."""
+    prompt = "\n".join(_text(m) for m in messages[:2])
+    role_match = re.search(r"You are (.+?)\.", prompt)
+    role = role_match.group(1).strip() if role_match else ""
+    tools = {_tool_key(name) for name in available}
+    observations = _observations(messages)
+    step = len(observations)
+    last = observations[-1] if observations else ""
+
+    if step >= MAX_STEPS:
+        return _final(last or "Done.")
+
+    if role == "Orchestrator":
+        # Manager: delegate the current task to its owner once, then pass the result through.
+        if step == 0:
+            for fragment, coworker in DELEGATION_RULES:
+                if fragment in prompt:
+                    return _action("Delegate work to coworker", {
+                        "task": fragment, "context": prompt[-6000:], "coworker": coworker,
+                    })
+        return _final(last or "Task completed.")
+
+    if role == "Web Researcher":
+        url = re.search(r"https?://[^\s\"']*linkedin\.com/in/[^\s\"'.,)]+/?", prompt)
+        name = re.search(r'name is \\?"([^"\\]+)', prompt)
+        if step == 0 and _tool_key("LinkedIn Profile Scraper") in tools and url:
+            return _action("LinkedIn Profile Scraper", {"linkedin_url": url.group(0)})
+        if step <= 1 and _tool_key("Firecrawl Multi Search") in tools:
+            who = name.group(1) if name else "the person"
+            return _action("Firecrawl Multi Search", {"queries": [f'"{who}"', f"{who} talk", f"{who} blog"]})
+        sources = re.findall(r"^\[(W\d+)\]", "\n".join(observations), re.MULTILINE)[:5]
+        bullets = "\n".join(f"- Worked on notable projects ({s})." for s in sources)
+        return _final(f"## Career vibe\n{observations[0][:1500] if observations else 'Not found.'}\n\n## Key achievements\n{bullets}")
+
+    if role == "Personal Context Agent":
+        read_tool = next((t for t in available if "read" in t.lower()), None)
+        if step == 0 and read_tool:
+            return _action(read_tool, {})
+        return _final(f"Focus areas and interests:\n{last[:800]}")
+
+    if role == "Research Evidence Filter":
+        return _final("Removed items:\n- none\n\nFiltered summary:\n" + prompt[-2000:])
+
+    if role == "Review & Critique Agent":
+        return _final("APPROVED: the filtered research is substantive and grounded. Hand off to the Question Architect.")
+
+    if role == "Question Architect":
+        questions = "\n".join(f"{i}. What did you learn from role {i}?" for i in range(1, 11))
+        starters = "\n".join(f"{i}. I noticed your work on project {i}." for i in range(1, 11))
+        return _final(
+            "# Report\n\n## Career Vibe\n" + ("A grounded narrative paragraph. " * 20) +
+            "\n\n## Key Points\n- Point one\n- Point two\n\n## 10 Pointed Questions\n" + questions +
+            "\n\n## 10 Conversation Starters\n" + starters
+        )
+
+    return _final(last or "Done.")
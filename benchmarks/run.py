@@ -0,0 +1,162 @@
+"""
+Offline end-to-end benchmark: runs run_crew over synthetic profiles against local stand-in
+Proxycurl, Firecrawl and OpenAI servers, and reports throughput, latency percentiles, per-stage time
+and cold import time.
+
+    python -m benchmarks.run --profiles 20 --workers 4 --llm-latency-ms 300 --api-latency-ms 150 --error-rate 0.05
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks import corpus
+from benchmarks.stub_servers import FirecrawlHandler, OpenAIHandler, ProxycurlHandler, StubConfig, start_server
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+# Run in a fresh interpreter so nothing is already imported: time to a usable CLI (main) and the
+# additional time to load the crew stack that run_crew imports on first use.
+_IMPORT_TIMER = """
+import json, time
+t0 = time.perf_counter()
+import main
+t1 = time.perf_counter()
+import crewai, agents, tasks
+t2 = time.perf_counter()
+print(json.dumps({"cli": round(t1 - t0, 3), "crew_stack": round(t2 - t1, 3)}))
+"""
+
+
+def measure_import_times() -> dict:
+    """Cold import times in seconds for the CLI module and for the crewai stack loaded on first run."""
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    completed = subprocess.run(
+        [sys.executable, "-c", _IMPORT_TIMER], cwd=project_root, capture_output=True, text=True, timeout=300
+    )
+    if completed.returncode != 0:
+        return {"error": completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "import failed"}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def configure_environment(args) -> list:
+    """Start the stand-in servers and point the tools and LLM client at them. Must run before importing main."""
+    servers = []
+    for handler, latency, env_var, path in [
+        (ProxycurlHandler, args.api_latency_ms, "PROXYCURL_API_URL", "/api/v2/linkedin"),
+        (FirecrawlHandler, args.api_latency_ms, "FIRECRAWL_API_URL", "/v1/search"),
+        (OpenAIHandler, args.llm_latency_ms, "OPENAI_API_BASE", "/v1"),
+    ]:
+        server, base_url = start_server(handler, StubConfig(latency_ms=latency, error_rate=args.error_rate))
+        servers.append(server)
+        os.environ[env_var] = base_url + path
+    os.environ["OPENAI_BASE_URL"] = os.environ["OPENAI_API_BASE"]
+    for key in ("OPENAI_API_KEY", "PROXYCURL_API_KEY", "FIRECRAWL_API_KEY"):
+        os.environ[key] = "bench"
+    # Fresh cache per benchmark unless one is given, so cold-cache behaviour is measured.
+    os.environ["CACHE_DB_PATH"] = args.cache_db or os.path.join(tempfile.mkdtemp(prefix="bench-cache-"), "cache.sqlite3")
+    # The stand-ins have no rate limits; the shared limiter would only add sleeps to what is measured.
+    from tools.rate_limit import DEFAULT_LIMITS
+
+    for provider in DEFAULT_LIMITS:
+        for kind in ("RPM", "TPM", "DAILY"):
+            os.environ["RATE_LIMIT_{}_{}".format(provider.upper(), kind)] = "0"
+    os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+    os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+    return servers
+
+
+def run_benchmark(people: list[dict], workers: int, process: str = "hierarchical") -> dict:
+    from main import run_crew
+    from telemetry import RunTelemetry
+
+    def run_person(person: dict) -> dict:
+        telemetry = RunTelemetry(person["url"], name=person["name"])
+        try:
+            run_crew(person["url"], name=person["name"], current_work=person["current_work"],
+                     verbose=False, telemetry=telemetry, process=process)
+        except Exception as e:
+            if telemetry.status == "running":
+                telemetry.finish("failed", f"{type(e).__name__}: {e}")
+        return telemetry.summary()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        summaries = list(pool.map(run_person, people))
+    elapsed = time.perf_counter() - started
+
+    latencies = [s["wall_seconds"] or 0.0 for s in summaries if s["status"] == "done"]
+    stage_seconds: dict[str, list[float]] = {}
+    tool_seconds: dict[str, list[float]] = {}
+    for s in summaries:
+        for task in s["tasks"]:
+            stage_seconds.setdefault(task["task"], []).append(task["seconds"])
+        for call in s["tool_calls"]:
+            tool_seconds.setdefault(call["tool"], []).append(call["seconds"])
+    return {
+        "runs": len(summaries),
+        "succeeded": len(latencies),
+        "failed": len(summaries) - len(latencies),
+        "workers": workers,
+        "process": process,
+        "elapsed_seconds": round(elapsed, 3),
+        "runs_per_minute": round(len(summaries) / elapsed * 60, 2) if elapsed else 0.0,
+        "latency_p50_seconds": round(_percentile(latencies, 50), 3),
+        "latency_p95_seconds": round(_percentile(latencies, 95), 3),
+        "stage_mean_seconds": {k: round(statistics.mean(v), 3) for k, v in stage_seconds.items()},
+        "tool_mean_seconds": {k: round(statistics.mean(v), 3) for k, v in tool_seconds.items()},
+        "llm_calls_per_run": round(statistics.mean(s["totals"]["llm_calls"] for s in summaries), 2) if summaries else 0,
+        "tokens_per_run": round(statistics.mean(
+            s["totals"]["input_tokens"] + s["totals"]["output_tokens"] for s in summaries), 1) if summaries else 0,
+        "tool_calls": sum(len(s["tool_calls"]) for s in summaries),
+        "errors": sorted({s["error"] for s in summaries if s["error"]}),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline benchmark of the Conversation Starter pipeline.")
+    parser.add_argument("--profiles", type=int, default=10, help="Number of synthetic people (default: 10)")
+    parser.add_argument("--workers", type=int, default=1, help="Concurrent runs (default: 1)")
+    parser.add_argument("--llm-latency-ms", type=float, default=200.0, help="Mean stand-in LLM latency (default: 200)")
+    parser.add_argument("--api-latency-ms", type=float, default=100.0, help="Mean Proxycurl/Firecrawl latency (default: 100)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of stand-in requests failing with 429/5xx")
+    parser.add_argument("--cache-db", default=None, help="Tool cache database to use (default: a fresh temporary one)")
+    parser.add_argument("--process", choices=["hierarchical", "pipeline"], default="hierarchical",
+                        help="Crew process to benchmark (default: hierarchical)")
+    parser.add_argument("--json", dest="json_path", default=None, help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    import_seconds = measure_import_times()
+    servers = configure_environment(args)
+    try:
+        results = run_benchmark(corpus.corpus(args.profiles), max(1, args.workers), args.process)
+    finally:
+        for server in servers:
+            server.shutdown()
+    results["import_seconds"] = import_seconds
+
+    print(json.dumps(results, indent=2))
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    # Runs that never call a tool leave the tool and caching path unmeasured: not a valid result.
+    if results["succeeded"] and not results["tool_calls"]:
+        print("Benchmark invalid: no tool calls were recorded (the fake LLM's replies did not trigger any tools)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Local stand-in HTTP servers for Proxycurl (/api/v2/linkedin), Firecrawl (/v1/search) and the OpenAI
+chat completions API (/v1/chat/completions), each with configurable latency and error rate.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks import corpus, fake_llm
+
+
+@dataclass
+class StubConfig:
+    """Per-server behaviour: mean latency (jittered +/-50%) and the share of requests failing with 429/5xx."""
+
+    latency_ms: float = 100.0
+    error_rate: float = 0.0
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    config: StubConfig = StubConfig()
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real APIs
+
+    def log_message(self, format, *args):  # noqa: A002 - silence per-request logging
+        pass
+
+    def _delay_and_maybe_fail(self) -> bool:
+        """Sleep for the configured latency; return True (after replying) if this request should fail."""
+        time.sleep(self.config.latency_ms / 1000 * random.uniform(0.5, 1.5))
+        if random.random() < self.config.error_rate:
+            status = random.choice([429, 500, 503])
+            body = json.dumps({"error": "injected failure"}).encode()
+            self.send_response(status)
+            if status == 429:
+                self.send_header("Retry-After", "0")
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return True
+        return False
+
+    def _reply(self, payload: dict, status: int = 200) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json_body(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+
+class ProxycurlHandler(_StubHandler):
+    def do_GET(self):
+        if self._delay_and_maybe_fail():
+            return
+        params = parse_qs(urlsplit(self.path).query)
+        index = corpus.index_from_url((params.get("url") or [""])[0])
+        if index is None:
+            self._reply({"code": 404, "description": "Person not found"}, status=404)
+            return
+        self._reply(corpus.profile_for(index))
+
+
+class FirecrawlHandler(_StubHandler):
+    def do_POST(self):
+        if self._delay_and_maybe_fail():
+            return
+        payload = self._json_body()
+        query = payload.get("query", "")
+        limit = int(payload.get("limit", 8))
+        quoted = re.findall(r'"([^"]+)"', query)
+        who = quoted[0] if quoted else " ".join(query.split()[:2])
+        results = []
+        for i in range(limit):
+            # Half the URLs depend only on the person, so different queries overlap like real searches do.
+            seed = f"{who}:{i}" if i % 2 == 0 else f"{query}:{i}"
+            digest = hashlib.sha1(seed.encode()).hexdigest()[:10]
+            about = who if i % 3 != 2 else "Someone Else"
+            results.append({
+                "title": f"{about} - article {digest}",
+                "url": f"https://example.com/{digest}",
+                "description": f"{about} spoke about engineering at a conference. " * 3,
+            })
+        self._reply({"success": True, "data": results})
+
+
+class OpenAIHandler(_StubHandler):
+    def do_POST(self):
+        if self._delay_and_maybe_fail():
+            return
+        payload = self._json_body()
+        messages = payload.get("messages") or []
+        message = fake_llm.respond(messages, payload.get("tools"))
+        content = message.get("content") or json.dumps(message.get("tool_calls") or [])
+        prompt_tokens = sum(len(str(m.get("content", ""))) for m in messages) // 4
+        self._reply({
+            "id": "chatcmpl-bench",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "gpt-4o-mini"),
+            "choices": [{
+                "index": 0,
+                "message": message,
+                "finish_reason": "tool_calls" if message.get("tool_calls") else "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": len(content) // 4,
+                "total_tokens": prompt_tokens + len(content) // 4,
+            },
+        })
+
+
+def start_server(handler_cls: type, config: StubConfig) -> tuple[ThreadingHTTPServer, str]:
+    """Serve handler_cls on an ephemeral localhost port in a daemon thread; returns (server, base_url)."""
+    handler = type(handler_cls.__name__, (handler_cls,), {"config": config})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
@@ -0,0 +1,207 @@
+"""
+Change detection for repeat runs on the same person.
+
+Each saved report gets a fingerprint of its research inputs (per-section hashes of the Proxycurl
+profile, the web result URLs of the run's first searches, the my_interests.md hash) plus the
+filtered research summary. A new run first re-fetches those inputs, which normally costs only cache
+lookups, and compares them:
+
+- nothing changed                 -> reuse the previous report (no crew run)
+- only my_interests.md changed    -> skip research and filtering; reuse the previous filtered summary
+- profile or web results changed  -> incremental "what's new" research seeded with the previous summary
+- no usable fingerprint           -> full run
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from personal_context import interests_hash
+from report_store import REPORT_DIR, latest_fingerprint
+from tools.urls import normalize_linkedin_url, normalize_query, normalize_result_url
+
+FULL = "full"
+REUSED = "reused"
+CONTEXT_ONLY = "context_only"
+INCREMENTAL = "incremental"
+
+# Reports older than this are never reused or extended; the person gets a full run.
+MAX_AGE_DAYS = float(os.getenv("CHANGE_DETECTION_MAX_AGE_DAYS", "30"))
+# Web results are fingerprinted from this many of the run's queries, re-run (usually from cache) on the next check.
+MAX_FINGERPRINT_QUERIES = 3
+# Proxycurl fields that change without the person's career changing (signed image URLs, counts).
+VOLATILE_PROFILE_KEYS = {"profile_pic_url", "background_cover_image_url", "follower_count", "connections", "meta"}
+
+
+def _hash(value) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+
+def profile_sections(profile: dict | None) -> dict[str, str]:
+    """Hash of each non-empty, non-volatile top-level profile field, so changes can be named."""
+    if not isinstance(profile, dict):
+        return {}
+    return {
+        key: _hash(value)
+        for key, value in sorted(profile.items())
+        if key not in VOLATILE_PROFILE_KEYS and value not in (None, "", [], {})
+    }
+
+
+@dataclass
+class ChangeCheck:
+    """Outcome of comparing a person's current research inputs with their last fingerprint."""
+
+    status: str
+    profile_key: str
+    previous: dict | None = None
+    changes: list[str] = field(default_factory=list)
+    profile_sections: dict[str, str] = field(default_factory=dict)
+    companies: list[str] = field(default_factory=list)
+    # Size of the profile as the crew sees it (before any budget), a model routing signal (routing.py).
+    profile_tokens: int | None = None
+    interests_hash: str | None = None
+    # Filled in by run_crew: the filter task's output and the run's search queries.
+    filtered_summary: str | None = None
+    queries: list[str] = field(default_factory=list)
+
+    @property
+    def prior_summary(self) -> str | None:
+        """Previous filtered summary to seed this run with (None for full and reused runs)."""
+        if self.status in (CONTEXT_ONLY, INCREMENTAL) and self.previous:
+            return self.previous.get("filtered_summary")
+        return None
+
+    def fingerprint(self) -> dict:
+        """Fingerprint of this run, to save next to its report."""
+        previous = self.previous or {}
+        summary = self.filtered_summary or (previous.get("filtered_summary") if self.status == CONTEXT_ONLY else None)
+        # Keep the previous queries after the run's own so later checks still cover them.
+        queries = _unique(self.queries + (previous.get("web_queries") or []))[:MAX_FINGERPRINT_QUERIES]
+        return {
+            "profile_key": self.profile_key,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "profile_sections": self.profile_sections,
+            "web_queries": queries,
+            "web_urls": sorted(web_urls(queries)),
+            "interests_hash": self.interests_hash,
+            "filtered_summary": summary,
+        }
+
+
+def _unique(items: list[str]) -> list[str]:
+    seen, unique = set(), []
+    for item in items:
+        key = normalize_query(item)
+        if key and key not in seen:
+            seen.add(key)
+            unique.append(item)
+    return unique
+
+
+def _tool_call(telemetry, tool_name: str):
+    from tools.base import new_call_record
+
+    return telemetry.tool_call(tool_name) if telemetry else nullcontext(new_call_record())
+
+
+def fetch_profile(linkedin_url: str, refresh: bool = False, telemetry=None) -> dict | None:
+    """Proxycurl profile JSON (cached like the crew's lookups); None without a key or on error."""
+    if not os.getenv("PROXYCURL_API_KEY"):
+        return None
+    from tools.linkedin_tool import LinkedInTool
+
+    tool = LinkedInTool(refresh=refresh)
+    with _tool_call(telemetry, tool.name) as call:
+        try:
+            return tool.fetch_profile(linkedin_url, call)
+        except Exception as e:
+            call["error"] = f"{type(e).__name__}: {e}"
+            return None
+
+
+def profile_companies(profile: dict | None) -> list[str]:
+    """Distinct companies from the profile's experience, most recent first."""
+    companies = []
+    for experience in (profile or {}).get("experiences") or []:
+        company = (experience or {}).get("company")
+        if company and company not in companies:
+            companies.append(company)
+    return companies
+
+
+def profile_tokens(profile: dict | None) -> int | None:
+    """Tokens of the full profile text the LinkedIn tool would render; None without a profile."""
+    if not isinstance(profile, dict):
+        return None
+    from tools.evidence import Profile
+    from tools.tokens import count_tokens
+
+    return count_tokens(Profile.from_proxycurl(profile).render())
+
+
+def web_urls(queries: list[str], telemetry=None) -> set[str]:
+    """Normalized result URLs for queries (cached like the crew's searches); failed queries are skipped."""
+    if not queries or not os.getenv("FIRECRAWL_API_KEY"):
+        return set()
+    from tools.firecrawl_search_tool import FirecrawlSearchTool
+
+    tool = FirecrawlSearchTool()
+    urls = set()
+    for query in queries:
+        with _tool_call(telemetry, tool.name) as call:
+            try:
+                results = tool.search(query, call=call)
+            except Exception as e:
+                call["error"] = f"{type(e).__name__}: {e}"
+                continue
+        urls.update(normalize_result_url(r["url"]) for r in results if r.get("url"))
+    return urls
+
+
+def check_changes(linkedin_url: str, refresh: bool = False, telemetry=None, report_dir: str = REPORT_DIR) -> ChangeCheck:
+    """
+    Compare the person's current research inputs with the fingerprint of their last report.
+    refresh=True always means a full run (the profile is still fetched, fresh, for the new fingerprint).
+    """
+    profile_key = normalize_linkedin_url(linkedin_url)
+    profile = fetch_profile(linkedin_url, refresh=refresh, telemetry=telemetry)
+    check = ChangeCheck(
+        status=FULL,
+        profile_key=profile_key,
+        profile_sections=profile_sections(profile),
+        companies=profile_companies(profile),
+        profile_tokens=profile_tokens(profile),
+        interests_hash=interests_hash(),
+    )
+    previous = None if refresh else latest_fingerprint(profile_key, report_dir)
+    if not previous or not previous.get("filtered_summary"):
+        return check
+    try:
+        age = datetime.now() - datetime.fromisoformat(previous["created_at"])
+    except (KeyError, ValueError):
+        return check
+    if age > timedelta(days=MAX_AGE_DAYS):
+        return check
+    check.previous = previous
+
+    old_sections = previous.get("profile_sections") or {}
+    if check.profile_sections and old_sections and check.profile_sections != old_sections:
+        changed = sorted(k for k in set(check.profile_sections) | set(old_sections)
+                         if check.profile_sections.get(k) != old_sections.get(k))
+        check.changes.append("LinkedIn profile changed (fields: {})".format(", ".join(changed)))
+    new_urls = web_urls(previous.get("web_queries") or [], telemetry=telemetry) - set(previous.get("web_urls") or [])
+    if new_urls:
+        check.changes.append("New web results: {}".format(", ".join(sorted(new_urls)[:10])))
+
+    if check.changes:
+        check.status = INCREMENTAL
+    elif check.interests_hash != previous.get("interests_hash"):
+        check.status = CONTEXT_ONLY
+    else:
+        check.status = REUSED
+    return check
@@ -0,0 +1,97 @@
+"""
+Company facts shared across people who work at the same company.
+
+When the research covers the person's current company (news, funding, products), the Evidence
+Filter's "Company context" section is stored under the normalized company name, with each fact's
+source URL, for COMPANY_FACTS_TTL_DAYS, once the critique has approved that filtered research. Later
+runs on people at that company get those facts in the research task instead of searching for them
+again, which saves searches and research tokens when an attendee list is clustered around a few
+employers.
+"""
+from __future__ import annotations
+
+import os
+import re
+from datetime import datetime
+
+from pipeline import critique_verdict
+from tools.cache import TTLCache
+from tools.evidence import inline_sources
+from tools.evidence_scorer import company_from_current_work, normalize_company
+
+# Bump when the research task's Company context instructions change, so old facts are not reused.
+FACTS_VERSION = "1"
+TTL_DAYS = float(os.getenv("COMPANY_FACTS_TTL_DAYS", "14"))
+MAX_FACTS = 8
+SECTION_TITLE = "Company context"
+
+_SECTION = re.compile(r"^\W*(?:\(?\d+[.)]\s*)?company context\b.*$", re.IGNORECASE | re.MULTILINE)
+# The section ends at the next Markdown heading, bold-only line or short "Label:" line.
+_NEXT_HEADING = re.compile(r"^\s*(#{1,6}\s|\*\*[^*]+\*\*:?\s*$|[A-Z][^.:]{0,60}:\s*$)")
+_URL = re.compile(r"https?://\S+")
+
+_cache: TTLCache | None = None
+
+
+def _get_cache() -> TTLCache:
+    global _cache
+    if _cache is None:
+        _cache = TTLCache("company_facts", ttl=TTL_DAYS * 86400)
+    return _cache
+
+
+def current_company(current_work: str | None = None, companies: list[str] | None = None) -> str | None:
+    """
+    The company named in --current-work (after " at " or "@"), else the most recent company on the
+    LinkedIn profile. A role alone ("CTO") is never used as the company.
+    """
+    company = company_from_current_work(current_work) if current_work else ""
+    return company or next((c for c in companies or [] if c), None)
+
+
+def cached_facts(company: str | None) -> list[str] | None:
+    """Company-level facts (each with its source URL) stored for company, if any and still fresh."""
+    key = normalize_company(company or "")
+    if not key:
+        return None
+    entry = _get_cache().get(f"{FACTS_VERSION}:{key}")
+    facts = entry.get("facts") if isinstance(entry, dict) else None
+    return facts or None
+
+
+def extract_facts(summary: str) -> list[str]:
+    """
+    Sourced lines of the "Company context" section of a filtered summary, with evidence IDs
+    replaced by the URLs from its Sources block.
+    """
+    lines = inline_sources(summary or "").splitlines()
+    start = next((i for i, line in enumerate(lines) if _SECTION.match(line)), None)
+    if start is None:
+        return []
+    facts = []
+    for line in lines[start + 1:]:
+        if _NEXT_HEADING.match(line):
+            break
+        if _URL.search(line):
+            facts.append(line.strip().lstrip("-*• ").strip())
+    return facts[:MAX_FACTS]
+
+
+def store_facts(company: str | None, summary: str) -> list[str]:
+    """Store the Company context facts of a filtered summary for company; returns what was stored."""
+    key = normalize_company(company or "")
+    facts = extract_facts(summary) if key else []
+    if facts:
+        _get_cache().set(f"{FACTS_VERSION}:{key}", {
+            "company": company,
+            "facts": facts,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+        })
+    return facts
+
+
+def store_approved_facts(company: str | None, summary: str, critique: str | None) -> list[str]:
+    """store_facts() for a filtered summary, only when the critique of it opens with APPROVED."""
+    if critique_verdict(critique) != "approved":
+        return []
+    return store_facts(company, summary)
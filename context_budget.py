@@ -0,0 +1,151 @@
+"""
+Token-budgeted context handoff between tasks.
+
+Task outputs are passed to later tasks through context=[...]. Each upstream task gets a token budget
+for what it hands on; when its output is larger, it is compacted in place (removed-evidence lists
+dropped, repeated lines de-duplicated, then low-priority lines trimmed) before downstream tasks read it.
+A line too long to fit (e.g. a single-paragraph answer) is cut to the tokens left rather than dropped.
+"""
+from __future__ import annotations
+
+import os
+import re
+
+from tools.evidence import EVIDENCE_ID
+from tools.tokens import count_tokens, truncate_tokens
+
+# Tokens each task may hand on to later tasks. Override with CONTEXT_TOKEN_BUDGETS, e.g. "research=4000,filter=2000".
+DEFAULT_BUDGETS = {
+    "research": 3000,
+    "filter": 2500,
+    "context_sync": 600,
+    "critique": 800,
+}
+
+# Markdown headings, bold-only lines and short "Label:" lines
+_HEADING = re.compile(r"^\s*(#{1,6}\s.*|\*\*[^*]+\*\*:?|[A-Z][^.:]{0,60}:)\s*$")
+# "Rejected" only with a noun, so a critique answer opening with the verdict REJECTED is not a removed list.
+_REMOVED_HEADING = re.compile(
+    r"(?i)^\W*(items?\s+)?(removed|excluded|filtered out|dropped|rejected\s+(items?|results?|facts?))\b"
+)
+_URL = re.compile(r"https?://\S+")
+TRUNCATION_NOTE = "[... trimmed to fit the context budget ...]"
+# A line that would keep fewer tokens than this when cut is dropped instead.
+MIN_CUT_TOKENS = 20
+
+
+def load_budgets(overrides: dict | None = None) -> dict:
+    """Default budgets, updated from CONTEXT_TOKEN_BUDGETS and then from explicit overrides."""
+    budgets = dict(DEFAULT_BUDGETS)
+    for item in os.getenv("CONTEXT_TOKEN_BUDGETS", "").split(","):
+        key, _, value = item.partition("=")
+        if key.strip() and value.strip().isdigit():
+            budgets[key.strip()] = int(value)
+    budgets.update(overrides or {})
+    return budgets
+
+
+def _is_list_item(line: str) -> bool:
+    return bool(re.match(r"\s*([-*•]|\d+[.)])\s", line))
+
+
+def _drop_removed_sections(lines: list[str]) -> list[str]:
+    """Drop 'Removed items' lists from evidence filter output; a heading or plain text ends the list."""
+    kept, skipping = [], False
+    for line in lines:
+        if _REMOVED_HEADING.match(line):
+            skipping = True
+            continue
+        if skipping:
+            if not line.strip() or (_is_list_item(line) and not _HEADING.match(line)):
+                continue
+            skipping = False
+        kept.append(line)
+    return kept
+
+
+def _dedupe_lines(lines: list[str]) -> list[str]:
+    """Drop repeated facts: non-heading lines whose normalized text already appeared."""
+    seen, kept = set(), []
+    for line in lines:
+        key = re.sub(r"[^a-z0-9]+", " ", line.lower()).strip()
+        if key and not _HEADING.match(line):
+            if key in seen:
+                continue
+            seen.add(key)
+        kept.append(line)
+    return kept
+
+
+def _priority(line: str, unverified_ids: set | frozenset = frozenset()) -> int:
+    """
+    Higher survives longer: headings, then sourced/pre-verified facts, then other text, then unverified.
+    A line citing evidence IDs (tools/evidence.py) is unverified when every ID it cites is in unverified_ids.
+    """
+    if _HEADING.match(line):
+        return 3
+    if "[pre-check: unverified" in line:
+        return 0
+    cited = set(EVIDENCE_ID.findall(line))
+    if cited:
+        return 0 if cited <= unverified_ids else 2
+    if _URL.search(line) or "[pre-check: match" in line or "linkedin" in line.lower():
+        return 2
+    return 1
+
+
+def compact(text: str, budget: int, model: str = "gpt-4o", unverified_ids: set | frozenset = frozenset()) -> str:
+    """Return text unchanged if it fits in budget tokens, otherwise a compacted version that does."""
+    if not text or count_tokens(text, model) <= budget:
+        return text
+
+    lines = _dedupe_lines(_drop_removed_sections(text.splitlines()))
+    compacted = "\n".join(lines)
+    if count_tokens(compacted, model) <= budget:
+        return compacted
+
+    # Trim lowest-priority lines first, later lines before earlier ones within a priority. A line longer
+    # than what is still over budget is cut to fit instead of dropped, so one long paragraph keeps its start.
+    order = sorted(range(len(lines)), key=lambda i: (_priority(lines[i], unverified_ids), -i))
+    costs = [count_tokens(line, model) + 1 for line in lines]
+    total = sum(costs) + count_tokens(TRUNCATION_NOTE, model)
+    dropped = set()
+    for i in order:
+        excess = total - budget
+        if excess <= 0:
+            break
+        keep = costs[i] - excess - 2  # the line break and the " ..." marker
+        if keep >= MIN_CUT_TOKENS:
+            lines[i] = truncate_tokens(lines[i], keep, model).rstrip() + " ..."
+            total += count_tokens(lines[i], model) + 1 - costs[i]
+            costs[i] = count_tokens(lines[i], model) + 1
+            continue
+        dropped.add(i)
+        total -= costs[i]
+    kept = "\n".join([line for i, line in enumerate(lines) if i not in dropped] + [TRUNCATION_NOTE])
+    if count_tokens(kept, model) > budget:
+        # Only headings left, or token counts shifted by the cut: hard cut to the budget.
+        kept = truncate_tokens(kept, budget - count_tokens(TRUNCATION_NOTE, model) - 1, model) + "\n" + TRUNCATION_NOTE
+    return kept
+
+
+def make_compactor(task_key: str, budgets: dict, model: str = "gpt-4o", unverified_ids=None):
+    """
+    Task callback that compacts the task's output in place to its budget, so downstream tasks
+    (which read task.output.raw as context) receive the compacted version. unverified_ids, if given,
+    is called at compaction time for the IDs of evidence whose pre-check did not match.
+    """
+    budget = budgets.get(task_key)
+
+    def _callback(output) -> None:
+        raw = getattr(output, "raw", None)
+        if not budget or not raw:
+            return
+        before = count_tokens(raw, model)
+        if before <= budget:
+            return
+        output.raw = compact(raw, budget, model, frozenset(unverified_ids() if unverified_ids else ()))
+        print("✂️  Context budget: {} output compacted {} -> {} tokens (budget {})".format(
+            task_key, before, count_tokens(output.raw, model), budget))
+
+    return _callback
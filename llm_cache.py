@@ -0,0 +1,160 @@
+"""
+Record/replay cache for LLM calls, for cheap and repeatable reruns while iterating on prompts.
+
+Each agent's LLM is wrapped so a call is keyed by the model, its parameters and a hash of the
+normalized messages. Modes (LLM_CACHE_MODE or --llm-cache):
+
+- passthrough  no caching (default)
+- record       every call goes to the API and its response is stored, replacing any earlier one
+- replay       a stored response is returned without calling the API; misses are called and stored
+
+With replay, a rerun after editing only the Question Architect's prompt serves every earlier call
+from the cache (tool results are cached separately, see tools/cache.py), so only the changed stage
+costs anything. Responses live in the shared cache file (CACHE_DB_PATH), capped at LLM_CACHE_MAX_MB
+with least-recently-used entries evicted first. Calls that pass native tool schemas are never cached.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+from tools.cache import DEFAULT_CACHE_PATH
+
+PASSTHROUGH = "passthrough"
+RECORD = "record"
+REPLAY = "replay"
+MODES = (PASSTHROUGH, RECORD, REPLAY)
+DEFAULT_MODE = os.getenv("LLM_CACHE_MODE", PASSTHROUGH)
+MAX_BYTES = int(float(os.getenv("LLM_CACHE_MAX_MB", "200")) * 1024 * 1024)
+
+# LLM attributes that change the response and so belong in the key.
+_PARAMS = ("temperature", "top_p", "max_tokens", "max_completion_tokens", "stop", "seed", "response_format")
+
+# Whether the calling thread's last wrapped call was served from the cache (read by telemetry).
+_local = threading.local()
+
+
+def last_call_replayed() -> bool:
+    return getattr(_local, "replayed", False)
+
+
+def _normalize_text(content) -> str:
+    if not isinstance(content, str):
+        content = json.dumps(content, sort_keys=True, default=str)
+    return "\n".join(line.rstrip() for line in content.strip().splitlines())
+
+
+def cache_key(model: str, messages, params: dict | None = None) -> str:
+    """Hash of the model, its parameters and the messages (trailing whitespace ignored)."""
+    if isinstance(messages, str):
+        messages = [{"role": "user", "content": messages}]
+    normalized = [
+        {"role": m.get("role", ""), "content": _normalize_text(m.get("content"))} if isinstance(m, dict)
+        else {"role": "", "content": _normalize_text(m)}
+        for m in messages or []
+    ]
+    payload = {"model": model, "params": params or {}, "messages": normalized}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    Responses stored in SQLite by cache key, at most max_bytes in total. Reads refresh an entry's
+    last-used time and writes evict the least recently used entries until the total fits.
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_bytes: int = MAX_BYTES):
+        self.path = Path(path or DEFAULT_CACHE_PATH)
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY, model TEXT NOT NULL, response TEXT NOT NULL, size INTEGER NOT NULL,"
+                " created_at REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_last_used ON llm_cache (last_used)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(str(self.path), timeout=30)
+        try:
+            with conn:  # commits on success, rolls back on error
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT response FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                conn.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+        return row[0] if row else None
+
+    def set(self, key: str, model: str, response: str) -> None:
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, model, response, size, created_at, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, size, now, now),
+            )
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            for old_key, old_size in conn.execute("SELECT key, size FROM llm_cache ORDER BY last_used").fetchall():
+                if total <= self.max_bytes:
+                    break
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (old_key,))
+                total -= old_size
+
+    def stats(self) -> dict:
+        with self._connect() as conn:
+            entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache").fetchone()
+        return {"entries": entries, "bytes": size, "max_bytes": self.max_bytes}
+
+
+def cache_llm(llm, mode: str = DEFAULT_MODE, cache: LLMCache | None = None):
+    """
+    Wrap llm.call to record or replay responses (see the module docstring); passthrough leaves llm
+    as it is. Only plain-text responses are stored. Safe to call again on the same LLM.
+    """
+    if mode not in MODES:
+        raise ValueError("Unknown LLM cache mode {!r} (expected one of: {})".format(mode, ", ".join(MODES)))
+    if mode == PASSTHROUGH or getattr(llm, "_llm_cache_mode", None):
+        return llm
+    cache = cache or LLMCache()
+    original_call = llm.call
+
+    def call(messages, *args, **kwargs):
+        _local.replayed = False
+        model = getattr(llm, "model", "unknown")
+        # Native tool calls run the tools inside the call; replaying would skip them.
+        if kwargs.get("tools") or kwargs.get("available_functions"):
+            return original_call(messages, *args, **kwargs)
+        key = cache_key(model, messages, {name: getattr(llm, name, None) for name in _PARAMS})
+        if mode == REPLAY:
+            cached = cache.get(key)
+            if cached is not None:
+                _local.replayed = True
+                return cached
+        response = original_call(messages, *args, **kwargs)
+        if isinstance(response, str) and response:
+            cache.set(key, model, response)
+        return response
+
+    # object.__setattr__ so this also works when the LLM class is a pydantic model.
+    object.__setattr__(llm, "call", call)
+    object.__setattr__(llm, "_llm_cache_mode", mode)
+    return llm
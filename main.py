@@ -1,11 +1,14 @@
 """
-Networking research crew: hierarchical CrewAI crew that takes a LinkedIn URL
-and produces pointed questions and conversation starters using research,
+Networking research crew: hierarchical CrewAI crew (or the fixed-DAG pipeline in pipeline.py) that
+takes a LinkedIn URL and produces pointed questions and conversation starters using research,
 personal context, critique, and a question architect.
 """
 from __future__ import annotations
 
 import os
+import re
+import time
+from typing import TYPE_CHECKING
 
 try:
     from dotenv import load_dotenv
@@ -13,24 +16,74 @@ try:
 except ImportError:
     pass  # .env not loaded if python-dotenv not installed
 
-from crewai import Crew, Process, LLM
-from agents import create_agents
-from tasks import create_tasks
+# crewai, agents and tasks are imported inside run_crew, not here: parsing and validating arguments
+# (and batch manifest handling) should not pay several seconds of crewai import time.
+from llm_cache import DEFAULT_MODE as DEFAULT_LLM_CACHE_MODE, MODES as LLM_CACHE_MODES, PASSTHROUGH
+from pipeline import DEFAULT_PROCESS, PIPELINE, PROCESSES, run_output, run_pipeline
+from report_store import REPORT_DIR, new_report_path, save_fingerprint, save_report
+from streaming import FileSink, ReportStream, stdout_sink
 
-# Ensure required keys are present (at least for the LLM)
-if not os.getenv("OPENAI_API_KEY"):
-    print("Warning: OPENAI_API_KEY not set. Set it in .env for the crew to run.")
+if TYPE_CHECKING:
+    from telemetry import RunTelemetry
 
+# Keys the crew cannot run without (PROXYCURL_API_KEY is optional).
+REQUIRED_ENV_KEYS = ("OPENAI_API_KEY", "FIRECRAWL_API_KEY")
 
-def run_crew(linkedin_url: str, name: str | None = None, current_work: str | None = None):
+_LINKEDIN_PROFILE_URL = re.compile(r"^(https?://)?([a-z]{2,3}\.)?linkedin\.com/(in|pub)/[^/?#\s]+", re.IGNORECASE)
+
+# Model per agent: gpt-4o for research and report writing (accuracy), gpt-4o-mini for the rest.
+MODEL_ASSIGNMENT = {
+    "orchestrator": "gpt-4o-mini",
+    "web_researcher": "gpt-4o",
+    "personal_context_agent": "gpt-4o-mini",
+    "evidence_filter_agent": "gpt-4o-mini",
+    "review_critique_agent": "gpt-4o-mini",
+    "question_architect": "gpt-4o",
+}
+
+
+def validate_linkedin_url(linkedin_url: str) -> str | None:
+    """Return an error message if linkedin_url is not a LinkedIn profile URL, else None."""
+    if not _LINKEDIN_PROFILE_URL.match(linkedin_url.strip()):
+        return "Not a LinkedIn profile URL (expected https://www.linkedin.com/in/<username>/): {}".format(linkedin_url)
+    return None
+
+
+def missing_env_keys() -> list[str]:
+    """Required API keys that are not set in the environment (or .env)."""
+    return [key for key in REQUIRED_ENV_KEYS if not os.getenv(key)]
+
+
+def build_llm(model: str, llm_cache: str = DEFAULT_LLM_CACHE_MODE):
+    """An agent LLM for model: rate-limited (tools/rate_limit.py) and cached as llm_cache says (llm_cache.py)."""
+    from crewai import LLM
+    from llm_cache import cache_llm
+    from tools.rate_limit import limit_llm
+
+    return cache_llm(limit_llm(LLM(model=model)), llm_cache)
+
+
+def build_agents(verbose: bool = True, llm_cache: str = DEFAULT_LLM_CACHE_MODE) -> dict:
     """
-    Run the hierarchical crew with the given LinkedIn profile URL and optional disambiguation inputs.
-    name and current_work help disambiguate when many people share the same name.
-    Returns the crew's output (final task result).
+    Build the six agents with their tools and per-agent LLMs but no per-run state. The set can be
+    passed to run_crew(agents=...) for run after run (one run at a time), skipping construction.
+    llm_cache is the LLM record/replay mode (see llm_cache.py); replayed calls skip the rate limiter.
     """
-    agents = create_agents()
-    task_list = create_tasks(agents, linkedin_url, name=name, current_work=current_work)
+    from agents import create_agents
+
+    agents = create_agents(verbose=verbose)
+    for agent_key, model in MODEL_ASSIGNMENT.items():
+        agents[agent_key].llm = build_llm(model, llm_cache)
+    return agents
 
+
+def _kickoff(agents: dict, task_list: list, process: str, on_task_start, verbose: bool, budget_reached=None):
+    """Run the tasks with the Orchestrator as manager, or as the fixed DAG in pipeline.py."""
+    from crewai import Crew, Process, LLM
+    from tools.rate_limit import limit_llm
+
+    if process == PIPELINE:
+        return run_pipeline(task_list, on_task_start=on_task_start, budget_reached=budget_reached)
     # Orchestrator is the manager; it must not be in the agents list (CrewAI requirement).
     worker_agents = [
         agents["web_researcher"],
@@ -39,13 +92,7 @@ def run_crew(linkedin_url: str, name: str | None = None, current_work: str | Non
         agents["review_critique_agent"],
         agents["question_architect"],
     ]
-
-    cheap_llm = LLM(model="gpt-4o-mini")
-    stronger_llm = LLM(model="gpt-4o")  # Better accuracy for research and report writing
-    # Manager agent is not in crew.agents, so it does not get crew's default LLM; set it explicitly.
-    agents["orchestrator"].llm = cheap_llm
-    agents["web_researcher"].llm = stronger_llm
-    agents["question_architect"].llm = stronger_llm
+    cheap_llm = limit_llm(LLM(model="gpt-4o-mini"))
     crew = Crew(
         agents=worker_agents,
         tasks=task_list,
@@ -53,18 +100,225 @@ def run_crew(linkedin_url: str, name: str | None = None, current_work: str | Non
         llm=cheap_llm,
         manager_agent=agents["orchestrator"],
         memory=False,
-        verbose=True,
+        verbose=verbose,
+    )
+    return crew.kickoff()
+
+
+def run_crew(
+    linkedin_url: str,
+    name: str | None = None,
+    current_work: str | None = None,
+    verbose: bool = True,
+    refresh: bool = False,
+    context_budgets: dict | None = None,
+    telemetry: RunTelemetry | None = None,
+    agents: dict | None = None,
+    interests_buffer=None,
+    change_check=None,
+    process: str = DEFAULT_PROCESS,
+    report_sinks: list | None = None,
+    budget=None,
+):
+    """
+    Run the hierarchical crew with the given LinkedIn profile URL and optional disambiguation inputs.
+    name and current_work help disambiguate when many people share the same name.
+    verbose=False silences agent logs (used by batch mode, where runs interleave).
+    refresh=True ignores cached Proxycurl profiles, Firecrawl results and the Personal Context summary.
+    context_budgets overrides per-task token budgets for context handed to later tasks.
+    telemetry, when given, records per-task, per-agent and per-tool latency, tokens and cost for this run.
+    agents, when given, is a set from build_agents() that is re-pointed at this run instead of building a new one.
+    interests_buffer, when given, queues my_interests.md appends for the caller to flush (batch mode).
+    change_check (a change_detection.ChangeCheck) seeds the run with the previous filtered summary when the
+    person was researched before, and receives this run's filtered summary and search queries.
+    process="pipeline" runs the tasks as a fixed DAG without the Orchestrator (see pipeline.py).
+    Agent models start from MODEL_ASSIGNMENT and may be switched during the run by the model routing file
+    (see routing.py).
+    report_sinks are callables that receive the report text as the Question Architect streams it (streaming.py).
+    budget (a run_budget.RunBudget, default from the RUN_MAX_* environment variables) caps the run's wall time,
+    tokens, cost and tool calls (checked between calls); when one is reached the report is written from the research done so far.
+    Returns the crew's output (final task result).
+    """
+    from agents import bind_run
+    from company_facts import current_company
+    from routing import RunRouter, load_policy
+    from run_budget import RunBudget, run_or_finish_early
+    from tasks import TASK_AGENTS, create_tasks
+    from telemetry import RunTelemetry, uninstrument_llm
+    from tools.evidence import EvidenceStore
+
+    if agents is None:
+        agents = build_agents(verbose=verbose)
+    budget = budget if budget is not None else RunBudget.from_env()
+    if budget.active:
+        # Budgets are measured by telemetry, so a run with limits always has one.
+        telemetry = telemetry or RunTelemetry(linkedin_url, name=name)
+        telemetry.set_budget(budget)
+    evidence = EvidenceStore()
+    bind_run(
+        agents,
+        linkedin_url=linkedin_url,
+        name=name,
+        current_work=current_work,
+        refresh=refresh,
+        telemetry=telemetry,
+        interests_buffer=interests_buffer,
+        evidence=evidence,
+    )
+    # Each agent has its own LLM (manager included, as it does not get crew's default LLM) so telemetry
+    # can attribute every call to the agent that made it. Drop a previous run's wrapper on reused sets.
+    for agent_key in MODEL_ASSIGNMENT:
+        llm = agents[agent_key].llm
+        uninstrument_llm(llm)
+        agents[agent_key].llm = telemetry.instrument_llm(llm, agent_key) if telemetry else llm
+
+    def routed_llm(agent_key: str, model: str):
+        # Built for this run only, so a route never changes the LLMs a reused agent set shares with later runs.
+        llm = build_llm(model, getattr(agents[agent_key].llm, "_llm_cache_mode", None) or PASSTHROUGH)
+        return telemetry.instrument_llm(llm, agent_key) if telemetry else llm
+
+    # Per-run model choice from the routing file; re-evaluated as the run produces signals.
+    router = RunRouter(
+        load_policy(MODEL_ASSIGNMENT),
+        agents,
+        telemetry=telemetry,
+        make_llm=routed_llm,
+        profile_tokens=change_check.profile_tokens if change_check else None,
     )
 
-    result = crew.kickoff()
+    # Pipeline tasks can overlap, so they are timed from their own start rather than the previous task's end.
+    task_starts = {}
+    # Finished task outputs by task key: what the report is written from if the budget cuts the run short.
+    task_outputs = {}
+
+    def on_task_start(task_key: str) -> None:
+        task_starts[task_key] = time.perf_counter()
+
+    def on_task_done(task_key: str, output) -> None:
+        task_outputs[task_key] = output
+        router.task_done(task_key, output, evidence)
+        if telemetry:
+            telemetry.task_done(task_key, TASK_AGENTS[task_key], started=task_starts.pop(task_key, None))
+        if change_check is not None and task_key == "filter":
+            change_check.filtered_summary = output.raw
+
+    task_list = create_tasks(
+        agents,
+        linkedin_url,
+        name=name,
+        current_work=current_work,
+        context_budgets=context_budgets,
+        on_task_done=on_task_done,
+        reuse_personal_context=not refresh,
+        company=current_company(current_work, change_check.companies if change_check else None),
+        reuse_company_facts=not refresh,
+        prior_summary=change_check.prior_summary if change_check else None,
+        research_changes=change_check.changes if change_check else None,
+        explicit_verdict=process == PIPELINE,
+        evidence=evidence,
+    )
+
+    try:
+        with ReportStream(agents["question_architect"].llm, *(report_sinks or [])) as report_stream:
+            router.on_switch = lambda agent_key, llm: (
+                report_stream.retarget(llm) if agent_key == "question_architect" else None)
+            result = run_or_finish_early(
+                budget,
+                lambda: _kickoff(
+                    agents, task_list, process, on_task_start, verbose,
+                    budget_reached=(lambda: budget.exceeded(telemetry)) if budget.active else None,
+                ),
+                lambda: run_output(task_list, task_outputs, on_task_start),
+            )
+    except Exception as e:
+        if telemetry:
+            telemetry.finish("failed", "{}: {}".format(type(e).__name__, e))
+        raise
+    finally:
+        router.close()
+    if telemetry:
+        telemetry.finish("degraded" if budget.reason else "done")
+    if change_check is not None:
+        change_check.queries = evidence.queries
     return result
 
 
+def research_person(
+    linkedin_url: str,
+    name: str | None = None,
+    current_work: str | None = None,
+    verbose: bool = True,
+    refresh: bool = False,
+    telemetry: RunTelemetry | None = None,
+    agents: dict | None = None,
+    interests_buffer=None,
+    report_dir: str = REPORT_DIR,
+    process: str = DEFAULT_PROCESS,
+    report_sinks: list | None = None,
+) -> tuple[str, str | None, str]:
+    """
+    Research one person and save the report with its change-detection fingerprint (change_detection.py).
+    If nothing changed since the person's last report, that report is reused and no crew runs; otherwise
+    run_crew does a full, incremental or context-only run. Other arguments are as for run_crew.
+    With report_sinks, the report is also streamed into its file as it is written.
+    Returns (report text, report path or None, mode).
+    """
+    from change_detection import REUSED, check_changes
+
+    check = check_changes(linkedin_url, refresh=refresh, telemetry=telemetry, report_dir=report_dir)
+    if check.status == REUSED:
+        report_path = check.previous["report_path"]
+        with open(report_path, encoding="utf-8") as f:
+            result_str = f.read()
+        if telemetry:
+            telemetry.finish(REUSED)
+        return result_str, report_path, check.status
+
+    # Streamed runs write into the report's file as it is generated; the final text then replaces it.
+    file_sink = FileSink(new_report_path(linkedin_url, name, report_dir)) if report_sinks else None
+    try:
+        output = run_crew(
+            linkedin_url,
+            name=name,
+            current_work=current_work,
+            verbose=verbose,
+            refresh=refresh,
+            telemetry=telemetry,
+            agents=agents,
+            interests_buffer=interests_buffer,
+            change_check=check,
+            process=process,
+            report_sinks=[*report_sinks, file_sink] if file_sink else None,
+        )
+    except Exception:
+        if file_sink:
+            file_sink.discard()
+        raise
+    finally:
+        if file_sink:
+            file_sink.close()
+    result_str = str(output) if output is not None else ""
+    report_path = save_report(
+        result_str,
+        linkedin_url,
+        name=name,
+        report_dir=report_dir,
+        companies=check.companies,
+        mode=check.status,
+        report_path=file_sink.path if file_sink else None,
+        current_work=current_work,
+    )
+    if file_sink and not report_path:
+        file_sink.discard()
+    if report_path:
+        save_fingerprint(check.fingerprint(), report_path)
+    return result_str, report_path, check.status
+
+
 if __name__ == "__main__":
     import argparse
-    import re
-    import sys
-    from datetime import datetime
+
+    from report_store import save_telemetry
 
     parser = argparse.ArgumentParser(
         description="Run the Conversation Starter crew: research a LinkedIn profile and produce questions and conversation starters."
@@ -84,8 +338,45 @@ if __name__ == "__main__":
         default=None,
         help="Person's current role/company (e.g. 'CTO at Acme Inc') for disambiguation",
     )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore cached LinkedIn profiles and web search results, call the APIs again and do a full run "
+             "even if the person's last report is still current",
+    )
+    parser.add_argument(
+        "--process",
+        choices=PROCESSES,
+        default=DEFAULT_PROCESS,
+        help="hierarchical: Orchestrator manager delegates the tasks; pipeline: run them as a fixed DAG with "
+             "research and context sync in parallel and no manager LLM calls (default: {})".format(DEFAULT_PROCESS),
+    )
+    parser.add_argument(
+        "--llm-cache",
+        dest="llm_cache",
+        choices=LLM_CACHE_MODES,
+        default=DEFAULT_LLM_CACHE_MODE,
+        help="record: store every LLM response; replay: reuse stored responses for identical calls and record "
+             "the rest; passthrough: no LLM cache (default: {})".format(DEFAULT_LLM_CACHE_MODE),
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream the report to the console and its file as the Question Architect writes it "
+             "(agent logs are hidden)",
+    )
     args = parser.parse_args()
 
+    # Validate before run_crew imports crewai, so mistakes fail fast.
+    url_error = validate_linkedin_url(args.linkedin_url)
+    if url_error:
+        parser.error(url_error)
+    missing = missing_env_keys()
+    if missing:
+        parser.error("Missing required environment variables: {} (set them in .env)".format(", ".join(missing)))
+
+    from telemetry import RunTelemetry
+
     url = args.linkedin_url.strip()
     name = args.name.strip() if args.name else None
     current_work = args.current_work.strip() if args.current_work else None
@@ -96,20 +387,36 @@ if __name__ == "__main__":
     if current_work:
         print("  Current work (disambiguation): {}".format(current_work))
     print()
-    output = run_crew(url, name=name, current_work=current_work)
-    print("\n--- Crew output ---\n")
-    result_str = str(output) if output is not None else ""
-    print(result_str)
-
-    # Save report in reports/ folder: {person_slug}_{timestamp}.md (prefer name-based slug when provided)
-    slug_source = (name or url.strip("/").split("/")[-1] or "report").lower()
-    person_slug = re.sub(r"[^a-zA-Z0-9]+", "_", slug_source)
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    report_dir = "reports"
-    os.makedirs(report_dir, exist_ok=True)
-    report_filename = "{}_{}.md".format(person_slug, timestamp)
-    report_path = os.path.join(report_dir, report_filename)
-    if result_str.strip():
-        with open(report_path, "w", encoding="utf-8") as f:
-            f.write(result_str)
-        print("\nReport saved to {}".format(report_path))
+    telemetry = RunTelemetry(url, name=name)
+    # Collects what was streamed, so the report is printed at the end if nothing was (e.g. a reused report).
+    streamed = []
+    result_str, report_path, mode = research_person(
+        url,
+        name=name,
+        current_work=current_work,
+        verbose=not args.stream,
+        refresh=args.refresh,
+        telemetry=telemetry,
+        process=args.process,
+        report_sinks=[stdout_sink, streamed.append] if args.stream else None,
+        agents=build_agents(verbose=not args.stream, llm_cache=args.llm_cache),
+    )
+    if streamed:
+        print()
+    else:
+        print("\n--- Crew output ({} run) ---\n".format(mode))
+        print(result_str)
+
+    # Reports are saved in reports/ as {person_slug}_{timestamp}.md (prefer name-based slug when provided)
+    if report_path:
+        print("\n{} {}".format("Unchanged since last run; reused report" if mode == "reused" else "Report saved to", report_path))
+    telemetry_path = save_telemetry(telemetry, url, name=name, report_path=report_path)
+    summary = telemetry.summary()
+    print("Telemetry saved to {} ({:.1f}s, {} LLM calls ({} replayed), {} tokens, ${:.4f})".format(
+        telemetry_path,
+        summary["wall_seconds"] or 0.0,
+        summary["totals"]["llm_calls"],
+        summary["totals"]["replayed_llm_calls"],
+        summary["totals"]["input_tokens"] + summary["totals"]["output_tokens"],
+        summary["cost_usd"]["total"],
+    ))
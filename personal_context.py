@@ -0,0 +1,56 @@
+"""
+Memoized Personal Context summary.
+
+The Context Sync task summarizes my_interests.md, which rarely changes. Its output is cached under a
+hash of the file's contents, so later runs reuse the summary (and skip the task) until the file is
+edited by hand or by AppendInterestsTool.
+"""
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+
+from tools.cache import TTLCache
+
+# Source of truth for user interests (project root)
+INTERESTS_FILE = Path(__file__).resolve().parent / "my_interests.md"
+
+# Bump when the Context Sync task's prompt or expected output changes, so old summaries are not reused.
+SUMMARY_VERSION = "1"
+
+_cache: TTLCache | None = None
+
+
+def _get_cache() -> TTLCache:
+    global _cache
+    if _cache is None:
+        # Keyed by content hash, so entries never go stale; no TTL.
+        _cache = TTLCache("personal_context")
+    return _cache
+
+
+def interests_hash(path: Path = INTERESTS_FILE) -> str | None:
+    """SHA-256 of the interests file's contents, or None when it cannot be read."""
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def cached_summary(digest: str | None) -> str | None:
+    """The Context Sync summary stored for this interests-file hash, if any."""
+    if not digest:
+        return None
+    summary = _get_cache().get(f"{SUMMARY_VERSION}:{digest}")
+    return summary if isinstance(summary, str) and summary.strip() else None
+
+
+def store_summary(digest: str | None, summary: str, path: Path = INTERESTS_FILE) -> bool:
+    """
+    Store a Context Sync summary for digest. Skipped when the file changed since digest was taken
+    (e.g. another run appended an interest meanwhile), since the summary may describe either version.
+    """
+    if not digest or not summary.strip() or interests_hash(path) != digest:
+        return False
+    _get_cache().set(f"{SUMMARY_VERSION}:{digest}", summary)
+    return True
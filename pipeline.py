@@ -0,0 +1,128 @@
+"""
+Pipeline process: runs the crew's tasks as a fixed DAG instead of through the hierarchical manager.
+
+Each task starts as soon as the tasks in its context have finished, so Research and Context Sync run
+concurrently, Evidence Filter follows Research, Critique follows both and Output runs last. The
+Orchestrator makes no LLM calls. The critique loop is plain code: Critique answers APPROVED or
+REJECTED (tasks.create_tasks(explicit_verdict=True)), and a rejection, or an answer without a verdict,
+re-runs Research with the feedback, then Evidence Filter and Critique, at most
+PIPELINE_MAX_CRITIQUE_RETRIES times.
+"""
+from __future__ import annotations
+
+import os
+import re
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+HIERARCHICAL = "hierarchical"
+PIPELINE = "pipeline"
+PROCESSES = (HIERARCHICAL, PIPELINE)
+DEFAULT_PROCESS = os.getenv("CREW_PROCESS", HIERARCHICAL)
+
+MAX_CRITIQUE_RETRIES = int(os.getenv("PIPELINE_MAX_CRITIQUE_RETRIES", "1"))
+
+_VERDICT = re.compile(r"^\W*(?:verdict\W*)?(approved|rejected)\b", re.IGNORECASE)
+# CrewAI joins context task outputs with this separator; kept so prompts look the same in both processes.
+_CONTEXT_SEPARATOR = "\n\n----------\n\n"
+
+
+def critique_verdict(text: str | None) -> str | None:
+    """"approved" or "rejected" from the opening of the critique's answer, None without a verdict."""
+    match = _VERDICT.match(text or "")
+    return match.group(1).lower() if match else None
+
+
+def critique_rejected(text: str | None) -> bool:
+    """True unless the critique's answer opens with APPROVED; an empty or unrecognizable answer is a rejection."""
+    return critique_verdict(text) != "approved"
+
+
+def _dependencies(task) -> list:
+    # Task.context is a sentinel rather than a list when not set.
+    return task.context if isinstance(task.context, list) else []
+
+
+def _context(task, outputs: dict, extra: list[str] | None = None) -> str:
+    parts = [outputs[dep.name].raw for dep in _dependencies(task) if dep.name in outputs]
+    return _CONTEXT_SEPARATOR.join(part for part in [*parts, *(extra or [])] if part)
+
+
+def _execute(task, outputs: dict, extra: list[str] | None, on_task_start):
+    if on_task_start:
+        on_task_start(task.name)
+    return task.execute_sync(agent=task.agent, context=_context(task, outputs, extra))
+
+
+def _run_graph(tasks: list, outputs: dict, on_task_start=None, extra: dict | None = None) -> None:
+    """
+    Run tasks, each once its dependencies among them are in outputs, independent ones concurrently.
+    Results go into outputs by task name; extra maps a task name to additional context strings.
+    """
+    names = {task.name for task in tasks}
+    pending = list(tasks)
+    running = {}
+    with ThreadPoolExecutor(max_workers=max(1, len(tasks)), thread_name_prefix="pipeline") as pool:
+        while pending or running:
+            for task in list(pending):
+                if all(dep.name not in names or dep.name in outputs for dep in _dependencies(task)):
+                    pending.remove(task)
+                    future = pool.submit(_execute, task, outputs, (extra or {}).get(task.name), on_task_start)
+                    running[future] = task
+            if not running:
+                raise ValueError("Task dependencies form a cycle: {}".format(", ".join(t.name for t in pending)))
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                outputs[running.pop(future).name] = future.result()
+
+
+def run_pipeline(tasks: list, max_retries: int = MAX_CRITIQUE_RETRIES, on_task_start=None, budget_reached=None):
+    """
+    Run tasks from tasks.create_tasks(..., explicit_verdict=True) and return the Output task's TaskOutput.
+    on_task_start(task_name) is called as each task starts (tasks may run in worker threads).
+    budget_reached(), if given, returns why the run budget is used up (or None); no retries start then.
+    """
+    by_name = {task.name: task for task in tasks}
+    outputs: dict = {}
+    _run_graph([task for task in tasks if task.name != "output"], outputs, on_task_start)
+
+    # Runs without Research (previous summary reused) have nothing to retry.
+    retry_tasks = [by_name[key] for key in ("research", "filter", "critique") if key in by_name]
+    attempt = 0
+    while "research" in by_name and attempt < max_retries and critique_rejected(outputs["critique"].raw):
+        reason = budget_reached() if budget_reached else None
+        if reason:
+            print("Run budget reached ({}); skipping further research retries".format(reason))
+            break
+        attempt += 1
+        print("Critique rejected the research; research retry {}/{}".format(attempt, max_retries))
+        feedback = [
+            "Your previous research summary:\n" + outputs["research"].raw,
+            "Feedback from the Review & Critique Agent:\n" + outputs["critique"].raw,
+        ]
+        for task in retry_tasks:
+            outputs.pop(task.name, None)
+        _run_graph(retry_tasks, outputs, on_task_start, extra={"research": feedback})
+    if critique_rejected(outputs["critique"].raw):
+        print("Critique still rejects the research; writing the report from the latest filtered summary")
+
+    _run_graph([by_name["output"]], outputs, on_task_start)
+    return outputs["output"]
+
+
+def run_output(tasks: list, outputs: dict, on_task_start=None):
+    """
+    Run only the Output task from the task outputs there are so far (task name -> TaskOutput), e.g.
+    after the run budget stopped the other tasks. Without a filtered summary, the unfiltered research
+    is passed on with a warning. Returns the Output task's TaskOutput.
+    """
+    by_name = {task.name: task for task in tasks}
+    outputs = {name: output for name, output in outputs.items() if name != "output"}
+    extra = []
+    if "filter" in by_name and "filter" not in outputs and "research" in outputs:
+        extra.append(
+            "UNFILTERED research summary (the run's budget ran out before the Evidence Filter checked it; "
+            "use only facts that clearly refer to this person and leave out anything doubtful):\n"
+            + outputs["research"].raw
+        )
+    _run_graph([by_name["output"]], outputs, on_task_start, extra={"output": extra})
+    return outputs["output"]
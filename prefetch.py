@@ -0,0 +1,113 @@
+"""
+Prefetching for batch runs: warm the tool caches for the next people while current crews are busy.
+
+A run spends most of its time in LLM calls, and its first tool calls are predictable: the Proxycurl
+profile (fetched by change detection and again by the Web Researcher) and a standard set of Firecrawl
+queries built from the person's name and current work, which the research task asks the researcher
+to start with. A background thread fetches these for up to BATCH_PREFETCH_AHEAD people beyond those
+already running, so when their runs start the tool calls are cache hits. People with a recent report
+get the previous run's fingerprint queries instead, which change detection re-runs first.
+
+Only HTTP fetches are moved earlier (through the same caches and rate limiter); no LLM calls are made.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from datetime import datetime, timedelta
+
+from report_store import REPORT_DIR
+
+DEFAULT_AHEAD = int(os.getenv("BATCH_PREFETCH_AHEAD", "2"))
+
+
+def standard_queries(name: str | None, current_work: str | None = None) -> list[str]:
+    """The searches every researched person starts with (empty without a name to search for)."""
+    if not name or not name.strip():
+        return []
+    quoted = '"{}"'.format(name.strip())
+    first = "{} {}".format(quoted, current_work.strip()) if current_work and current_work.strip() else quoted
+    return [first, "{} talk OR podcast OR interview".format(quoted), "{} blog OR article".format(quoted)]
+
+
+def _previous_queries(linkedin_url: str, report_dir: str) -> list[str] | None:
+    """Fingerprint queries of the person's last report when change detection will use it, else None."""
+    from change_detection import MAX_AGE_DAYS
+    from report_store import latest_fingerprint
+    from tools.urls import normalize_linkedin_url
+
+    previous = latest_fingerprint(normalize_linkedin_url(linkedin_url), report_dir)
+    if not previous or not previous.get("filtered_summary"):
+        return None
+    try:
+        if datetime.now() - datetime.fromisoformat(previous["created_at"]) > timedelta(days=MAX_AGE_DAYS):
+            return None
+    except (KeyError, ValueError):
+        return None
+    return previous.get("web_queries") or []
+
+
+def prefetch_person(person: dict, report_dir: str = REPORT_DIR) -> dict:
+    """
+    Fetch the person's profile and first searches into the tool caches. Returns counts of what was
+    fetched; errors are left for the run itself to hit and report.
+    """
+    from change_detection import fetch_profile, web_urls
+
+    profile = fetch_profile(person["url"])
+    queries = _previous_queries(person["url"], report_dir)
+    if queries is None:
+        queries = standard_queries(person.get("name"), person.get("current_work"))
+    web_urls(queries)
+    return {"profiles": 1 if profile is not None else 0, "queries": len(queries)}
+
+
+class Prefetcher:
+    """
+    Background thread that prefetches people in order, staying at most `ahead` people in front of
+    the runs started so far. Call advance(started) as runs start and stop() when the batch ends.
+    """
+
+    def __init__(self, people: list[dict], ahead: int = DEFAULT_AHEAD, report_dir: str = REPORT_DIR):
+        self.people = people
+        self.ahead = ahead
+        self.report_dir = report_dir
+        self.stats = {"people": 0, "profiles": 0, "queries": 0, "errors": 0}
+        self._allowed = ahead
+        self._stopped = False
+        self._changed = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="prefetch", daemon=True)
+
+    def start(self) -> "Prefetcher":
+        self._thread.start()
+        return self
+
+    def advance(self, started: int) -> None:
+        """started people of the list have begun their runs; allow prefetching `ahead` more."""
+        with self._changed:
+            self._allowed = max(self._allowed, started + self.ahead)
+            self._changed.notify_all()
+
+    def stop(self) -> None:
+        """Stop after the person being fetched (if any) and wait for the thread."""
+        with self._changed:
+            self._stopped = True
+            self._changed.notify_all()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _run(self) -> None:
+        for index, person in enumerate(self.people):
+            with self._changed:
+                self._changed.wait_for(lambda: self._stopped or index < self._allowed)
+                if self._stopped:
+                    return
+            try:
+                fetched = prefetch_person(person, self.report_dir)
+            except Exception as e:
+                self.stats["errors"] += 1
+                print("Prefetch failed for {}: {}: {}".format(person["url"], type(e).__name__, e))
+                continue
+            self.stats["people"] += 1
+            self.stats["profiles"] += fetched["profiles"]
+            self.stats["queries"] += fetched["queries"]
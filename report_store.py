@@ -0,0 +1,353 @@
+"""
+Saving generated reports to the reports/ folder, and a SQLite index over them.
+
+Every saved report is recorded in {report_dir}/index.sqlite3 with its LinkedIn URL, name, companies,
+timestamp, models and cost, plus a full-text (FTS5) index of its Markdown, so "everyone who worked
+at Stripe" or "latest report for this URL" is one query instead of a directory scan:
+
+    python report_store.py search "stripe"
+    python report_store.py latest https://www.linkedin.com/in/<username>/
+"""
+from __future__ import annotations
+
+import glob
+import json
+import os
+import re
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator
+
+from tools.evidence_scorer import company_from_current_work
+from tools.urls import normalize_linkedin_url
+
+REPORT_DIR = "reports"
+INDEX_FILENAME = "index.sqlite3"
+
+# Columns of the reports table that callers may set (report_path is the key).
+INDEX_FIELDS = (
+    "linkedin_url", "profile_key", "name", "companies", "created_at", "models", "cost_usd", "mode",
+    "telemetry_path", "fingerprint_path",
+)
+_REPORT_TIMESTAMP = re.compile(r"_(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})(?:_\d+)?\.md$")
+
+
+def person_slug(linkedin_url: str, name: str | None = None) -> str:
+    """File-name slug for a person: prefer the name when provided, else the LinkedIn URL slug."""
+    slug_source = (name or linkedin_url.strip("/").split("/")[-1] or "report").lower()
+    return re.sub(r"[^a-zA-Z0-9]+", "_", slug_source)
+
+
+def _timestamp() -> str:
+    return datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+
+
+def _new_path(report_dir: str, stem: str, extension: str) -> str:
+    """
+    Create and return an empty {stem}_{timestamp}{extension} file in report_dir, adding _2, _3.. when
+    another run (e.g. a parallel batch worker) already took that name in the same second.
+    """
+    os.makedirs(report_dir, exist_ok=True)
+    base = os.path.join(report_dir, "{}_{}".format(stem, _timestamp()))
+    counter = 1
+    while True:
+        path = base + ("_{}".format(counter) if counter > 1 else "") + extension
+        try:
+            with open(path, "x", encoding="utf-8"):
+                return path
+        except FileExistsError:
+            counter += 1
+
+
+def new_report_path(linkedin_url: str, name: str | None = None, report_dir: str = REPORT_DIR) -> str:
+    """
+    Path for a new report, {report_dir}/{person_slug}_{timestamp}.md (the folder is created). The file
+    is created empty to reserve the name; a suffix is added if it was already taken.
+    """
+    return _new_path(report_dir, person_slug(linkedin_url, name), ".md")
+
+
+def save_report(
+    result_str: str,
+    linkedin_url: str,
+    name: str | None = None,
+    report_dir: str = REPORT_DIR,
+    companies: list[str] | None = None,
+    mode: str | None = None,
+    report_path: str | None = None,
+    current_work: str | None = None,
+) -> str | None:
+    """
+    Write the report to {report_dir}/{person_slug}_{timestamp}.md (or report_path, e.g. the file it was
+    streamed into) and add it to the index.
+    companies (from the LinkedIn profile; without any, the company in current_work) and mode (see
+    change_detection.py) are recorded in the index.
+    Returns the report path, or None when the crew produced no output.
+    """
+    if not result_str.strip():
+        return None
+    report_path = report_path or new_report_path(linkedin_url, name, report_dir)
+    with open(report_path, "w", encoding="utf-8") as f:
+        f.write(result_str)
+    if not companies and current_work:
+        company = company_from_current_work(current_work)
+        companies = [company] if company else None
+    index_report(
+        report_path,
+        body=result_str,
+        linkedin_url=linkedin_url,
+        profile_key=normalize_linkedin_url(linkedin_url),
+        name=name,
+        companies=", ".join(companies or []) or None,
+        created_at=datetime.now().isoformat(timespec="seconds"),
+        mode=mode,
+    )
+    return report_path
+
+
+def save_telemetry(
+    telemetry,
+    linkedin_url: str,
+    name: str | None = None,
+    report_path: str | None = None,
+    report_dir: str = REPORT_DIR,
+) -> str:
+    """
+    Write the run's telemetry record next to its report ({report}.telemetry.jsonl), or to
+    {person_slug}_{timestamp}.telemetry.jsonl when the run produced no report.
+    The report's cost and models are updated in the index.
+    """
+    if report_path:
+        path = os.path.splitext(report_path)[0] + ".telemetry.jsonl"
+    else:
+        path = _new_path(report_dir, person_slug(linkedin_url, name), ".telemetry.jsonl")
+    telemetry.write(path)
+    if report_path:
+        summary = telemetry.summary()
+        # A reused report keeps the cost of the run that produced it.
+        if summary["status"] != "reused":
+            index_report(report_path, telemetry_path=path, **_telemetry_fields(summary))
+    return path
+
+
+def save_fingerprint(fingerprint: dict, report_path: str) -> str:
+    """Write a run's change-detection fingerprint next to its report ({report}.fingerprint.json)."""
+    path = os.path.splitext(report_path)[0] + ".fingerprint.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(dict(fingerprint, report_path=report_path), f, indent=2)
+    index_report(report_path, fingerprint_path=path, profile_key=fingerprint.get("profile_key"))
+    return path
+
+
+def latest_fingerprint(profile_key: str, report_dir: str = REPORT_DIR) -> dict | None:
+    """Fingerprint of the most recent indexed report for profile_key whose files still exist, or None."""
+    try:
+        with _index(report_dir) as conn:
+            rows = conn.execute(
+                "SELECT report_path, fingerprint_path FROM reports"
+                " WHERE profile_key = ? AND fingerprint_path IS NOT NULL ORDER BY created_at DESC",
+                (profile_key,),
+            ).fetchall()
+    except sqlite3.Error as e:
+        print("Report index unavailable ({}); repeat runs will not be detected".format(e))
+        return None
+    for report_path, fingerprint_path in rows:
+        if not (os.path.exists(report_path) and os.path.exists(fingerprint_path)):
+            continue
+        try:
+            with open(fingerprint_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            continue
+    return None
+
+
+# --- Index ---
+
+
+def _index_path(report_dir: str) -> str:
+    return os.path.join(report_dir, INDEX_FILENAME)
+
+
+@contextmanager
+def _index(report_dir: str = REPORT_DIR) -> Iterator[sqlite3.Connection]:
+    """Connection to the report index; a new index is back-filled from reports already on disk."""
+    os.makedirs(report_dir, exist_ok=True)
+    conn = sqlite3.connect(_index_path(report_dir), timeout=30)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        with conn:  # commits on success, rolls back on error
+            is_new = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'reports'"
+            ).fetchone() is None
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS reports ("
+                " report_path TEXT PRIMARY KEY, linkedin_url TEXT, profile_key TEXT, name TEXT, companies TEXT,"
+                " created_at TEXT, models TEXT, cost_usd REAL, mode TEXT, telemetry_path TEXT, fingerprint_path TEXT)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS reports_profile ON reports (profile_key, created_at)")
+            conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS report_text USING fts5("
+                " report_path UNINDEXED, name, companies, body, tokenize = 'unicode61 remove_diacritics 2')"
+            )
+            if is_new:
+                _backfill(conn, report_dir)
+            yield conn
+    finally:
+        conn.close()
+
+
+def _upsert(conn: sqlite3.Connection, report_path: str, body: str | None = None, **fields) -> None:
+    fields = {k: v for k, v in fields.items() if k in INDEX_FIELDS and v is not None}
+    conn.execute("INSERT OR IGNORE INTO reports (report_path) VALUES (?)", (report_path,))
+    if fields:
+        conn.execute(
+            "UPDATE reports SET {} WHERE report_path = ?".format(", ".join("{} = ?".format(k) for k in fields)),
+            (*fields.values(), report_path),
+        )
+    if body is not None or "name" in fields or "companies" in fields:
+        name, companies = conn.execute(
+            "SELECT name, companies FROM reports WHERE report_path = ?", (report_path,)
+        ).fetchone()
+        if body is None:
+            row = conn.execute("SELECT body FROM report_text WHERE report_path = ?", (report_path,)).fetchone()
+            body = row[0] if row else ""
+        conn.execute("DELETE FROM report_text WHERE report_path = ?", (report_path,))
+        conn.execute(
+            "INSERT INTO report_text (report_path, name, companies, body) VALUES (?, ?, ?, ?)",
+            (report_path, name or "", companies or "", body),
+        )
+
+
+def index_report(report_path: str, body: str | None = None, **fields) -> None:
+    """
+    Add or update a report in the index of its directory. fields are columns from INDEX_FIELDS
+    (None values are left unchanged); body is the Markdown to make searchable.
+    Index errors are reported but never fail the save itself.
+    """
+    try:
+        with _index(os.path.dirname(report_path) or ".") as conn:
+            _upsert(conn, report_path, body=body, **fields)
+    except sqlite3.Error as e:
+        print("Could not update report index for {}: {}".format(report_path, e))
+
+
+def _telemetry_fields(summary: dict) -> dict:
+    models = sorted({model for agent in summary.get("agents", {}).values() for model in agent.get("models", [])})
+    return {
+        "linkedin_url": summary.get("linkedin_url"),
+        "name": summary.get("name"),
+        "cost_usd": summary.get("cost_usd", {}).get("total"),
+        "models": ", ".join(models) or None,
+    }
+
+
+def _backfill(conn: sqlite3.Connection, report_dir: str) -> int:
+    """Index every report in report_dir from its file name and any telemetry/fingerprint files beside it."""
+    count = 0
+    for report_path in sorted(glob.glob(os.path.join(report_dir, "*.md"))):
+        base = os.path.splitext(report_path)[0]
+        fields = {}
+        match = _REPORT_TIMESTAMP.search(report_path)
+        if match:
+            fields["created_at"] = datetime.strptime(match.group(1), "%Y-%m-%d_%H-%M-%S").isoformat()
+        else:
+            fields["created_at"] = datetime.fromtimestamp(os.path.getmtime(report_path)).isoformat(timespec="seconds")
+        telemetry_path = base + ".telemetry.jsonl"
+        try:
+            with open(telemetry_path, encoding="utf-8") as f:
+                lines = [line for line in f if line.strip()]
+            # The first record is the run that wrote the report; later ones are reuses.
+            fields.update(_telemetry_fields(json.loads(lines[0])), telemetry_path=telemetry_path)
+        except (OSError, ValueError, IndexError):
+            pass
+        fingerprint_path = base + ".fingerprint.json"
+        try:
+            with open(fingerprint_path, encoding="utf-8") as f:
+                fields.update(profile_key=json.load(f).get("profile_key"), fingerprint_path=fingerprint_path)
+        except (OSError, ValueError):
+            pass
+        if fields.get("linkedin_url") and not fields.get("profile_key"):
+            fields["profile_key"] = normalize_linkedin_url(fields["linkedin_url"])
+        try:
+            with open(report_path, encoding="utf-8") as f:
+                body = f.read()
+        except OSError:
+            continue
+        _upsert(conn, report_path, body=body, **fields)
+        count += 1
+    return count
+
+
+def rebuild_index(report_dir: str = REPORT_DIR) -> int:
+    """Drop and rebuild the index from the files in report_dir; returns the number of reports indexed."""
+    path = _index_path(report_dir)
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    with _index(report_dir) as conn:
+        return conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+
+
+def _fts_query(query: str) -> str:
+    """Quote each term so user input (hyphens, dots, colons) is never parsed as FTS5 syntax."""
+    return " ".join('"{}"'.format(term.replace('"', '""')) for term in query.split())
+
+
+def search_reports(query: str, report_dir: str = REPORT_DIR, limit: int = 20) -> list[dict]:
+    """Reports matching all terms of query (in name, companies or text), best match first."""
+    if not query.strip():
+        return []
+    with _index(report_dir) as conn:
+        rows = conn.execute(
+            "SELECT r.report_path, r.linkedin_url, r.name, r.companies, r.created_at, r.models, r.cost_usd,"
+            " snippet(report_text, 3, '[', ']', '...', 12)"
+            " FROM report_text JOIN reports r ON r.report_path = report_text.report_path"
+            " WHERE report_text MATCH ? ORDER BY bm25(report_text, 0, 5.0, 3.0, 1.0), r.created_at DESC LIMIT ?",
+            (_fts_query(query), limit),
+        ).fetchall()
+    keys = ("report_path", "linkedin_url", "name", "companies", "created_at", "models", "cost_usd", "snippet")
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def latest_report(linkedin_url: str, report_dir: str = REPORT_DIR) -> dict | None:
+    """Index record of the most recent report for a LinkedIn profile URL (any URL form), or None."""
+    with _index(report_dir) as conn:
+        conn.row_factory = sqlite3.Row
+        row = conn.execute(
+            "SELECT * FROM reports WHERE profile_key = ? ORDER BY created_at DESC LIMIT 1",
+            (normalize_linkedin_url(linkedin_url),),
+        ).fetchone()
+    return dict(row) if row else None
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Search and look up saved reports.")
+    parser.add_argument("--report-dir", dest="report_dir", default=REPORT_DIR, help="Reports folder (default: reports)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    search_parser = commands.add_parser("search", help="Full-text search over reports, names and companies")
+    search_parser.add_argument("query", help="Words that must all appear, e.g. 'stripe payments'")
+    search_parser.add_argument("--limit", type=int, default=20, help="Maximum results (default: 20)")
+    latest_parser = commands.add_parser("latest", help="Most recent report for a LinkedIn URL")
+    latest_parser.add_argument("linkedin_url", help="LinkedIn profile URL in any form")
+    commands.add_parser("rebuild", help="Rebuild the index from the files in the reports folder")
+    args = parser.parse_args()
+
+    if args.command == "search":
+        results = search_reports(args.query, report_dir=args.report_dir, limit=args.limit)
+        for r in results:
+            print("{}  {}  {}".format(r["created_at"] or "-", r["name"] or r["linkedin_url"] or "-", r["report_path"]))
+            if r["companies"]:
+                print("    companies: {}".format(r["companies"]))
+            print("    {}".format(" ".join(r["snippet"].split())))
+        print("{} report(s) found".format(len(results)))
+    elif args.command == "latest":
+        record = latest_report(args.linkedin_url, report_dir=args.report_dir)
+        if not record:
+            parser.exit(1, "No report found for {}\n".format(args.linkedin_url))
+        print(json.dumps(record, indent=2))
+    else:
+        print("Indexed {} report(s)".format(rebuild_index(args.report_dir)))
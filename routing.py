@@ -0,0 +1,166 @@
+"""
+Adaptive per-agent model routing.
+
+Each agent starts on its model from MODEL_ASSIGNMENT (main.py), optionally overridden by the routing
+file's "models". Rules in the file switch agents to other models when run signals match:
+
+- profile_tokens   size of the LinkedIn profile as text (known before the crew starts)
+- evidence_items   evidence IDs cited in the filtered research (known once Evidence Filter finishes)
+- critique_retry   true once the critique rejects the filtered research (its answer opens with
+                   REJECTED, see pipeline.critique_verdict)
+
+Rules are checked again whenever a signal becomes known; all matching rules apply in file order,
+later ones winning, so a rule on critique_retry can escalate a cheap researcher to the stronger
+model for the retry only. The route (signals, matched rules, models) is recorded in telemetry.
+
+A route never changes the agents' own LLMs, which are reused by later runs (service pool, reused
+agent sets): an agent routed to another model gets an LLM made for this run, and close() puts the
+original back.
+
+The routing file is MODEL_ROUTING_FILE, or model_routing.json in the project root if present;
+without one every agent keeps its MODEL_ASSIGNMENT model. See model_routing.example.json.
+"""
+from __future__ import annotations
+
+import json
+import operator
+import os
+import threading
+from pathlib import Path
+
+from pipeline import critique_verdict
+
+ROUTING_FILE = Path(os.getenv("MODEL_ROUTING_FILE") or Path(__file__).resolve().parent / "model_routing.json")
+
+SIGNALS = ("profile_tokens", "evidence_items", "critique_retry")
+_OPERATORS = {"lt": operator.lt, "lte": operator.le, "gt": operator.gt, "gte": operator.ge, "eq": operator.eq}
+
+
+def load_policy(base_models: dict, path: Path | str | None = ROUTING_FILE) -> dict:
+    """
+    {"models": {agent: model}, "rules": [...]} from the routing file merged over base_models.
+    A missing file means no rules; an invalid one raises ValueError.
+    """
+    policy = {"models": dict(base_models), "rules": []}
+    if not path or not Path(path).exists():
+        return policy
+    try:
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError("Cannot read model routing file {}: {}".format(path, e))
+
+    def _check_agents(models: dict, where: str) -> dict:
+        unknown = set(models) - set(base_models)
+        if unknown:
+            raise ValueError("Unknown agent(s) in {} of {}: {}".format(where, path, ", ".join(sorted(unknown))))
+        return models
+
+    policy["models"].update(_check_agents(config.get("models") or {}, "models"))
+    for i, rule in enumerate(config.get("rules") or []):
+        name = rule.get("name") or "rule {}".format(i + 1)
+        for signal, condition in (rule.get("when") or {}).items():
+            if signal not in SIGNALS:
+                raise ValueError("Unknown signal {!r} in {} of {} (expected one of: {})".format(
+                    signal, name, path, ", ".join(SIGNALS)))
+            if not isinstance(condition, dict) or set(condition) - set(_OPERATORS):
+                raise ValueError("Invalid condition for {} in {} of {}: use {}".format(
+                    signal, name, path, ", ".join(_OPERATORS)))
+        policy["rules"].append({
+            "name": name,
+            "when": rule.get("when") or {},
+            "models": _check_agents(rule.get("models") or {}, name),
+        })
+    return policy
+
+
+def _matches(rule: dict, signals: dict) -> bool:
+    """All of the rule's conditions hold; a condition on a signal not known yet does not."""
+    for signal, condition in rule["when"].items():
+        value = signals.get(signal)
+        if value is None:
+            return False
+        if not all(_OPERATORS[op](value, expected) for op, expected in condition.items()):
+            return False
+    return True
+
+
+class RunRouter:
+    """
+    Applies a routing policy to one run's agents: gives each agent an LLM for its model from the policy
+    and the signals known so far, and re-applies it as signals arrive (update()). An agent on its own
+    LLM's model keeps that LLM; for any other model make_llm(agent_key, model) builds one for this run
+    (wrapped like the agent's own: rate limiting, LLM cache, telemetry). on_switch(agent_key, llm), if
+    set, is called when an agent's LLM is replaced. Call close() when the run ends.
+    """
+
+    def __init__(self, policy: dict, agents: dict, telemetry=None, make_llm=None, **signals):
+        self.policy = policy
+        self.agents = agents
+        self.telemetry = telemetry
+        self.make_llm = make_llm
+        self.on_switch = None
+        self.signals: dict = {k: v for k, v in signals.items() if v is not None}
+        self.matched: list[str] = []
+        self.models: dict = {}
+        self.base_llms = {key: getattr(agent, "llm", None) for key, agent in agents.items()}
+        self._run_llms: dict = {}
+        self._lock = threading.Lock()
+        self._apply()
+
+    def task_done(self, task_key: str, output=None, evidence=None) -> None:
+        """Feed signals from finished tasks: evidence_items from the filter, critique_retry from the verdict."""
+        if task_key == "filter" and evidence is not None and output is not None:
+            self.update(evidence_items=len(evidence.cited_ids(output.raw or "")))
+        elif task_key == "critique" and output is not None and critique_verdict(output.raw) == "rejected":
+            self.update(critique_retry=True)
+
+    def close(self) -> None:
+        """Give the agents their own LLMs back."""
+        for agent_key, llm in self.base_llms.items():
+            agent = self.agents.get(agent_key)
+            if agent is not None and llm is not None and agent.llm is not llm:
+                agent.llm = llm
+
+    def _llm_for(self, agent_key: str, model: str):
+        """The agent's own LLM when it is on model, else this run's LLM for it (None if none can be made)."""
+        base = self.base_llms.get(agent_key)
+        if base is None or getattr(base, "model", None) == model:
+            return base
+        with self._lock:
+            if (agent_key, model) not in self._run_llms:
+                if self.make_llm is None:
+                    return None
+                self._run_llms[agent_key, model] = self.make_llm(agent_key, model)
+            return self._run_llms[agent_key, model]
+
+    def update(self, **signals) -> None:
+        with self._lock:
+            self.signals.update({k: v for k, v in signals.items() if v is not None})
+        self._apply()
+
+    def _apply(self) -> None:
+        with self._lock:
+            models = dict(self.policy["models"])
+            matched = []
+            for rule in self.policy["rules"]:
+                if _matches(rule, self.signals):
+                    models.update(rule["models"])
+                    matched.append(rule["name"])
+            changed = {k: m for k, m in models.items() if self.models.get(k) != m}
+            # The first time, only departures from the base models are worth reporting.
+            reported = {k: m for k, m in changed.items() if self.models or m != self.policy["models"][k]}
+            self.models, self.matched = models, matched
+            route = {"signals": dict(self.signals), "rules": list(matched), "models": dict(models)}
+        for agent_key, model in changed.items():
+            agent = self.agents.get(agent_key)
+            llm = self._llm_for(agent_key, model) if agent is not None else None
+            if llm is not None and agent.llm is not llm:
+                agent.llm = llm
+                if self.on_switch:
+                    self.on_switch(agent_key, llm)
+        if reported:
+            print("🔀 Model route ({}): {}".format(
+                ", ".join(matched) or "base models", ", ".join("{} -> {}".format(k, m) for k, m in reported.items())))
+        if self.telemetry:
+            self.telemetry.set_route(route)
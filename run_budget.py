@@ -0,0 +1,100 @@
+"""
+Run-level budgets: wall time, tokens, dollars and tool calls for one crew run.
+
+The limits are checked between calls: before every LLM call and tool call the run's telemetry sees,
+across all agents and tools. A call already running is not interrupted, so a run can go past
+RUN_MAX_SECONDS by the length of one call. Once a limit is reached, the next call raises
+BudgetExceeded. CrewAI hands an exception raised in a tool back to the agent as error text, but the
+limit stays reached, so the agent's next LLM call raises again and that one ends the crew's normal
+flow (no further research or critique rounds). run_or_finish_early() then has the Question Architect
+write the report from the best research available: the filtered summary if the Evidence Filter
+finished, otherwise the unfiltered research. The Question Architect's own calls are never stopped,
+so every run that gets that far still produces a report; a run's tail is bounded by one
+report-writing step.
+
+Limits come from RUN_MAX_SECONDS, RUN_MAX_TOKENS, RUN_MAX_COST_USD and RUN_MAX_TOOL_CALLS
+(unset or 0 means no limit).
+"""
+from __future__ import annotations
+
+import os
+import time
+
+# The agent that writes the report from whatever research exists; its calls are never stopped.
+EXEMPT_AGENTS = ("question_architect",)
+
+
+class BudgetExceeded(RuntimeError):
+    """A run budget was reached; the run should skip to writing the report."""
+
+
+def _env_limit(name: str) -> float:
+    try:
+        return max(0.0, float(os.getenv(name) or 0))
+    except ValueError:
+        print("Ignoring invalid {}={!r}".format(name, os.getenv(name)))
+        return 0.0
+
+
+class RunBudget:
+    """Limits for one run (0 means unlimited). Usage is read from the run's RunTelemetry."""
+
+    def __init__(self, max_seconds: float = 0, max_tokens: float = 0, max_cost_usd: float = 0, max_tool_calls: float = 0):
+        self.limits = {
+            "seconds": max_seconds,
+            "tokens": max_tokens,
+            "cost_usd": max_cost_usd,
+            "tool_calls": max_tool_calls,
+        }
+        self.started = time.perf_counter()
+        # Set once a limit is hit: which one, and whether the report step has begun (checks are off then).
+        self.reason: str | None = None
+        self.finishing = False
+
+    @classmethod
+    def from_env(cls) -> "RunBudget":
+        return cls(
+            max_seconds=_env_limit("RUN_MAX_SECONDS"),
+            max_tokens=_env_limit("RUN_MAX_TOKENS"),
+            max_cost_usd=_env_limit("RUN_MAX_COST_USD"),
+            max_tool_calls=_env_limit("RUN_MAX_TOOL_CALLS"),
+        )
+
+    @property
+    def active(self) -> bool:
+        return any(self.limits.values())
+
+    def exceeded(self, telemetry) -> str | None:
+        """Description of the first limit reached (e.g. "tokens 41230/40000"), or None."""
+        if not self.active:
+            return None
+        usage = dict(telemetry.usage(), seconds=time.perf_counter() - self.started)
+        for key, limit in self.limits.items():
+            if limit and usage[key] >= limit:
+                return "{} {:g}/{:g}".format(key, round(usage[key], 4), limit)
+        return None
+
+    def check(self, telemetry, agent_key: str | None = None) -> None:
+        """Raise BudgetExceeded if a limit is reached (not during the report step or for exempt agents)."""
+        if self.finishing or agent_key in EXEMPT_AGENTS:
+            return
+        reason = self.reason or self.exceeded(telemetry)
+        if reason:
+            self.reason = reason
+            raise BudgetExceeded("Run budget reached: " + reason)
+
+    def summary(self) -> dict:
+        return {"limits": {k: v for k, v in self.limits.items() if v}, "exceeded": self.reason}
+
+
+def run_or_finish_early(budget: RunBudget, run, finish):
+    """
+    Return run(). If the budget stops it, switch the budget to the report step (no more checks) and
+    return finish() instead, e.g. the Output task run on the research so far.
+    """
+    try:
+        return run()
+    except BudgetExceeded as e:
+        print("⏱️  {}; writing the report from the research so far".format(e))
+        budget.finishing = True
+        return finish()
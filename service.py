@@ -0,0 +1,371 @@
+"""
+Service mode: a resident HTTP worker that builds the crew's agents, tools, LLM clients and HTTP
+connection pool once and then runs research jobs against them with a concurrency limit.
+
+    POST /jobs              {"url": ..., "name": ..., "current_work": ..., "refresh": false, "process": ..., "wait": false}
+    GET  /jobs/<id>         job status (plus the report once done)
+    GET  /jobs/<id>/report  the Markdown report (409 until the job is done)
+    GET  /jobs/<id>/stream  the Markdown report as it is written (chunked; ends when the job finishes)
+    GET  /health            worker, queue and job counts
+
+Each concurrent job checks out its own prebuilt agent set (agents and tools hold per-run state),
+so the number of sets equals --workers. Reports and telemetry are saved to reports/ as in the CLI.
+"""
+from __future__ import annotations
+
+import json
+import queue
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from pipeline import DEFAULT_PROCESS, PROCESSES
+from report_store import REPORT_DIR, save_telemetry
+from streaming import StreamBuffer
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8787
+# Finished jobs kept in memory for status/report lookups; older ones are forgotten (files stay on disk).
+MAX_FINISHED_JOBS = 500
+
+# Readers of /stream wake up at least this often to notice dropped connections.
+STREAM_POLL_SECONDS = 15
+
+_JOB_PATH = re.compile(r"^/jobs/([0-9a-f]{32})(/report|/stream)?/?$")
+
+
+class AgentPool:
+    """Prebuilt agent sets, checked out by one job at a time."""
+
+    def __init__(self, size: int, verbose: bool = False):
+        from main import build_agents
+
+        self._sets: queue.Queue = queue.Queue()
+        for _ in range(size):
+            self._sets.put(build_agents(verbose=verbose))
+        self.size = size
+
+    @contextmanager
+    def acquire(self):
+        agents = self._sets.get()
+        try:
+            yield agents
+        finally:
+            self._sets.put(agents)
+
+
+class JobService:
+    """Queues jobs, runs them on a bounded thread pool and keeps their status for lookup."""
+
+    def __init__(self, workers: int = 2, max_queue: int = 50, report_dir: str = REPORT_DIR, verbose: bool = False):
+        # Warm shared resources before the first job: crewai imports, agents, tools, LLM clients,
+        # the pooled HTTP session and the tokenizer.
+        from tools.http_client import get_session
+        from tools.tokens import count_tokens
+
+        get_session()
+        count_tokens("warm up")
+        self.pool = AgentPool(workers, verbose=verbose)
+        self.workers = workers
+        self.max_queue = max_queue
+        self.report_dir = report_dir
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self._jobs: OrderedDict[str, dict] = OrderedDict()
+        self._done_events: dict[str, threading.Event] = {}
+        self._streams: dict[str, StreamBuffer] = {}
+        self._lock = threading.Lock()
+
+    def counts(self) -> dict:
+        with self._lock:
+            statuses = [job["status"] for job in self._jobs.values()]
+        return {status: statuses.count(status) for status in ("queued", "running", "done", "failed")}
+
+    def submit(
+        self,
+        url: str,
+        name: str | None = None,
+        current_work: str | None = None,
+        refresh: bool = False,
+        process: str = DEFAULT_PROCESS,
+    ) -> dict:
+        """Queue a job and return its record. Raises OverflowError when the queue is full."""
+        with self._lock:
+            waiting = sum(1 for job in self._jobs.values() if job["status"] == "queued")
+            if waiting >= self.max_queue:
+                raise OverflowError("Job queue is full ({} waiting)".format(waiting))
+            job = {
+                "id": uuid.uuid4().hex,
+                "url": url,
+                "name": name,
+                "current_work": current_work,
+                "refresh": refresh,
+                "process": process,
+                "status": "queued",
+                "submitted_at": datetime.now().isoformat(timespec="seconds"),
+                "started_at": None,
+                "finished_at": None,
+                "seconds": None,
+                "mode": None,
+                "report_path": None,
+                "telemetry_path": None,
+                "cost_usd": None,
+                "error": None,
+            }
+            self._jobs[job["id"]] = job
+            self._done_events[job["id"]] = threading.Event()
+            self._streams[job["id"]] = StreamBuffer()
+            self._forget_old_jobs()
+        self._executor.submit(self._run, job["id"])
+        return dict(job)
+
+    def get(self, job_id: str) -> dict | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def wait(self, job_id: str, timeout: float | None = None) -> dict | None:
+        """Block until the job finishes (or timeout seconds pass) and return its record."""
+        event = self._done_events.get(job_id)
+        if event:
+            event.wait(timeout)
+        return self.get(job_id)
+
+    def stream(self, job_id: str) -> StreamBuffer | None:
+        """The job's report as it is streamed by the Question Architect."""
+        with self._lock:
+            return self._streams.get(job_id)
+
+    def report(self, job_id: str) -> str | None:
+        job = self.get(job_id)
+        if not job or not job["report_path"]:
+            return None
+        with open(job["report_path"], encoding="utf-8") as f:
+            return f.read()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _forget_old_jobs(self) -> None:
+        # Only jobs whose worker has set the done event: _run still updates and signals the others.
+        finished = [
+            job_id for job_id, job in self._jobs.items()
+            if job["status"] in ("done", "failed") and self._done_events[job_id].is_set()
+        ]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+            self._done_events.pop(job_id, None)
+            self._streams.pop(job_id, None)
+
+    def _update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            self._jobs[job_id].update(fields)
+
+    def _run(self, job_id: str) -> None:
+        from main import research_person
+        from telemetry import RunTelemetry
+
+        with self._lock:
+            job = dict(self._jobs[job_id])
+            done, stream = self._done_events[job_id], self._streams[job_id]
+        started = time.perf_counter()
+        self._update(job_id, status="running", started_at=datetime.now().isoformat(timespec="seconds"))
+        telemetry = RunTelemetry(job["url"], name=job["name"])
+        fields = {}
+        text = None
+        try:
+            with self.pool.acquire() as agents:
+                text, report_path, fields["mode"] = research_person(
+                    job["url"],
+                    name=job["name"],
+                    current_work=job["current_work"],
+                    verbose=False,
+                    refresh=job["refresh"],
+                    telemetry=telemetry,
+                    agents=agents,
+                    report_dir=self.report_dir,
+                    process=job["process"],
+                    report_sinks=[stream],
+                )
+            if report_path:
+                fields.update(status="done", report_path=report_path)
+            else:
+                fields.update(status="failed", error="Crew produced no output")
+        except Exception as e:
+            fields.update(status="failed", error="{}: {}".format(type(e).__name__, e))
+        try:
+            fields["telemetry_path"] = save_telemetry(
+                telemetry, job["url"], name=job["name"], report_path=fields.get("report_path"), report_dir=self.report_dir
+            )
+            fields["cost_usd"] = telemetry.summary()["cost_usd"]["total"]
+        except OSError as e:
+            print("Could not write telemetry for {}: {}".format(job["url"], e))
+        fields["seconds"] = round(time.perf_counter() - started, 2)
+        fields["finished_at"] = datetime.now().isoformat(timespec="seconds")
+        self._update(job_id, **fields)
+        stream.close(final_text=text if fields["status"] == "done" else None)
+        done.set()
+        print("{} {} ({}s){}".format(
+            fields["status"].upper(), job["url"], fields["seconds"],
+            " -> " + fields["report_path"] if fields.get("report_path") else " - " + (fields.get("error") or "")))
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """JSON API over a JobService (set on the server as server.jobs)."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # noqa: A002 - job results are printed instead
+        pass
+
+    def _send(self, status: int, body: str, content_type: str = "application/json") -> None:
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        self._send(status, json.dumps(payload))
+
+    def _send_stream(self, stream: StreamBuffer | None) -> None:
+        """Send the streamed report with chunked transfer encoding until the job finishes."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/markdown; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        offset = 0
+        try:
+            while stream is not None:
+                text, closed = stream.read(offset, timeout=STREAM_POLL_SECONDS)
+                if text:
+                    data = text.encode("utf-8")
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                    self.wfile.flush()
+                    offset += len(text)
+                if closed:
+                    break
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def do_GET(self):
+        jobs: JobService = self.server.jobs
+        if self.path.rstrip("/") == "/health":
+            self._send_json(200, {"status": "ok", "workers": jobs.workers, "jobs": jobs.counts()})
+            return
+        match = _JOB_PATH.match(self.path)
+        job = jobs.get(match.group(1)) if match else None
+        if not job:
+            self._send_json(404, {"error": "Unknown job"})
+            return
+        if match.group(2) == "/stream":
+            self._send_stream(jobs.stream(job["id"]))
+            return
+        if match.group(2):
+            if job["status"] != "done":
+                self._send_json(409, {"error": "Job is {}".format(job["status"]), "status": job["status"]})
+                return
+            self._send(200, jobs.report(job["id"]) or "", content_type="text/markdown; charset=utf-8")
+            return
+        if job["status"] == "done":
+            job["report"] = jobs.report(job["id"])
+        self._send_json(200, job)
+
+    def do_POST(self):
+        from main import validate_linkedin_url
+
+        jobs: JobService = self.server.jobs
+        if self.path.rstrip("/") != "/jobs":
+            self._send_json(404, {"error": "Not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except (ValueError, json.JSONDecodeError):
+            self._send_json(400, {"error": "Body must be a JSON object"})
+            return
+        url = str(payload.get("url") or payload.get("linkedin_url") or "").strip()
+        url_error = validate_linkedin_url(url)
+        if url_error:
+            self._send_json(400, {"error": url_error})
+            return
+        process = payload.get("process") or DEFAULT_PROCESS
+        if process not in PROCESSES:
+            self._send_json(400, {"error": "process must be one of: {}".format(", ".join(PROCESSES))})
+            return
+        try:
+            job = jobs.submit(
+                url,
+                name=str(payload.get("name") or "").strip() or None,
+                current_work=str(payload.get("current_work") or "").strip() or None,
+                refresh=bool(payload.get("refresh")),
+                process=process,
+            )
+        except OverflowError as e:
+            self._send_json(503, {"error": str(e)})
+            return
+        if not payload.get("wait"):
+            self._send_json(202, job)
+            return
+        job = jobs.wait(job["id"])
+        if job["status"] == "done":
+            job["report"] = jobs.report(job["id"])
+        self._send_json(200, job)
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: int = 2, max_queue: int = 50) -> None:
+    """Build the shared resources, then serve until interrupted."""
+    started = time.perf_counter()
+    jobs = JobService(workers=workers, max_queue=max_queue)
+    server = ThreadingHTTPServer((host, port), ServiceHandler)
+    server.daemon_threads = True
+    server.jobs = jobs
+    print("Service ready in {:.1f}s on http://{}:{} ({} workers, queue limit {})".format(
+        time.perf_counter() - started, host, port, workers, max_queue))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        jobs.shutdown()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass  # .env not loaded if python-dotenv not installed
+
+    parser = argparse.ArgumentParser(
+        description="Run the Conversation Starter crew as a resident HTTP service with warm agents and connections."
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Interface to bind (default: {})".format(DEFAULT_HOST))
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on (default: {})".format(DEFAULT_PORT))
+    parser.add_argument("--workers", type=int, default=2, help="Jobs run at once; one agent set each (default: 2)")
+    parser.add_argument(
+        "--max-queue",
+        dest="max_queue",
+        type=int,
+        default=50,
+        help="Jobs allowed to wait for a worker before new ones get 503 (default: 50)",
+    )
+    args = parser.parse_args()
+
+    from main import missing_env_keys
+
+    missing = missing_env_keys()
+    if missing:
+        parser.error("Missing required environment variables: {} (set them in .env)".format(", ".join(missing)))
+
+    serve(host=args.host, port=args.port, workers=max(1, args.workers), max_queue=max(0, args.max_queue))
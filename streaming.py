@@ -0,0 +1,186 @@
+"""
+Streaming the report while the Question Architect writes it.
+
+The architect's LLM is switched to stream=True for the run, and CrewAI's LLM stream-chunk events from
+that LLM are passed on to sinks (stdout, the report file, a service job's buffer). Only the text after
+"Final Answer:" is passed on, so tool-use turns and the agent's reasoning are not shown. If this crewai
+version has no stream events, nothing is streamed and the report appears when the run finishes.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import threading
+
+FINAL_ANSWER = "Final Answer:"
+
+# id(llm) -> ReportStream for the LLMs currently being streamed (one per concurrent run).
+_active: dict[int, "ReportStream"] = {}
+_active_lock = threading.Lock()
+_handlers_registered: bool | None = None
+
+
+def _register_handlers() -> bool:
+    """Subscribe to CrewAI's LLM events once per process; False when this crewai has no stream events."""
+    global _handlers_registered
+    with _active_lock:
+        if _handlers_registered is not None:
+            return _handlers_registered
+        try:
+            from crewai.events import LLMCallStartedEvent, LLMStreamChunkEvent, crewai_event_bus
+        except ImportError:
+            try:
+                from crewai.utilities.events import crewai_event_bus
+                from crewai.utilities.events.llm_events import LLMCallStartedEvent, LLMStreamChunkEvent
+            except ImportError:
+                _handlers_registered = False
+                return False
+
+        @crewai_event_bus.on(LLMCallStartedEvent)
+        def _on_call_started(source, event):
+            stream = _active.get(id(source))
+            if stream:
+                stream.call_started()
+
+        @crewai_event_bus.on(LLMStreamChunkEvent)
+        def _on_chunk(source, event):
+            stream = _active.get(id(source))
+            if stream:
+                stream.feed(getattr(event, "chunk", "") or "")
+
+        _handlers_registered = True
+        return True
+
+
+class ReportStream:
+    """
+    Context manager that streams one LLM's final answers to sink callables while the block runs.
+    Each LLM call starts afresh; text is passed on from just after its "Final Answer:" marker.
+    """
+
+    def __init__(self, llm, *sinks):
+        self.llm = llm
+        self.sinks = [sink for sink in sinks if sink]
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._call_text = ""
+        self._sent = None  # offset in _call_text up to which text was passed on; None before the marker
+        self._previous_stream = None
+
+    def __enter__(self) -> "ReportStream":
+        if not self.sinks or not _register_handlers():
+            return self
+        self._previous_stream = getattr(self.llm, "stream", False)
+        self.llm.stream = True
+        with _active_lock:
+            _active[id(self.llm)] = self
+        self.enabled = True
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if not self.enabled:
+            return
+        with _active_lock:
+            _active.pop(id(self.llm), None)
+        self.llm.stream = self._previous_stream
+        self.enabled = False
+
+    def retarget(self, llm) -> None:
+        """Stream llm instead (e.g. the architect was routed to another model's LLM for this run)."""
+        if llm is self.llm:
+            return
+        if not self.enabled:
+            self.llm = llm
+            return
+        with _active_lock:
+            _active.pop(id(self.llm), None)
+            _active[id(llm)] = self
+        self.llm.stream = self._previous_stream
+        self._previous_stream = getattr(llm, "stream", False)
+        llm.stream = True
+        self.llm = llm
+
+    def call_started(self) -> None:
+        with self._lock:
+            self._call_text = ""
+            self._sent = None
+
+    def feed(self, chunk: str) -> None:
+        with self._lock:
+            self._call_text += chunk
+            if self._sent is None:
+                marker = self._call_text.find(FINAL_ANSWER)
+                if marker == -1:
+                    return
+                # Skip the whitespace after the marker; wait for the first real character.
+                start = marker + len(FINAL_ANSWER)
+                while start < len(self._call_text) and self._call_text[start].isspace():
+                    start += 1
+                if start == len(self._call_text):
+                    return
+                self._sent = start
+            text = self._call_text[self._sent:]
+            self._sent = len(self._call_text)
+        if text:
+            for sink in self.sinks:
+                sink(text)
+
+
+def stdout_sink(text: str) -> None:
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
+
+class FileSink:
+    """Appends streamed text to a file as it arrives (the final report later overwrites it)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "w", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def __call__(self, text: str) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(text)
+                self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+    def discard(self) -> None:
+        """Close and delete the file (the run failed or produced no report)."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class StreamBuffer:
+    """Streamed text kept in memory for readers in other threads (service mode's /stream endpoint)."""
+
+    def __init__(self):
+        self._text = ""
+        self.closed = False
+        self._changed = threading.Condition()
+
+    def __call__(self, text: str) -> None:
+        with self._changed:
+            self._text += text
+            self._changed.notify_all()
+
+    def close(self, final_text: str | None = None) -> None:
+        """Mark the stream finished; final_text is used when nothing was streamed (e.g. a reused report)."""
+        with self._changed:
+            if final_text is not None and not self._text:
+                self._text = final_text
+            self.closed = True
+            self._changed.notify_all()
+
+    def read(self, offset: int = 0, timeout: float | None = None) -> tuple[str, bool]:
+        """Text after offset, waiting up to timeout for more when there is none yet; also whether the stream is closed."""
+        with self._changed:
+            self._changed.wait_for(lambda: len(self._text) > offset or self.closed, timeout)
+            return self._text[offset:], self.closed
@@ -1,24 +1,162 @@
 """
-CrewAI tasks for the networking research crew (hierarchical process).
+CrewAI tasks for the networking research crew (hierarchical process, or the fixed DAG in pipeline.py).
 """
 from crewai import Task, Agent
 
+from company_facts import cached_facts, store_approved_facts
+from context_budget import load_budgets, make_compactor
+from personal_context import cached_summary, interests_hash, store_summary
+from pipeline import critique_verdict
+from prefetch import standard_queries
+from tools.evidence import inline_sources, strip_sources
+from tools.evidence_scorer import UNVERIFIED
+
+# Worker agent that owns each task (the orchestrator manages all of them in hierarchical mode).
+TASK_AGENTS = {
+    "research": "web_researcher",
+    "context_sync": "personal_context_agent",
+    "filter": "evidence_filter_agent",
+    "critique": "review_critique_agent",
+    "output": "question_architect",
+}
+
+
+# Tasks whose outputs cite evidence IDs and get a rebuilt "Sources:" block.
+CITING_TASKS = ("research", "filter")
+
+
+def _task_callback(task_key: str, budgets: dict, on_task_done=None, evidence=None):
+    """
+    Callback for a finished task: compact its output to the context budget, then notify on_task_done.
+    With the run's EvidenceStore, Research and Evidence Filter outputs get a "Sources:" block for the IDs they cite.
+    """
+    cites = evidence is not None and task_key in CITING_TASKS
+    unverified_ids = (lambda: {r.id for r in evidence.results(UNVERIFIED)}) if cites else None
+    compactor = make_compactor(task_key, budgets, unverified_ids=unverified_ids) if task_key in budgets else None
+
+    def _callback(output) -> None:
+        # The pipeline reads the critique's verdict from its opening word: take it before compaction can trim it.
+        verdict = critique_verdict(output.raw) if task_key == "critique" else None
+        if cites and output.raw:
+            output.raw = strip_sources(output.raw)
+        if compactor:
+            compactor(output)
+        if verdict and critique_verdict(output.raw) != verdict:
+            output.raw = "{}\n{}".format(verdict.upper(), output.raw or "")
+        if cites and output.raw:
+            output.raw = evidence.with_sources(output.raw)
+        if on_task_done:
+            on_task_done(task_key, output)
+
+    return _callback
+
 
 def create_tasks(
     agents: dict,
     linkedin_url: str,
     name: str | None = None,
     current_work: str | None = None,
+    context_budgets: dict | None = None,
+    on_task_done=None,
+    reuse_personal_context: bool = True,
+    prior_summary: str | None = None,
+    research_changes: list[str] | None = None,
+    explicit_verdict: bool = False,
+    evidence=None,
+    company: str | None = None,
+    reuse_company_facts: bool = True,
 ):
     """
     Create the five tasks. Pass linkedin_url for Research and Evidence Filter.
     name and current_work are used to disambiguate when many people share the same name.
+    context_budgets overrides the per-task token budgets for outputs handed on as context
+    (see context_budget.DEFAULT_BUDGETS). on_task_done(task_key, output) is called after each task.
+    When a Context Sync summary is cached for the current my_interests.md (see personal_context.py) and
+    reuse_personal_context is True, that task is left out and the summary is written into the Critique
+    and Output task descriptions instead.
+    prior_summary is the filtered summary of a previous run on this person (see change_detection.py).
+    With research_changes (what changed since), Research becomes an incremental "what's new" pass seeded
+    with it; without, Research and Evidence Filter are left out and it is used as the filtered research.
+    explicit_verdict=True (pipeline process, no manager to delegate through) makes Critique open its answer
+    with APPROVED or REJECTED instead of delegating back to the Web Researcher.
+    evidence is the run's tools.evidence.EvidenceStore (the one bound to the tools): Research and Evidence
+    Filter cite facts by evidence ID and their outputs get a "Sources:" block with the URLs and pre-check tags.
+    company is the person's current company: Research reports company-level facts in a Company context
+    section, stored from the filtered research once the critique approves it, for later runs on people at
+    that company (see company_facts.py). When
+    facts for it are cached and reuse_company_facts is True, they are given to Research instead.
+    Each task is named after its TASK_AGENTS key.
     """
     web_researcher = agents["web_researcher"]
     personal_context_agent = agents["personal_context_agent"]
     evidence_filter_agent = agents["evidence_filter_agent"]
     review_critique_agent = agents["review_critique_agent"]
     question_architect = agents["question_architect"]
+    # Outputs passed on via context=[...] are compacted to these token budgets by each task's callback.
+    budgets = load_budgets(context_budgets)
+
+    # Personal context only changes when my_interests.md does: reuse the summary cached for its hash.
+    interests_digest = interests_hash()
+    personal_summary = cached_summary(interests_digest) if reuse_personal_context else None
+    personal_context_note = ""
+    if personal_summary:
+        personal_context_note = (
+            "\n\nThe user's Personal Context (focus areas, interests and expertise from my_interests.md):\n"
+            + personal_summary
+        )
+
+    # Previous filtered research: seeds an incremental research pass, or stands in for research and filtering.
+    incremental_note = ""
+    prior_research_note = ""
+    if prior_summary and research_changes:
+        incremental_note = (
+            "\n\nINCREMENTAL RUN: this person was researched before and the filtered summary from that run is below; "
+            "treat its facts as already verified. Changes since then: {changes}. Research only what is new or "
+            "changed: fetch the LinkedIn profile again and search only to cover the changes listed; do not repeat "
+            "searches for facts already in the previous summary. Output the full updated summary: previous facts "
+            "that still hold (keep their source URLs) plus the new ones, and drop facts the changes make outdated."
+            "\n\nPrevious filtered summary:\n{summary}"
+        ).format(changes="; ".join(research_changes), summary=inline_sources(prior_summary))
+    elif prior_summary:
+        prior_research_note = (
+            "\n\nThe FILTERED research summary (output of the Research Evidence Filter; the person's profile and "
+            "web results are unchanged since it was produced):\n" + prior_summary
+        )
+
+    # Company-level facts are shared across people at the same company: reuse them instead of searching.
+    company_name = company.strip() if company else ""
+    known_company_facts = cached_facts(company_name) if company_name and reuse_company_facts else None
+    company_note = ""
+    company_output = ""
+    company_filter_note = ""
+    if company_name:
+        company_output = (
+            " (4) Company context: up to 5 facts about {company} itself (recent news, funding, products), "
+            "not about the person, each cited like the other facts."
+        ).format(company=company_name)
+        company_filter_note = (
+            " The Company context section holds facts about {company} itself, not about the person: keep those "
+            "that are sourced and clearly about that company, even though they do not name the person."
+        ).format(company=company_name)
+    if known_company_facts:
+        company_note = (
+            "\n\nCOMPANY CONTEXT ALREADY KNOWN: these facts about {company} come from earlier research and are "
+            "verified. Do not search for {company}'s news, funding or products; copy these facts, with their source "
+            "URLs, into your Company context section unchanged.\n{facts}"
+        ).format(company=company_name, facts="\n".join("- " + fact for fact in known_company_facts))
+
+    # Company facts are shared with later runs only once the critique approves the filtered research.
+    latest_filter: dict = {}
+
+    def _on_task_done(task_key: str, output) -> None:
+        if task_key == "context_sync":
+            store_summary(interests_digest, output.raw or "")
+        if task_key == "filter":
+            latest_filter["raw"] = output.raw or ""
+        if task_key == "critique" and company_name and not known_company_facts and latest_filter:
+            store_approved_facts(company_name, latest_filter["raw"], output.raw)
+        if on_task_done:
+            on_task_done(task_key, output)
 
     # Disambiguation context for tasks (avoid mixing into prompts when not provided)
     name_ctx = name.strip() if name else ""
@@ -38,34 +176,50 @@ def create_tasks(
             " The target person's current work (company/role) is \"{current_work}\". Use it to disambiguate web search."
         ).format(current_work=current_work_ctx)
 
+    # Batch mode prefetches these searches (prefetch.py), so starting with them costs no API call.
+    first_queries = [] if incremental_note else standard_queries(name_ctx, current_work_ctx)
+    queries_note = ""
+    if first_queries:
+        queries_note = " Include these queries, verbatim, in that first call: {}.".format("; ".join(first_queries))
+
     # 1. Research Task – LinkedIn as source of truth when available; web for extra context. Ground all facts.
     research_task = Task(
+        name="research",
         description=(
             "Produce a summary of this person's career vibe, key achievements, and non-obvious interests. "
             "When the LinkedIn tool is configured, use it first with this URL: {linkedin_url}. Treat LinkedIn data "
             "(headline, experience, education) as the source of truth for job titles, companies, and dates. "
             "Use web search (Firecrawl) only to add additional information (talks, articles, side projects) that "
             "clearly refers to this person; do not let web snippets contradict or replace LinkedIn facts. "
-            "If LinkedIn is not configured, use only web search.{disambiguation}\n\n"
+            "If LinkedIn is not configured, use only web search.{disambiguation} "
+            "Batch your web searches: pass all your targeted queries to the Firecrawl Multi Search tool in one call "
+            "and use the single-query search only for follow-ups.{queries_note}\n\n"
             "CRITICAL: Only include facts that appear in the tool results. Do not infer, assume, or invent any "
             "details (e.g. numbers, titles, achievements). If a claim is not clearly stated in the tool output, omit it. "
             "Prefer saying 'not found' over guessing. Focus on conversation-worthy hooks that are explicitly supported.\n\n"
+            "Tool results are labelled with evidence IDs: P1 for the LinkedIn profile, E1, E2.. for its experience, "
+            "S1, S2.. for education and W1, W2.. for web results. Cite each fact with the IDs it comes from, e.g. "
+            "'(E2)' or '(W3, W5)', instead of copying URLs; a Sources list with each cited ID's URL and pre-check "
+            "tag is attached to your summary automatically.\n\n"
             "If you receive feedback from the Review & Critique Agent (in your context), carefully review their "
             "rejection reasons and specific instructions. Address each issue they identified: fix unsupported claims, "
             "add missing sources, search for more concrete information, or remove generic content as directed. "
             "Do not repeat the same mistakes that led to the rejection."
-        ).format(linkedin_url=linkedin_url, disambiguation=disambiguation_note),
+        ).format(linkedin_url=linkedin_url, disambiguation=disambiguation_note, queries_note=queries_note)
+        + company_note
+        + incremental_note,
         expected_output=(
             "A structured summary: (1) Career vibe with enough detail for a narrative (include career progression, "
             "key transitions, motivations, and notable experiences), (2) Key achievements (bullets), "
-            "(3) Non-obvious interests or angles (bullets). For each fact from web search, include the source URL "
-            "(e.g. 'Source: https://...') so the Evidence Filter can verify the result refers to this person. "
+            "(3) Non-obvious interests or angles (bullets).{company_output} Cite every fact with its evidence IDs (e.g. '(W3)', '(E1)') "
+            "so the Evidence Filter can verify the result refers to this person. "
             "Every bullet must be traceable to a specific tool result; do not add unsupported claims. "
             "Gather enough information about their career journey, education, major roles, transitions, and motivations "
             "to enable writing a compelling 3-4 paragraph life story. If this is a revision based on critique feedback, "
             "explicitly address the issues raised in the feedback."
-        ),
+        ).format(company_output=company_output),
         agent=web_researcher,
+        callback=_task_callback("research", budgets, _on_task_done, evidence),
     )
 
     # 2. Evidence Filter Task – Keep only research with concrete evidence it refers to the target person
@@ -86,27 +240,37 @@ def create_tasks(
         ).format(current_work=current_work_ctx)
 
     filter_task = Task(
+        name="filter",
         description=(
             "You receive the Web Researcher's summary and the target person's LinkedIn URL: {linkedin_url}.{filter_disc}"
             " Filter out any fact or web search result that does NOT have concrete evidence it refers to this specific person. "
+            "Facts cite evidence IDs (P1/E#/S# are LinkedIn, W# are web results); the Sources list at the end of the "
+            "summary gives each web result's URL and pre-check tag. Web results were pre-checked locally against the "
+            "name, LinkedIn companies and schools: results tagged '[pre-check: match]' already show that evidence; "
+            "judge '[pre-check: unverified]' results yourself. "
             "Keep only: (1) Facts from LinkedIn (they refer to this profile). "
             "(2) Web results where the source explicitly names the person AND matches their company/role (e.g. same company as LinkedIn), "
             "or the URL clearly identifies them (e.g. their blog, their talk, their company profile naming them). "
             "Remove: generic claims, results that could be about another person with the same name, any fact whose source "
             "does not clearly identify the target person. Output a filtered research summary with only the facts that pass; "
-            "do not add new information. If in doubt, exclude the fact."
-        ).format(linkedin_url=linkedin_url, filter_disc=filter_disambiguation),
+            "do not add new information. Keep the evidence IDs on the facts you keep (the Sources list is rebuilt "
+            "from them). If in doubt, exclude the fact.{company_filter_note}"
+        ).format(linkedin_url=linkedin_url, filter_disc=filter_disambiguation, company_filter_note=company_filter_note),
         expected_output=(
-            "A filtered research summary with the same structure (career vibe, key achievements, interests) but containing "
-            "only facts that have concrete evidence they refer to the target person. List which items were removed and why "
+            "A filtered research summary with the same structure (career vibe, key achievements, interests, and company "
+            "context if present) but containing "
+            "only facts that have concrete evidence they refer to the target person (or, for company context, to their "
+            "company). List which items were removed and why "
             "(one line each), then the filtered summary."
         ),
         agent=evidence_filter_agent,
+        callback=_task_callback("filter", budgets, _on_task_done, evidence),
         context=[research_task],
     )
 
     # 3. Context Sync Task – Extract my focus areas from my_interests.md
     context_sync_task = Task(
+        name="context_sync",
         description=(
             "Read my_interests.md and extract the user's current focus areas, interests, and expertise. "
             "Provide a concise summary that can be used to validate research quality and to craft "
@@ -117,10 +281,25 @@ def create_tasks(
             "Keep it scannable so the Critique and Question Architect can use it."
         ),
         agent=personal_context_agent,
+        callback=_task_callback("context_sync", budgets, _on_task_done),
     )
+    # With a cached summary the task is skipped; its text is in the Critique and Output descriptions.
+    personal_context_tasks = [] if personal_summary else [context_sync_task]
+    # With an unchanged previous summary, research and filtering are skipped the same way.
+    filter_context = [] if prior_research_note else [filter_task]
+
+    # Pipeline process: the retry loop is code, so Critique states its verdict instead of delegating.
+    verdict_note = ""
+    if explicit_verdict:
+        verdict_note = (
+            "\n\nThere is no delegation in this run. Start your answer with the word APPROVED or REJECTED. "
+            "When rejecting, follow it with your feedback for the Web Researcher; it is passed to them verbatim "
+            "for another research pass."
+        )
 
     # 4. Critique Task – Check depth and factual grounding of the filtered research.
     critique_task = Task(
+        name="critique",
         description=(
             "Evaluate the FILTERED research (output of the Research Evidence Filter) on two dimensions: "
             "(1) Depth and relevance to the user's interests (Personal Context). "
@@ -129,24 +308,31 @@ def create_tasks(
             "Prefer approving only when the filtered summary is both substantive and grounded. "
             "Delegate back to the Web Researcher if the filtered research is generic, empty, lacks concrete hooks, or "
             "contains unsupported details. If it meets the bar, approve for the Question Architect."
+            + prior_research_note
+            + personal_context_note
+            + verdict_note
         ),
         expected_output=(
-            "Either: (a) Approval with a one-sentence handoff to the Question Architect, or "
-            "(b) Rejection with CLEAR, ACTIONABLE feedback for the Web Researcher. When rejecting, you MUST include: "
+            "Start with the word APPROVED or REJECTED. Then either: (a) for approval, a one-sentence handoff to the "
+            "Question Architect, or "
+            "(b) for rejection, CLEAR, ACTIONABLE feedback for the Web Researcher. When rejecting, you MUST include: "
             "(1) Specific reasons for rejection (e.g. 'Claim X lacks source', 'Too generic - missing concrete achievements', "
             "'Unsupported detail Y was included'), (2) Concrete instructions on what to fix (e.g. 'Search for specific projects', "
-            "'Include source URLs for all claims', 'Remove unsupported achievement Z'). This feedback will be passed to the "
+            "'Cite evidence IDs for all claims', 'Remove unsupported achievement Z'). This feedback will be passed to the "
             "Web Researcher so they can address the issues without repeating the same mistakes."
         ),
         agent=review_critique_agent,
-        context=[filter_task, context_sync_task],
+        callback=_task_callback("critique", budgets, _on_task_done),
+        context=[*filter_context, *personal_context_tasks],
         allow_delegation=True,
     )
 
     # 5. Output Task – Markdown report grounded in filtered research only; no invented facts.
     output_task = Task(
+        name="output",
         description=(
-            "Produce a Markdown report for the user with: "
+            "Produce a Markdown report for the user with these sections, in this order and starting with the Career "
+            "Vibe section (it is shown to the user while the rest is still being written): "
             "(1) A detailed Career Vibe section (3-4 paragraphs) that tells the person's life story. Write this as a "
             "narrative that flows chronologically or thematically, covering: their background/education, career progression "
             "and key transitions, major roles and achievements, what drives them, and their current focus. Make it engaging "
@@ -160,8 +346,11 @@ def create_tasks(
             "(the output of the Research Evidence Filter). Do not add any fact about the person that is not in that "
             "filtered research. If the research is sparse, keep the narrative conservative and generic rather than inventing details. "
             "Prefer generic but accurate descriptions over specific but unsupported ones. "
+            "Do not copy evidence IDs (e.g. '(W3)', '(E1)') or the Sources list into the report. "
             "If the person has an expertise or area the user does not yet have, append 'What I can learn from them' "
             "with up to ten items and, if relevant, use the 'Append to My Interests' tool to add a new Interest entry to my_interests.md."
+            + prior_research_note
+            + personal_context_note
         ),
         expected_output=(
             "A Markdown report containing: a detailed Career Vibe section (3-4 paragraphs telling their life story), "
@@ -170,7 +359,10 @@ def create_tasks(
             "Every claim about the person in the Career Vibe narrative must appear in the filtered research; no unsupported details."
         ),
         agent=question_architect,
-        context=[filter_task, context_sync_task, critique_task],
+        callback=_task_callback("output", budgets, _on_task_done),
+        context=[*filter_context, *personal_context_tasks, critique_task],
     )
 
-    return [research_task, context_sync_task, filter_task, critique_task, output_task]
+    if prior_research_note:
+        return [*personal_context_tasks, critique_task, output_task]
+    return [research_task, *personal_context_tasks, filter_task, critique_task, output_task]
@@ -0,0 +1,245 @@
+"""
+Per-run performance telemetry: wall time, LLM calls, tokens and cost per task and agent, plus
+latency, HTTP status and cache hits per tool call. One JSON record per run is written next to the report.
+"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from llm_cache import last_call_replayed
+from tools.tokens import count_tokens, messages_text
+
+# USD per 1M tokens (input, output). Check https://platform.openai.com/docs/pricing for current rates.
+LLM_PRICING = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+}
+# USD per real (uncached) API call, per COST_ESTIMATE.md: Proxycurl ~1 credit; Firecrawl ~2 credits at ~$0.0053.
+TOOL_API_CALL_COST = {
+    "LinkedIn Profile Scraper": 0.01,
+    "Firecrawl Web Search": 0.0106,
+    "Firecrawl Multi Search": 0.0106,
+}
+
+
+def llm_cost(model: str, input_tokens: int, output_tokens: int) -> float:
+    """Dollar cost of a call; unknown models are priced as gpt-4o to avoid under-reporting."""
+    name = (model or "").split("/")[-1]
+    input_price, output_price = LLM_PRICING.get(name, LLM_PRICING["gpt-4o"])
+    return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+
+_ORIGINAL_CALL = "_telemetry_original_call"
+
+
+def uninstrument_llm(llm):
+    """Remove a RunTelemetry wrapper from llm (if any) and return its unwrapped call."""
+    original_call = vars(llm).pop(_ORIGINAL_CALL, None)
+    if original_call is None:
+        return llm.call
+    # Restore rather than delete: the wrapped call may itself be a wrapper (e.g. the rate limiter's).
+    object.__setattr__(llm, "call", original_call)
+    return original_call
+
+
+class RunTelemetry:
+    """
+    Collects measurements for one run. Thread-safe: tools may record from worker threads.
+    Tools record through tool_call(); LLMs are wrapped with instrument_llm(); tasks report
+    completion through task_done().
+    """
+
+    def __init__(self, linkedin_url: str, name: str | None = None):
+        self.linkedin_url = linkedin_url
+        self.name = name
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self._last_task_end = self._start
+        self.llm_calls: list[dict] = []
+        self.tool_calls: list[dict] = []
+        self.tasks: list[dict] = []
+        self.status = "running"
+        self.error: str | None = None
+        self.wall_seconds: float | None = None
+        self.route: dict | None = None
+        # Optional run_budget.RunBudget, checked before every LLM and tool call (see set_budget).
+        self.budget = None
+
+    # --- Recording ---
+
+    def instrument_llm(self, llm, agent_key: str):
+        """
+        Wrap llm.call so every call records latency and input/output tokens for agent_key.
+        Re-instrumenting an LLM (reused across runs) replaces the previous run's wrapper.
+        """
+        original_call = uninstrument_llm(llm)
+
+        def call(messages, *args, **kwargs):
+            if self.budget is not None:
+                self.budget.check(self, agent_key)
+            started = time.perf_counter()
+            # Read per call: model routing (routing.py) may switch the model during the run.
+            model = getattr(llm, "model", "unknown")
+            record = {"agent": agent_key, "model": model, "input_tokens": count_tokens(messages_text(messages), model)}
+            try:
+                response = original_call(messages, *args, **kwargs)
+            except Exception as e:
+                record["error"] = f"{type(e).__name__}: {e}"
+                raise
+            else:
+                record["output_tokens"] = count_tokens(response if isinstance(response, str) else str(response), model)
+                # Served by the LLM record/replay cache: no latency or cost worth counting.
+                record["replayed"] = last_call_replayed()
+                return response
+            finally:
+                record.setdefault("output_tokens", 0)
+                record["seconds"] = round(time.perf_counter() - started, 3)
+                with self._lock:
+                    self.llm_calls.append(record)
+
+        # object.__setattr__ so this also works when the LLM class is a pydantic model.
+        object.__setattr__(llm, "call", call)
+        object.__setattr__(llm, _ORIGINAL_CALL, original_call)
+        return llm
+
+    def set_budget(self, budget) -> None:
+        """Enforce a run_budget.RunBudget on the LLM and tool calls recorded from now on."""
+        self.budget = budget
+
+    def usage(self) -> dict:
+        """Tokens, dollars and tool calls so far (what run budgets are measured against)."""
+        with self._lock:
+            llm_calls = [c for c in self.llm_calls if not c.get("replayed")]
+            tool_calls = list(self.tool_calls)
+        return {
+            "tokens": sum(c["input_tokens"] + c["output_tokens"] for c in llm_calls),
+            "cost_usd": sum(llm_cost(c["model"], c["input_tokens"], c["output_tokens"]) for c in llm_calls)
+            + sum(c["api_calls"] * TOOL_API_CALL_COST.get(c["tool"], 0.0) for c in tool_calls),
+            "tool_calls": len(tool_calls),
+        }
+
+    def set_route(self, route: dict) -> None:
+        """Record the run's model route (routing.RunRouter): signals, matched rules and models per agent."""
+        with self._lock:
+            self.route = route
+
+    @contextmanager
+    def tool_call(self, tool: str):
+        """
+        Time one tool invocation. The tool fills in api_calls, cache_hits, http_statuses and error.
+        Raises run_budget.BudgetExceeded before the call when the run's budget is used up.
+        """
+        if self.budget is not None:
+            self.budget.check(self)
+        record = {"tool": tool, "api_calls": 0, "cache_hits": 0, "http_statuses": [], "error": None}
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["seconds"] = round(time.perf_counter() - started, 3)
+            with self._lock:
+                self.tool_calls.append(record)
+
+    def task_done(self, task_key: str, agent_key: str, started: float | None = None) -> None:
+        """
+        Mark a task finished. Its wall time is measured from started (a time.perf_counter() value) when
+        given, as for concurrent tasks, else from the previous task's end (tasks run in sequence).
+        """
+        now = time.perf_counter()
+        with self._lock:
+            self.tasks.append({
+                "task": task_key,
+                "agent": agent_key,
+                "seconds": round(now - (self._last_task_end if started is None else started), 3),
+            })
+            self._last_task_end = now
+
+    def finish(self, status: str = "done", error: str | None = None) -> None:
+        self.status = status
+        self.error = error
+        self.wall_seconds = round(time.perf_counter() - self._start, 3)
+
+    # --- Reporting ---
+
+    def summary(self) -> dict:
+        """Aggregate the run into one JSON-serializable record."""
+        with self._lock:
+            llm_calls = list(self.llm_calls)
+            tool_calls = list(self.tool_calls)
+            tasks = [dict(t) for t in self.tasks]
+
+        agents: dict[str, dict] = {}
+        for call in llm_calls:
+            stats = agents.setdefault(call["agent"], {
+                "llm_calls": 0, "replayed_calls": 0, "llm_seconds": 0.0, "input_tokens": 0, "output_tokens": 0,
+                "models": [], "cost_usd": 0.0,
+            })
+            stats["llm_calls"] += 1
+            if call.get("replayed"):
+                stats["replayed_calls"] += 1
+                continue
+            stats["llm_seconds"] = round(stats["llm_seconds"] + call["seconds"], 3)
+            stats["input_tokens"] += call["input_tokens"]
+            stats["output_tokens"] += call["output_tokens"]
+            if call["model"] not in stats["models"]:
+                stats["models"].append(call["model"])
+            stats["cost_usd"] += llm_cost(call["model"], call["input_tokens"], call["output_tokens"])
+        for stats in agents.values():
+            stats["cost_usd"] = round(stats["cost_usd"], 6)
+        # Each worker agent owns exactly one task, so task-level LLM stats are the agent's.
+        for task in tasks:
+            task.update({k: v for k, v in agents.get(task["agent"], {}).items()})
+
+        tools: dict[str, dict] = {}
+        for call in tool_calls:
+            stats = tools.setdefault(call["tool"], {
+                "calls": 0, "seconds": 0.0, "max_seconds": 0.0, "api_calls": 0, "cache_hits": 0,
+                "errors": 0, "http_statuses": {}, "cost_usd": 0.0,
+            })
+            stats["calls"] += 1
+            stats["seconds"] = round(stats["seconds"] + call["seconds"], 3)
+            stats["max_seconds"] = max(stats["max_seconds"], call["seconds"])
+            stats["api_calls"] += call["api_calls"]
+            stats["cache_hits"] += call["cache_hits"]
+            stats["errors"] += 1 if call["error"] else 0
+            for status in call["http_statuses"]:
+                stats["http_statuses"][str(status)] = stats["http_statuses"].get(str(status), 0) + 1
+        for tool, stats in tools.items():
+            stats["cost_usd"] = round(stats["api_calls"] * TOOL_API_CALL_COST.get(tool, 0.0), 6)
+
+        llm_total = sum(a["cost_usd"] for a in agents.values())
+        tools_total = sum(t["cost_usd"] for t in tools.values())
+        return {
+            "linkedin_url": self.linkedin_url,
+            "name": self.name,
+            "started_at": self.started_at,
+            "status": self.status,
+            "error": self.error,
+            "wall_seconds": self.wall_seconds,
+            "totals": {
+                "llm_calls": len(llm_calls),
+                "replayed_llm_calls": sum(1 for c in llm_calls if c.get("replayed")),
+                # Tokens sent to the API; replayed calls are not counted.
+                "input_tokens": sum(c["input_tokens"] for c in llm_calls if not c.get("replayed")),
+                "output_tokens": sum(c["output_tokens"] for c in llm_calls if not c.get("replayed")),
+                "tool_calls": len(tool_calls),
+            },
+            "route": self.route,
+            "budget": self.budget.summary() if self.budget is not None and self.budget.active else None,
+            "cost_usd": {"llm": round(llm_total, 6), "tools": round(tools_total, 6), "total": round(llm_total + tools_total, 6)},
+            "tasks": tasks,
+            "agents": agents,
+            "tools": tools,
+            "tool_calls": tool_calls,
+        }
+
+    def write(self, path: str) -> str:
+        """Append the summary as one JSONL record to path."""
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(self.summary()) + "\n")
+        return path
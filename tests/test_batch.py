@@ -0,0 +1,26 @@
+import json
+
+from batch import _url_key, load_completed
+
+
+def test_url_variants_share_a_key():
+    key = _url_key("https://www.linkedin.com/in/ann-lee/")
+    assert _url_key("https://uk.linkedin.com/in/Ann-Lee/en/?trk=public_profile") == key
+    assert _url_key("linkedin.com/in/ann-lee") == key
+    assert _url_key("https://www.linkedin.com/in/ann-lee-42/") != key
+
+
+def test_completed_people_match_url_variants(tmp_path):
+    manifest = tmp_path / "manifest.jsonl"
+    records = [
+        {"url": "https://uk.linkedin.com/in/ann-lee/?trk=x", "status": "done"},
+        {"url": "https://www.linkedin.com/in/bo-chen/", "status": "done"},
+        {"url": "https://www.linkedin.com/in/bo-chen/en", "status": "failed"},
+        {"url": "https://www.linkedin.com/in/cy-diaz/", "status": "failed"},
+    ]
+    manifest.write_text("\n".join(json.dumps(r) for r in records) + "\n{partial", encoding="utf-8")
+    completed = load_completed(str(manifest))
+    assert _url_key("https://www.linkedin.com/in/ann-lee/") in completed
+    # Later records win: bo-chen's last run failed.
+    assert _url_key("https://www.linkedin.com/in/bo-chen/") not in completed
+    assert _url_key("https://www.linkedin.com/in/cy-diaz/") not in completed
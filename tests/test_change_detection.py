@@ -0,0 +1,96 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+import change_detection
+from change_detection import CONTEXT_ONLY, FULL, INCREMENTAL, REUSED, check_changes
+from report_store import save_fingerprint, save_report
+
+URL = "https://www.linkedin.com/in/ann-lee/"
+PROFILE = {
+    "full_name": "Ann Lee",
+    "headline": "CTO at Acme",
+    "experiences": [{"title": "CTO", "company": "Acme", "starts_at": {"year": 2020, "month": 1}}],
+    "follower_count": 100,
+}
+QUERY = "Ann Lee Acme CTO"
+
+
+@pytest.fixture
+def inputs(monkeypatch):
+    """Current research inputs, as the (cached) Proxycurl and Firecrawl lookups would return them."""
+    current = {"profile": json.loads(json.dumps(PROFILE)), "urls": {"https://acme.com/team"}, "interests": "i1"}
+    monkeypatch.setattr(change_detection, "fetch_profile", lambda url, refresh=False, telemetry=None: current["profile"])
+    monkeypatch.setattr(change_detection, "web_urls",
+                        lambda queries, telemetry=None: set(current["urls"]) if queries else set())
+    monkeypatch.setattr(change_detection, "interests_hash", lambda: current["interests"])
+    return current
+
+
+def _previous_run(report_dir, created_at=None):
+    check = check_changes(URL, report_dir=str(report_dir))
+    check.filtered_summary = "Ann Lee is CTO at Acme [E1]."
+    check.queries = [QUERY]
+    fingerprint = check.fingerprint()
+    if created_at:
+        fingerprint["created_at"] = created_at.isoformat(timespec="seconds")
+    report_path = save_report("# Ann Lee\n", URL, name="Ann Lee", report_dir=str(report_dir))
+    save_fingerprint(fingerprint, report_path)
+    return check
+
+
+def test_first_run_is_full(tmp_path, inputs):
+    check = check_changes(URL, report_dir=str(tmp_path))
+    assert check.status == FULL
+    assert check.companies == ["Acme"]
+    assert "follower_count" not in check.profile_sections
+
+
+def test_unchanged_inputs_reuse_the_report(tmp_path, inputs):
+    _previous_run(tmp_path)
+    inputs["profile"]["follower_count"] = 250  # volatile
+    check = check_changes("https://uk.linkedin.com/in/Ann-Lee?trk=x", report_dir=str(tmp_path))
+    assert check.status == REUSED
+    assert check.changes == []
+    assert check.prior_summary is None
+
+
+def test_interests_change_reuses_the_filtered_summary(tmp_path, inputs):
+    _previous_run(tmp_path)
+    inputs["interests"] = "i2"
+    check = check_changes(URL, report_dir=str(tmp_path))
+    assert check.status == CONTEXT_ONLY
+    assert check.prior_summary == "Ann Lee is CTO at Acme [E1]."
+    assert check.fingerprint()["filtered_summary"] == "Ann Lee is CTO at Acme [E1]."
+
+
+def test_profile_change_is_incremental_and_names_the_fields(tmp_path, inputs):
+    _previous_run(tmp_path)
+    inputs["profile"]["headline"] = "CEO at Acme"
+    check = check_changes(URL, report_dir=str(tmp_path))
+    assert check.status == INCREMENTAL
+    assert check.changes == ["LinkedIn profile changed (fields: headline)"]
+    assert check.prior_summary == "Ann Lee is CTO at Acme [E1]."
+
+
+def test_new_web_results_are_incremental(tmp_path, inputs):
+    _previous_run(tmp_path)
+    inputs["urls"].add("https://news.example.com/acme-raises")
+    check = check_changes(URL, report_dir=str(tmp_path))
+    assert check.status == INCREMENTAL
+    assert check.changes == ["New web results: https://news.example.com/acme-raises"]
+
+
+def test_stale_reports_are_not_reused(tmp_path, inputs):
+    _previous_run(tmp_path, created_at=datetime.now() - timedelta(days=change_detection.MAX_AGE_DAYS + 1))
+    check = check_changes(URL, report_dir=str(tmp_path))
+    assert check.status == FULL
+    assert check.previous is None
+
+
+def test_refresh_is_always_full(tmp_path, inputs):
+    _previous_run(tmp_path)
+    check = check_changes(URL, refresh=True, report_dir=str(tmp_path))
+    assert check.status == FULL
+    assert check.previous is None
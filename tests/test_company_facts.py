@@ -0,0 +1,57 @@
+import pytest
+
+import company_facts
+from tools.cache import TTLCache
+
+SUMMARY = """## Career vibe
+Builds payment systems (E1).
+
+## Company context
+- Acme raised a Series B in 2024 (W1)
+- Acme launched a payments API (W2)
+- An unsourced remark about Acme
+
+## Key achievements
+- Led the platform team (E1)
+
+Sources:
+W1: https://news.example.com/acme-series-b [pre-check: match]
+W2: https://acme.example.com/blog/api [pre-check: match]
+"""
+
+
+@pytest.fixture(autouse=True)
+def facts_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(company_facts, "_cache", TTLCache("company_facts", ttl=3600, path=tmp_path / "cache.sqlite3"))
+
+
+def test_role_only_current_work_uses_the_profile_company():
+    assert company_facts.current_company("CTO", ["Globex", "Initech"]) == "Globex"
+    assert company_facts.current_company("CTO") is None
+
+
+def test_comma_suffix_current_work_uses_the_profile_company():
+    assert company_facts.current_company("Acme, Inc.", ["Globex"]) == "Globex"
+    assert company_facts.current_company("Acme, Inc.") is None
+
+
+def test_explicit_company_in_current_work_wins():
+    assert company_facts.current_company("CTO at Acme Inc", ["Globex"]) == "Acme Inc"
+
+
+def test_extract_facts_keeps_sourced_company_lines_with_urls():
+    facts = company_facts.extract_facts(SUMMARY)
+    assert len(facts) == 2
+    assert "https://news.example.com/acme-series-b" in facts[0]
+    assert all("Led the platform team" not in fact for fact in facts)
+
+
+def test_facts_are_stored_only_after_an_approved_critique():
+    assert company_facts.store_approved_facts("Acme", SUMMARY, "REJECTED\n- Claim X lacks a source") == []
+    assert company_facts.store_approved_facts("Acme", SUMMARY, "") == []
+    assert company_facts.store_approved_facts("Acme", SUMMARY, None) == []
+    assert company_facts.cached_facts("Acme") is None
+
+    stored = company_facts.store_approved_facts("Acme", SUMMARY, "APPROVED: grounded and specific.")
+    assert len(stored) == 2
+    assert company_facts.cached_facts("Acme, Inc.") == stored
@@ -0,0 +1,29 @@
+from context_budget import TRUNCATION_NOTE, compact
+from tools.tokens import count_tokens
+
+
+def test_single_paragraph_is_cut_not_dropped():
+    paragraph = " ".join(
+        "Sentence {} of the career vibe describes a role, a transition and what drove it.".format(i)
+        for i in range(150)
+    )
+    compacted = compact(paragraph, 200)
+    assert count_tokens(compacted) <= 200
+    assert compacted.startswith("Sentence 0 of the career vibe")
+    assert compacted.endswith(TRUNCATION_NOTE)
+    # Most of the budget is still used for the paragraph itself.
+    assert count_tokens(compacted) > 150
+
+
+def test_lowest_priority_lines_go_first():
+    lines = ["## Key achievements", "- Led the platform team (E1)"]
+    lines += ["- Unsourced remark number {} about their general style of working.".format(i) for i in range(100)]
+    compacted = compact("\n".join(lines), 60)
+    assert count_tokens(compacted) <= 60
+    assert "## Key achievements" in compacted
+    assert "- Led the platform team (E1)" in compacted
+
+
+def test_text_within_budget_is_unchanged():
+    text = "REJECTED\n- Claim X lacks a source"
+    assert compact(text, 100) == text
@@ -0,0 +1,26 @@
+from tools.evidence import Profile
+
+
+def _profile(experiences):
+    return Profile.from_proxycurl({"full_name": "Ann Lee", "experiences": experiences}, "https://www.linkedin.com/in/ann-lee/")
+
+
+def test_malformed_year_drops_the_duration_not_the_profile():
+    profile = _profile([
+        {"title": "CTO", "company": "Acme", "starts_at": {"year": "c. 2020"}, "ends_at": None},
+        {"title": "Engineer", "company": "Globex", "starts_at": {"year": 2015, "month": 1},
+         "ends_at": {"year": "unknown"}},
+    ])
+    assert [exp.months for exp in profile.experiences] == [0, 0]
+    text = profile.render(budget=500)
+    assert "[E1] CTO at Acme (c. 2020 to present)" in text
+    assert "[E2] Engineer at Globex" in text
+
+
+def test_months_between_dates():
+    profile = _profile([
+        {"title": "Engineer", "company": "Globex", "starts_at": {"year": 2015, "month": 1},
+         "ends_at": {"year": 2019, "month": 1}},
+    ])
+    assert profile.experiences[0].start == "2015-01"
+    assert profile.experiences[0].months == 48
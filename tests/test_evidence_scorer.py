@@ -0,0 +1,49 @@
+from tools.evidence_scorer import DROP, MATCH, UNVERIFIED, TargetIdentity, company_from_current_work
+
+
+def test_company_needs_an_explicit_separator():
+    assert company_from_current_work("CTO at Acme Inc") == "Acme Inc"
+    assert company_from_current_work("Engineer @ Globex") == "Globex"
+    assert company_from_current_work("CTO") == ""
+    assert company_from_current_work("Head of Product") == ""
+    assert company_from_current_work("Acme, Inc.") == ""
+    assert company_from_current_work("VP Eng, Payments") == ""
+
+
+def test_role_only_current_work_adds_no_company():
+    identity = TargetIdentity(name="Ann Lee", current_work="Head of Product")
+    assert identity.companies == set()
+    score, label, reasons = identity.score({
+        "title": "Ann Lee, Head of Product",
+        "description": "Ann Lee talks about being Head of Product.",
+        "url": "https://example.com/talk",
+    })
+    assert not any(reason.startswith("company") for reason in reasons)
+    assert label == UNVERIFIED
+
+
+def test_comma_suffix_current_work_adds_no_company():
+    assert TargetIdentity(name="Ann Lee", current_work="Acme, Inc.").companies == set()
+
+
+def test_name_and_company_match():
+    identity = TargetIdentity(name="Ann Lee", current_work="CTO at Acme Inc")
+    score, label, reasons = identity.score({
+        "title": "Ann Lee on scaling Acme",
+        "description": "Acme's CTO Ann Lee explains the platform.",
+        "url": "https://example.com/interview",
+    })
+    assert label == MATCH
+    assert "company acme" in reasons
+
+
+def test_result_without_the_name_is_dropped():
+    identity = TargetIdentity(name="Ann Lee", current_work="CTO at Acme Inc")
+    _, label, _ = identity.score({"title": "Quarterly results", "description": "Nothing relevant.", "url": "https://example.com/x"})
+    assert label == DROP
+
+
+def test_other_linkedin_profile_is_dropped():
+    identity = TargetIdentity(linkedin_url="https://www.linkedin.com/in/ann-lee/", name="Ann Lee")
+    assert identity.score({"title": "Ann Lee", "url": "https://www.linkedin.com/in/ann-lee-42/"})[1] == DROP
+    assert identity.score({"title": "Ann Lee", "url": "https://linkedin.com/in/ann-lee"})[1] == MATCH
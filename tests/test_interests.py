@@ -0,0 +1,58 @@
+from tools.interests import InterestBuffer, InterestIndex, append_interests, normalize_interest, read_interests
+
+
+def test_normalization_ignores_marker_case_punctuation_and_ampersand():
+    assert normalize_interest("- Research & Development!") == "research and development"
+    assert normalize_interest("2) research and development") == "research and development"
+
+
+def test_exact_and_normalized_matches():
+    index = InterestIndex("## Interests\n- Domain-driven design\n\n## Skills\n* M&A\n")
+    assert index.match("domain driven design") == "Domain-driven design"
+    assert index.match("M and A") == "M&A"
+    assert index.match("   ") is None
+
+
+def test_fuzzy_matches_only_at_or_above_the_cutoff():
+    index = InterestIndex("- Product-led growth\n")
+    # One extra letter: ratio ~0.98.
+    assert index.match("Product-led growths") == "Product-led growth"
+    assert index.match("Product marketing") is None
+
+
+def test_near_matches_with_different_numbers_are_different_interests():
+    index = InterestIndex("- Python 2 migration\n")
+    assert index.match("Python 3 migration") is None
+    assert index.match("python 2 migrations") == "Python 2 migration"
+
+
+def test_append_skips_duplicates_and_inserts_under_interests(tmp_path):
+    path = tmp_path / "my_interests.md"
+    path.write_text("# Me\n\n## Interests\n- Climate tech\n\n## Goals\n- Ship v2\n", encoding="utf-8")
+    added = append_interests(path, ["climate-tech", "Robotics", "robotics!", ""])
+    assert added == ["Robotics"]
+    assert path.read_text(encoding="utf-8") == (
+        "# Me\n\n## Interests\n- Climate tech\n- Robotics\n\n## Goals\n- Ship v2\n"
+    )
+    assert read_interests(path)[1].match("ROBOTICS") == "Robotics"
+
+
+def test_append_creates_the_section(tmp_path):
+    path = tmp_path / "my_interests.md"
+    path.write_text("# Me", encoding="utf-8")
+    assert append_interests(path, ["Robotics"]) == ["Robotics"]
+    assert path.read_text(encoding="utf-8") == "# Me\n\n## Interests\n- Robotics\n"
+
+
+def test_buffer_rejects_queued_duplicates_and_writes_once(tmp_path):
+    path = tmp_path / "my_interests.md"
+    path.write_text("## Interests\n- Climate tech\n", encoding="utf-8")
+    buffer = InterestBuffer(path)
+    assert buffer.add("Robotics") is None
+    assert buffer.add("robotics") == "Robotics"
+    assert buffer.add("Climate tech") is None  # only checked against the file on flush
+    assert len(buffer) == 2
+    assert not path.with_name("my_interests.md.lock").exists()
+    assert buffer.flush() == ["Robotics"]
+    assert len(buffer) == 0
+    assert path.read_text(encoding="utf-8") == "## Interests\n- Climate tech\n- Robotics\n"
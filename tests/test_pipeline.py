@@ -0,0 +1,80 @@
+from types import SimpleNamespace
+
+import pytest
+
+from context_budget import compact
+from pipeline import critique_rejected, critique_verdict, run_pipeline
+
+
+@pytest.mark.parametrize("text, verdict", [
+    ("APPROVED\nThe summary is well sourced.", "approved"),
+    ("**Rejected** - claim 2 has no source", "rejected"),
+    ("Verdict: approved", "approved"),
+    ("  verdict - REJECTED", "rejected"),
+    ("The research is APPROVED", None),
+    ("Approvedness", None),
+    ("", None),
+    (None, None),
+])
+def test_verdict_is_read_from_the_opening(text, verdict):
+    assert critique_verdict(text) == verdict
+    assert critique_rejected(text) is (verdict != "approved")
+
+
+def test_compaction_keeps_a_long_rejection_verdict():
+    critique = "REJECTED\n" + "\n".join(
+        "- Claim {} about their payments work lacks a source and should be checked.".format(i) for i in range(60)
+    )
+    compacted = compact(critique, 80)
+    assert compacted.startswith("REJECTED\n- Claim 0")
+    assert critique_verdict(compacted) == "rejected"
+
+
+def test_removed_item_sections_are_still_dropped_first():
+    text = "Summary (W1)\nRejected items:\n- Old job at Foo, wrong person\n\n## Career\n- Led payments (W2)\n"
+    text += "\n".join("- Remark {} about their general style.".format(i) for i in range(60))
+    compacted = compact(text, 60)
+    assert "wrong person" not in compacted
+    assert "- Led payments (W2)" in compacted
+
+
+class FakeTask:
+    def __init__(self, name, answers, context=()):
+        self.name = name
+        self.answers = list(answers)
+        self.context = list(context)
+        self.agent = name
+        self.contexts = []
+
+    def execute_sync(self, agent=None, context=""):
+        self.contexts.append(context)
+        answer = self.answers.pop(0) if len(self.answers) > 1 else self.answers[0]
+        return SimpleNamespace(raw=answer)
+
+
+def _tasks(critiques):
+    research = FakeTask("research", ["Summary 1", "Summary 2", "Summary 3"])
+    filtering = FakeTask("filter", ["Filtered"], [research])
+    critique = FakeTask("critique", critiques, [filtering])
+    output = FakeTask("output", ["# Report"], [filtering, critique])
+    return [research, filtering, critique, output]
+
+
+def test_rejection_or_missing_verdict_retries_research_with_feedback():
+    tasks = _tasks(["Looks fine overall.", "APPROVED"])
+    assert run_pipeline(tasks, max_retries=2).raw == "# Report"
+    research, critique = tasks[0], tasks[2]
+    assert len(research.contexts) == 2
+    assert "Your previous research summary:\nSummary 1" in research.contexts[1]
+    assert "Feedback from the Review & Critique Agent:\nLooks fine overall." in research.contexts[1]
+    assert len(critique.contexts) == 2
+
+
+def test_retries_stop_at_the_limit_or_when_the_budget_is_reached():
+    tasks = _tasks(["REJECTED"])
+    run_pipeline(tasks, max_retries=1)
+    assert len(tasks[0].contexts) == 2
+    tasks = _tasks(["REJECTED"])
+    run_pipeline(tasks, max_retries=3, budget_reached=lambda: "tokens 10/5")
+    assert len(tasks[0].contexts) == 1
+    assert len(tasks[3].contexts) == 1
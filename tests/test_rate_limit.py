@@ -0,0 +1,114 @@
+import types
+
+import pytest
+
+from tools import rate_limit
+from tools.rate_limit import QuotaExceeded, RateLimitError, RateLimiter, _limit, limit_llm
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake time for the limiter: sleep() advances time() and monotonic() instantly."""
+    state = {"now": 1_000_000.0, "slept": []}
+
+    def sleep(seconds):
+        state["slept"].append(seconds)
+        state["now"] += seconds
+
+    fake = types.SimpleNamespace(time=lambda: state["now"], monotonic=lambda: state["now"], sleep=sleep)
+    monkeypatch.setattr(rate_limit, "time", fake)
+    return state
+
+
+def test_request_bucket_refills_continuously(tmp_path, clock):
+    limiter = RateLimiter("firecrawl", rpm=60, path=tmp_path / "cache.sqlite3")
+    for _ in range(60):
+        assert limiter.acquire() == 0
+    # Empty: the next request waits one second (60 per minute) for the bucket to refill.
+    assert limiter.acquire() == pytest.approx(1.0)
+    clock["now"] += 30
+    for _ in range(30):
+        assert limiter.acquire() == 0
+    assert limiter.acquire(max_wait=5) == pytest.approx(1.0)
+
+
+def test_calls_that_would_wait_too_long_fail(tmp_path, clock):
+    limiter = RateLimiter("firecrawl", rpm=1, path=tmp_path / "cache.sqlite3")
+    limiter.acquire()
+    with pytest.raises(RateLimitError, match="would wait 60s"):
+        limiter.acquire(max_wait=10)
+    assert clock["slept"] == []
+
+
+def test_token_overdraft_makes_later_calls_wait(tmp_path, clock):
+    limiter = RateLimiter("openai", tpm=600, path=tmp_path / "cache.sqlite3", scope="gpt-4o-mini")
+    limiter.acquire(tokens=100)
+    limiter.record(tokens=800)  # output tokens: the bucket is now 300 below zero
+    # 300 tokens of overdraft plus 100 requested, at 10 tokens per second.
+    assert limiter.acquire(tokens=100, max_wait=60) == pytest.approx(40.0)
+    assert max(clock["slept"]) <= rate_limit.MAX_SLEEP
+
+
+def test_daily_budget_fails_fast(tmp_path, clock):
+    limiter = RateLimiter("proxycurl", daily=2, path=tmp_path / "cache.sqlite3")
+    limiter.acquire()
+    limiter.record(spent=1)
+    limiter.acquire()
+    limiter.record(spent=1)
+    assert limiter.used_today() == 2
+    with pytest.raises(QuotaExceeded, match="Daily proxycurl budget of 2"):
+        limiter.acquire()
+
+
+def test_models_and_processes_share_buckets_by_key(tmp_path, clock):
+    path = tmp_path / "cache.sqlite3"
+    mini = RateLimiter("openai", rpm=1, path=path, scope="gpt-4o-mini")
+    mini.acquire()
+    # Another limiter for the same model (e.g. another process) sees the empty bucket...
+    with pytest.raises(RateLimitError):
+        RateLimiter("openai", rpm=1, path=path, scope="gpt-4o-mini").acquire(max_wait=0)
+    # ...while another model has its own.
+    assert RateLimiter("openai", rpm=1, path=path, scope="gpt-4o").acquire(max_wait=0) == 0
+
+
+def test_throttle_empties_the_request_bucket(tmp_path, clock):
+    limiter = RateLimiter("firecrawl", rpm=60, path=tmp_path / "cache.sqlite3")
+    limiter.throttle()
+    assert limiter.acquire() == pytest.approx(1.0)
+
+
+def test_model_limits_override_the_provider_value(monkeypatch):
+    monkeypatch.setenv("RATE_LIMIT_OPENAI_TPM", "1000")
+    monkeypatch.setenv("RATE_LIMIT_OPENAI_GPT_4O_MINI_TPM", "5000")
+    monkeypatch.setenv("RATE_LIMIT_OPENAI_GPT_4O_RPM", "oops")
+    assert _limit("openai", "TPM", 30000, "gpt-4o-mini") == 5000
+    assert _limit("openai", "TPM", 30000, "gpt-4o") == 1000
+    assert _limit("openai", "RPM", 500, "gpt-4o") == 500
+
+
+def test_limit_llm_limits_the_current_model(monkeypatch):
+    calls = []
+
+    class FakeLimiter:
+        def __init__(self, model):
+            self.model = model
+
+        def acquire(self, tokens=0):
+            calls.append(("acquire", self.model))
+
+        def record(self, tokens=0, spent=0):
+            calls.append(("record", self.model))
+
+    class FakeLLM:
+        model = "gpt-4o-mini"
+
+        def call(self, messages, *args, **kwargs):
+            return "ok"
+
+    monkeypatch.setattr(rate_limit, "get_limiter", lambda provider, model: FakeLimiter(model))
+    llm = limit_llm(FakeLLM())
+    assert limit_llm(llm) is llm
+    llm.call([{"role": "user", "content": "hi"}])
+    llm.model = "gpt-4o"
+    llm.call([{"role": "user", "content": "hi"}])
+    assert calls == [("acquire", "gpt-4o-mini"), ("record", "gpt-4o-mini"), ("acquire", "gpt-4o"), ("record", "gpt-4o")]
@@ -0,0 +1,60 @@
+import os
+
+import report_store
+from report_store import latest_report, new_report_path, rebuild_index, save_report, search_reports
+
+URL = "https://www.linkedin.com/in/ann-lee/"
+
+
+def test_reserved_names_get_a_suffix_in_the_same_second(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_store, "_timestamp", lambda: "2026-01-02_03-04-05")
+    first = new_report_path(URL, "Ann Lee", report_dir=str(tmp_path))
+    second = new_report_path(URL, "Ann Lee", report_dir=str(tmp_path))
+    assert os.path.basename(first) == "ann_lee_2026-01-02_03-04-05.md"
+    assert os.path.basename(second) == "ann_lee_2026-01-02_03-04-05_2.md"
+    assert os.path.exists(first) and os.path.exists(second)
+    # A report streamed into a reserved path is saved there.
+    assert save_report("# Ann Lee\n", URL, name="Ann Lee", report_dir=str(tmp_path), report_path=second) == second
+
+
+def test_empty_output_is_not_saved(tmp_path):
+    assert save_report("  \n", URL, report_dir=str(tmp_path)) is None
+    assert not [p for p in os.listdir(tmp_path) if p.endswith(".md")]
+
+
+def test_search_matches_names_companies_and_text(tmp_path):
+    ann = save_report("Ann leads payments infrastructure.", URL, name="Ann Lee",
+                      report_dir=str(tmp_path), companies=["Stripe"])
+    bo = save_report("Bo works on checkout.", "https://www.linkedin.com/in/bo-chen/", name="Bo Chen",
+                     report_dir=str(tmp_path), current_work="Engineer at Shopify")
+    assert [r["report_path"] for r in search_reports("stripe payments", report_dir=str(tmp_path))] == [ann]
+    [result] = search_reports("shopify", report_dir=str(tmp_path))
+    assert result["report_path"] == bo
+    assert result["companies"] == "Shopify"
+    # FTS5 syntax in user input is treated as plain words.
+    assert search_reports('bo-chen" OR', report_dir=str(tmp_path)) == []
+    assert search_reports("   ", report_dir=str(tmp_path)) == []
+
+
+def test_current_work_without_a_company_leaves_companies_empty(tmp_path):
+    save_report("Ann is a CTO.", URL, name="Ann Lee", report_dir=str(tmp_path), current_work="CTO")
+    assert latest_report(URL, report_dir=str(tmp_path))["companies"] is None
+
+
+def test_latest_report_matches_url_variants(tmp_path):
+    older = save_report("Old.", URL, name="Ann Lee", report_dir=str(tmp_path))
+    report_store.index_report(older, created_at="2026-01-01T00:00:00")
+    newer = save_report("New.", URL, name="Ann Lee", report_dir=str(tmp_path), mode="incremental")
+    record = latest_report("https://uk.linkedin.com/in/Ann-Lee/?trk=x", report_dir=str(tmp_path))
+    assert record["report_path"] == newer
+    assert record["mode"] == "incremental"
+    assert latest_report("https://www.linkedin.com/in/bo-chen/", report_dir=str(tmp_path)) is None
+
+
+def test_rebuild_dates_reports_by_file_name(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_store, "_timestamp", lambda: "2026-01-02_03-04-05")
+    path = save_report("Ann leads payments.", URL, name="Ann Lee", report_dir=str(tmp_path))
+    assert rebuild_index(str(tmp_path)) == 1
+    [result] = search_reports("payments", report_dir=str(tmp_path))
+    assert result["report_path"] == path
+    assert result["created_at"] == "2026-01-02T03:04:05"
@@ -0,0 +1,53 @@
+from types import SimpleNamespace
+
+from routing import RunRouter
+
+BASE = {"web_researcher": "gpt-4o-mini", "question_architect": "gpt-4o"}
+POLICY = {
+    "models": dict(BASE),
+    "rules": [{
+        "name": "escalate-on-rejection",
+        "when": {"critique_retry": {"eq": True}},
+        "models": {"web_researcher": "gpt-4o"},
+    }],
+}
+
+
+def _agents():
+    return {key: SimpleNamespace(llm=SimpleNamespace(model=model)) for key, model in BASE.items()}
+
+
+def _router(agents, made):
+    def make_llm(agent_key, model):
+        llm = SimpleNamespace(model=model)
+        made.append((agent_key, llm))
+        return llm
+
+    return RunRouter(POLICY, agents, make_llm=make_llm)
+
+
+def test_rejected_critique_escalates_with_a_run_llm_and_close_restores():
+    agents, made = _agents(), []
+    base_llm = agents["web_researcher"].llm
+    router = _router(agents, made)
+    assert agents["web_researcher"].llm is base_llm
+
+    router.task_done("critique", SimpleNamespace(raw="REJECTED\n- Claim X lacks a source"))
+    assert router.signals["critique_retry"] is True
+    assert agents["web_researcher"].llm.model == "gpt-4o"
+    assert agents["web_researcher"].llm is not base_llm
+    # The agent set's own LLM is never changed, so other runs using it are unaffected.
+    assert base_llm.model == "gpt-4o-mini"
+
+    router.close()
+    assert agents["web_researcher"].llm is base_llm
+
+
+def test_approved_critique_and_extra_researcher_work_do_not_escalate():
+    agents, made = _agents(), []
+    router = _router(agents, made)
+    router.task_done("research", SimpleNamespace(raw="summary"))
+    router.task_done("critique", SimpleNamespace(raw="APPROVED: grounded."))
+    assert "critique_retry" not in router.signals
+    assert made == []
+    assert agents["web_researcher"].llm.model == "gpt-4o-mini"
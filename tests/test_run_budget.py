@@ -0,0 +1,103 @@
+from types import SimpleNamespace
+
+import pytest
+
+from pipeline import run_output, run_pipeline
+from run_budget import BudgetExceeded, RunBudget, run_or_finish_early
+from telemetry import RunTelemetry
+
+
+class FakeLLM:
+    model = "gpt-4o-mini"
+
+    def __init__(self, reply):
+        self.reply = reply
+
+    def call(self, messages, *args, **kwargs):
+        return self.reply(messages) if callable(self.reply) else self.reply
+
+
+class FakeTask:
+    """Stands in for a crewai Task: an agent turn of tool uses, then one LLM call for the answer."""
+
+    def __init__(self, name, llm, tool_uses=0, context=(), outputs=None, telemetry=None):
+        self.name = name
+        self.llm = llm
+        self.tool_uses = tool_uses
+        self.context = list(context)
+        self.agent = name
+        self.outputs = outputs
+        self.telemetry = telemetry
+        self.observations = []
+
+    def execute_sync(self, agent=None, context=""):
+        observations = self.observations
+        for _ in range(self.tool_uses):
+            # CrewAI catches exceptions raised inside tools and hands them to the agent as text.
+            try:
+                with self.telemetry.tool_call("Firecrawl Web Search") as record:
+                    record["api_calls"] = 1
+                observations.append("result")
+            except Exception as e:
+                observations.append("Tool error: {}".format(e))
+        output = SimpleNamespace(raw=self.llm.call(context + "\n" + "\n".join(observations)))
+        self.outputs[self.name] = output
+        return output
+
+
+def _crew(telemetry, outputs):
+    llms = {
+        "web_researcher": FakeLLM("Career vibe: builds payment systems (W1)."),
+        "evidence_filter_agent": FakeLLM("Filtered summary"),
+        "review_critique_agent": FakeLLM("APPROVED"),
+        "question_architect": FakeLLM(lambda messages: "# Report\n" + messages),
+    }
+    for agent_key, llm in llms.items():
+        telemetry.instrument_llm(llm, agent_key)
+    research = FakeTask("research", llms["web_researcher"], 1, outputs=outputs, telemetry=telemetry)
+    filtering = FakeTask("filter", llms["evidence_filter_agent"], 1, [research], outputs, telemetry)
+    critique = FakeTask("critique", llms["review_critique_agent"], 0, [filtering], outputs, telemetry)
+    output = FakeTask("output", llms["question_architect"], 0, [filtering, critique], outputs, telemetry)
+    return [research, filtering, critique, output]
+
+
+def test_tool_side_overrun_ends_the_run_with_a_partial_report():
+    telemetry = RunTelemetry("https://www.linkedin.com/in/ann-lee/")
+    # Research's answer uses up the token budget; the filter then hits it in its first tool call.
+    budget = RunBudget(max_tokens=5)
+    telemetry.set_budget(budget)
+    outputs = {}
+    tasks = _crew(telemetry, outputs)
+
+    result = run_or_finish_early(
+        budget,
+        lambda: run_pipeline(tasks, budget_reached=lambda: budget.exceeded(telemetry)),
+        lambda: run_output(tasks, outputs),
+    )
+
+    # The filter's tool call hit the limit, was swallowed as tool error text, and its next LLM call ended the run.
+    assert budget.reason.startswith("tokens ")
+    assert tasks[1].observations[0].startswith("Tool error: Run budget reached")
+    assert "filter" not in outputs and "critique" not in outputs
+    assert result.raw.startswith("# Report")
+    assert "UNFILTERED research summary" in result.raw
+    assert "builds payment systems (W1)" in result.raw
+    assert telemetry.usage()["tool_calls"] == 1
+
+
+def test_exempt_agent_and_report_step_are_not_stopped():
+    telemetry = RunTelemetry("https://www.linkedin.com/in/ann-lee/")
+    budget = RunBudget(max_tool_calls=1)
+    budget.reason = "tool_calls 1/1"
+    budget.check(telemetry, "question_architect")
+    with pytest.raises(BudgetExceeded):
+        budget.check(telemetry, "web_researcher")
+    budget.finishing = True
+    budget.check(telemetry, "web_researcher")
+
+
+def test_inactive_budget_never_stops():
+    telemetry = RunTelemetry("https://www.linkedin.com/in/ann-lee/")
+    budget = RunBudget()
+    assert not budget.active
+    assert budget.exceeded(telemetry) is None
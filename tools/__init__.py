@@ -1,5 +1,20 @@
-from .linkedin_tool import LinkedInTool
-from .append_interests_tool import AppendInterestsTool
-from .firecrawl_search_tool import FirecrawlSearchTool
+"""
+Custom CrewAI tools. Tool classes are imported lazily so the helper modules in this package
+(cache, tokens, evidence_scorer, http_client, interests, rate_limit, urls) can be used without loading crewai.
+"""
+from importlib import import_module
 
-__all__ = ["LinkedInTool", "AppendInterestsTool", "FirecrawlSearchTool"]
+_EXPORTS = {
+    "LinkedInTool": ".linkedin_tool",
+    "AppendInterestsTool": ".append_interests_tool",
+    "FirecrawlSearchTool": ".firecrawl_search_tool",
+    "FirecrawlMultiSearchTool": ".firecrawl_search_tool",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,14 +1,15 @@
 """
 Tool to append a new Interest entry to my_interests.md (source of truth for user context).
+
+Locking, atomic writes and duplicate matching live in tools/interests.py.
 """
 from pathlib import Path
-from typing import Type
+from typing import Any, Type
 
 from pydantic import BaseModel, Field
 
-from crewai.tools import BaseTool
-
-DEFAULT_INTERESTS_PATH = Path(__file__).resolve().parent.parent / "my_interests.md"
+from .base import InstrumentedTool
+from .interests import DEFAULT_INTERESTS_PATH, append_interests, read_interests
 
 
 class AppendInterestsToolInput(BaseModel):
@@ -20,7 +21,7 @@ class AppendInterestsToolInput(BaseModel):
     )
 
 
-class AppendInterestsTool(BaseTool):
+class AppendInterestsTool(InstrumentedTool):
     """Appends a new bullet under '## Interests' in my_interests.md. Use when the research subject has expertise the user does not yet have and should add to their interests."""
 
     name: str = "Append to My Interests"
@@ -31,36 +32,32 @@ class AppendInterestsTool(BaseTool):
     )
     args_schema: Type[BaseModel] = AppendInterestsToolInput
     file_path: Path = DEFAULT_INTERESTS_PATH
+    # Optional InterestBuffer: appends are queued and written by its flush() (batch mode).
+    buffer: Any = None
 
     def _run(self, interest_line: str) -> str:
-        path = self.file_path
-        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._track() as call:
+            result = self._append(interest_line)
+            if result.startswith("Failed"):
+                call["error"] = result
+            return result
+
+    def _append(self, interest_line: str) -> str:
         content = interest_line.strip()
         if not content:
             return "No content to append."
-        new_line = f"- {content}\n"
         try:
-            existing = path.read_text(encoding="utf-8")
-            # Ensure there is an "## Interests" section
-            if "## Interests" not in existing:
-                existing += "\n## Interests\n"
-            # Insert after the first "## Interests" block (after first newline)
-            marker = "## Interests"
-            idx = existing.find(marker)
-            if idx == -1:
-                existing += "\n## Interests\n" + new_line
-            else:
-                # Find end of line after "## Interests"
-                line_end = existing.find("\n", idx) + 1
-                insert_pos = line_end
-                # Optionally find last bullet under Interests (before next ##)
-                next_section = existing.find("\n## ", line_end)
-                if next_section == -1:
-                    insert_pos = len(existing)
-                else:
-                    insert_pos = next_section
-                existing = existing[:insert_pos] + new_line + existing[insert_pos:]
-            path.write_text(existing, encoding="utf-8")
+            # Fast check against the cached index; append_interests re-checks under the lock.
+            duplicate = read_interests(self.file_path)[1].match(content)
+            if duplicate is not None:
+                return f"Already in my_interests.md: {duplicate}"
+            if self.buffer is not None:
+                duplicate = self.buffer.add(content)
+                if duplicate is not None:
+                    return f"Already queued for my_interests.md: {duplicate}"
+                return f"Queued interest (written to my_interests.md at the end of the batch): {content}"
+            if not append_interests(self.file_path, [content]):
+                return f"Already in my_interests.md: {content}"
             return f"Appended interest: {content}"
         except Exception as e:
             return f"Failed to append to my_interests.md: {e}"
@@ -0,0 +1,25 @@
+"""
+Base class for tools that report their calls to the run's telemetry.
+"""
+from contextlib import nullcontext
+from typing import Any
+
+from crewai.tools import BaseTool
+
+
+def new_call_record() -> dict:
+    """Per-call counters a tool fills in; RunTelemetry.tool_call yields the same shape."""
+    return {"api_calls": 0, "cache_hits": 0, "http_statuses": [], "error": None}
+
+
+class InstrumentedTool(BaseTool):
+    """BaseTool whose calls are timed and recorded when a RunTelemetry is attached."""
+
+    # Optional telemetry.RunTelemetry for the current run.
+    telemetry: Any = None
+
+    def _track(self):
+        """Context manager yielding the call record to fill in (a throwaway one without telemetry)."""
+        if self.telemetry is None:
+            return nullcontext(new_call_record())
+        return self.telemetry.tool_call(self.name)
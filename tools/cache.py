@@ -0,0 +1,69 @@
+"""
+Small persistent key/value cache (SQLite) with per-entry TTL, shared by tools across runs and processes.
+"""
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+DEFAULT_CACHE_PATH = Path(
+    os.getenv("CACHE_DB_PATH") or Path(__file__).resolve().parent.parent / ".cache" / "cache.sqlite3"
+)
+
+
+class TTLCache:
+    """
+    JSON values stored in SQLite under (namespace, key). Entries older than ttl seconds are treated
+    as missing; ttl=None means entries never expire. A short-lived connection is opened per call so
+    one instance is safe to share between threads, and WAL mode lets several processes use the file.
+    """
+
+    def __init__(self, namespace: str, ttl: Optional[float] = None, path: Optional[Path] = None):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.path = Path(path or DEFAULT_CACHE_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                " namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, created_at REAL NOT NULL,"
+                " PRIMARY KEY (namespace, key))"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(str(self.path), timeout=30)
+        try:
+            with conn:  # commits on success, rolls back on error
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Any:
+        """Return the cached value, or None when missing or older than the TTL."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, created_at FROM cache WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+        if row is None:
+            return None
+        value, created_at = row
+        if self.ttl is not None and time.time() - created_at > self.ttl:
+            return None
+        return json.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, created_at) VALUES (?, ?, ?, ?)",
+                (self.namespace, key, json.dumps(value), time.time()),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (self.namespace, key))
@@ -0,0 +1,415 @@
+"""
+Typed evidence records and the per-run evidence store.
+
+The LinkedIn and Firecrawl tools parse API responses into compact records (Profile, Experience,
+Education, SearchResult) and add them to the run's EvidenceStore, which gives each one a stable ID:
+P1 for the profile, E1.. for experience (most recent first), S1.. for education and W1.. for web
+results (one per normalized URL). Records are rendered to terse text only when handed to the LLM
+(the profile within a token budget, see Profile.render);
+agents cite evidence by ID, and task outputs get a "Sources:" block listing each cited ID once with
+its URL and pre-check label, so URLs are not repeated in every prompt that carries evidence.
+"""
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass, field
+from datetime import date
+
+from .tokens import DEFAULT_MODEL, count_tokens
+from .urls import normalize_query, normalize_result_url
+
+# Evidence IDs as cited in text, e.g. "(W3)" or "[E1, S2]".
+EVIDENCE_ID = re.compile(r"\b([PESW]\d+)\b")
+SOURCES_HEADING = "Sources:"
+_SOURCES_BLOCK = re.compile(r"\n*^Sources:\s*\n(?:^[PESW]\d+\b.*(?:\n|$))*", re.MULTILINE)
+
+MAX_EXPERIENCES = 40
+MAX_EDUCATION = 5
+MAX_SKILLS = 20
+MAX_CERTIFICATIONS = 5
+MAX_ACCOMPLISHMENTS = 5
+SUMMARY_CHARS = 600
+DESCRIPTION_CHARS = 200
+ACCOMPLISHMENT_CHARS = 150
+SNIPPET_CHARS = 300
+
+# Profile projection (Profile.render with a token budget): the most recent roles and long-tenure
+# roles are kept in full first; other roles get one line each, then are dropped, oldest first.
+RECENT_ROLES = 3
+LONG_TENURE_MONTHS = 36
+
+
+def strip_sources(text: str) -> str:
+    """text without its "Sources:" block."""
+    return _SOURCES_BLOCK.sub("", text or "").rstrip()
+
+
+def inline_sources(text: str) -> str:
+    """
+    Replace the evidence IDs cited in text with the URLs from its own "Sources:" block and drop the
+    block, so text from an earlier run does not clash with this run's IDs (e.g. a previous summary).
+    """
+    block = _SOURCES_BLOCK.search(text or "")
+    if not block:
+        return text
+    urls = {}
+    for line in block.group(0).splitlines():
+        evidence_id, _, rest = line.partition(":")
+        if EVIDENCE_ID.fullmatch(evidence_id.strip()) and rest.split():
+            urls[evidence_id.strip()] = "LinkedIn" if evidence_id.startswith("P") else rest.split()[0]
+
+    def _source(match) -> str:
+        evidence_id = match.group(1)
+        if evidence_id in urls:
+            return urls[evidence_id]
+        # E#/S# share the profile's Sources line.
+        return "LinkedIn" if evidence_id[0] in "ES" and "P1" in urls else evidence_id
+
+    return EVIDENCE_ID.sub(_source, strip_sources(text))
+
+
+def _date(value) -> str:
+    """Proxycurl {"year": 2020, "month": 3} as "2020-03" ("" when unknown)."""
+    if not isinstance(value, dict) or not value.get("year"):
+        return ""
+    try:
+        return f"{int(value['year'])}-{int(value['month']):02d}"
+    except (KeyError, TypeError, ValueError):
+        return str(value["year"])
+
+
+def _clip(text: str, limit: int) -> str:
+    text = " ".join((text or "").split())
+    return text if len(text) <= limit else text[: limit - 1].rstrip() + "…"
+
+
+def _ordinal(value: str) -> int | None:
+    """Months since year 0 for a _date() string; None when it is not one (e.g. a raw "c. 2020")."""
+    year, _, month = value.partition("-")
+    try:
+        return int(year) * 12 + (int(month) if month else 1)
+    except ValueError:
+        return None
+
+
+def _months(start: str, end: str) -> int:
+    """Months between two _date() strings; an empty end means now, an unknown or unparseable date 0."""
+    if not start:
+        return 0
+    today = date.today()
+    first = _ordinal(start)
+    last = _ordinal(end) if end else today.year * 12 + today.month
+    if first is None or last is None:
+        return 0
+    return max(0, last - first)
+
+
+@dataclass(slots=True)
+class Experience:
+    title: str
+    company: str
+    start: str = ""
+    end: str = ""
+    description: str = ""
+    id: str = ""
+
+    @property
+    def months(self) -> int:
+        return _months(self.start, self.end)
+
+    def render(self, detailed: bool = True) -> str:
+        """One line; detailed=False leaves out the description."""
+        period = f" ({self.start or '?'} to {self.end or 'present'})" if self.start or self.end else ""
+        line = f"[{self.id}] {self.title or 'N/A'} at {self.company or 'N/A'}{period}"
+        return f"{line}: {_clip(self.description, DESCRIPTION_CHARS)}" if detailed and self.description else line
+
+
+@dataclass(slots=True)
+class Education:
+    school: str
+    degree: str = ""
+    id: str = ""
+
+    def render(self) -> str:
+        return f"[{self.id}] {self.school or 'N/A'}" + (f" - {self.degree}" if self.degree else "")
+
+
+@dataclass(slots=True)
+class Accomplishment:
+    """A project, publication or volunteering entry from the profile (cited by the profile's ID)."""
+
+    title: str
+    detail: str = ""
+    date: str = ""
+
+    def render(self) -> str:
+        line = f"- {self.title}" + (f" ({self.date})" if self.date else "")
+        return f"{line}: {_clip(self.detail, ACCOMPLISHMENT_CHARS)}" if self.detail else line
+
+
+def _accomplishments(items, title_key: str, detail_key: str = "description", date_key: str = "starts_at") -> list:
+    return [
+        Accomplishment(
+            title=item.get(title_key) or "",
+            detail=item.get(detail_key) or "",
+            date=_date(item.get(date_key)),
+        )
+        for item in (items or [])[:MAX_ACCOMPLISHMENTS]
+        if isinstance(item, dict) and item.get(title_key)
+    ]
+
+
+@dataclass(slots=True)
+class Profile:
+    """The parts of a Proxycurl profile the crew uses."""
+
+    linkedin_url: str = ""
+    name: str = ""
+    headline: str = ""
+    summary: str = ""
+    experiences: list[Experience] = field(default_factory=list)
+    education: list[Education] = field(default_factory=list)
+    skills: list[str] = field(default_factory=list)
+    languages: list[str] = field(default_factory=list)
+    certifications: list[str] = field(default_factory=list)
+    projects: list[Accomplishment] = field(default_factory=list)
+    publications: list[Accomplishment] = field(default_factory=list)
+    volunteering: list[Accomplishment] = field(default_factory=list)
+    id: str = "P1"
+
+    @classmethod
+    def from_proxycurl(cls, data: dict, linkedin_url: str = "") -> "Profile":
+        experiences = [
+            Experience(
+                title=exp.get("title") or "",
+                company=exp.get("company") or "",
+                start=_date(exp.get("starts_at")),
+                end=_date(exp.get("ends_at")),
+                description=exp.get("description") or "",
+                id=f"E{i}",
+            )
+            for i, exp in enumerate((data.get("experiences") or [])[:MAX_EXPERIENCES], 1)
+            if isinstance(exp, dict)
+        ]
+        education = [
+            Education(
+                school=edu.get("school") or "",
+                degree=edu.get("degree_name") or edu.get("field_of_study") or "",
+                id=f"S{i}",
+            )
+            for i, edu in enumerate((data.get("education") or [])[:MAX_EDUCATION], 1)
+            if isinstance(edu, dict)
+        ]
+        skills = data.get("skills") if isinstance(data.get("skills"), list) else []
+        return cls(
+            linkedin_url=linkedin_url,
+            name=data.get("full_name") or "",
+            headline=data.get("headline") or "",
+            summary=data.get("summary") or "",
+            experiences=experiences,
+            education=education,
+            skills=[str(s) for s in skills[:MAX_SKILLS]],
+            languages=[str(lang) for lang in data.get("languages") or []],
+            certifications=[
+                str(cert.get("name") if isinstance(cert, dict) else cert)
+                for cert in (data.get("certifications") or [])[:MAX_CERTIFICATIONS]
+            ],
+            projects=_accomplishments(data.get("accomplishment_projects"), "title"),
+            publications=_accomplishments(data.get("accomplishment_publications"), "name", date_key="published_on"),
+            volunteering=[
+                Accomplishment(
+                    title=" at ".join(part for part in (item.get("title"), item.get("company")) if part),
+                    detail=item.get("cause") or item.get("description") or "",
+                    date=_date(item.get("starts_at")),
+                )
+                for item in (data.get("volunteer_work") or [])[:MAX_ACCOMPLISHMENTS]
+                if isinstance(item, dict) and (item.get("title") or item.get("company"))
+            ],
+        )
+
+    def key_roles(self) -> list[int]:
+        """Indexes of the roles kept in full first: the most recent ones and those held for years."""
+        return [
+            i for i, exp in enumerate(self.experiences)
+            if i < RECENT_ROLES or exp.months >= LONG_TENURE_MONTHS
+        ]
+
+    def render(self, budget: int | None = None, model: str = DEFAULT_MODEL) -> str:
+        """
+        Terse text for the LLM; experience and education lines start with the ID to cite them by.
+        With a token budget, parts are added in priority order while they fit: key roles (recent or
+        long-tenure) as one-liners, education, the summary, key-role descriptions, the other roles as
+        one-liners (most recent first), then skills, languages, certifications, projects, publications
+        and volunteering. Without one, everything parsed is included.
+        """
+        header = f"[{self.id}] LinkedIn profile: {self.name or 'N/A'}" + (f" - {self.headline}" if self.headline else "")
+        key_roles = self.key_roles()
+        other_roles = [i for i in range(len(self.experiences)) if i not in key_roles]
+        # (section, index, line) in priority order; a later line for the same (section, index) replaces the earlier one.
+        candidates = [("experience", i, self.experiences[i].render(detailed=False)) for i in key_roles]
+        candidates += [("education", i, edu.render()) for i, edu in enumerate(self.education)]
+        if self.summary:
+            candidates.append(("summary", 0, f"Summary: {_clip(self.summary, SUMMARY_CHARS)}"))
+        candidates += [
+            ("experience", i, self.experiences[i].render()) for i in key_roles if self.experiences[i].description
+        ]
+        candidates += [("experience", i, self.experiences[i].render(detailed=False)) for i in other_roles]
+        for label, values in (("Skills", self.skills), ("Languages", self.languages)):
+            if values:
+                candidates.append((label.lower(), 0, f"{label}: " + ", ".join(values)))
+        if self.certifications:
+            candidates.append(("certifications", 0, "Certifications: " + "; ".join(self.certifications)))
+        for section in ("projects", "publications", "volunteering"):
+            candidates += [(section, i, item.render()) for i, item in enumerate(getattr(self, section))]
+
+        def cost(line: str) -> int:
+            return count_tokens(line, model) + 1 if budget is not None else 0
+
+        # Room for the "more roles not shown" note is kept back up front.
+        used = cost(header) + (cost(f"({len(self.experiences)} more roles not shown)") if self.experiences else 0)
+        chosen: dict[tuple[str, int], str] = {}
+        for section, index, line in candidates:
+            extra = cost(line) - (cost(chosen[section, index]) if (section, index) in chosen else 0)
+            if section in _HEADINGS and not any(key[0] == section for key in chosen):
+                extra += cost(_HEADINGS[section])
+            if budget is None or used + extra <= budget:
+                chosen[section, index] = line
+                used += extra
+
+        parts = [header]
+        for section in ("summary", "experience", "education", "skills", "languages", "certifications",
+                        "projects", "publications", "volunteering"):
+            lines = [line for (name, _), line in sorted(chosen.items(), key=lambda item: item[0][1]) if name == section]
+            if lines and section in _HEADINGS:
+                parts.append(_HEADINGS[section])
+            parts.extend(lines)
+            if section == "experience" and len(lines) < len(self.experiences):
+                parts.append(f"({len(self.experiences) - len(lines)} more roles not shown)")
+        return "\n".join(parts)
+
+
+_HEADINGS = {
+    "experience": "Experience:",
+    "education": "Education:",
+    "projects": "Projects:",
+    "publications": "Publications:",
+    "volunteering": "Volunteering:",
+}
+
+
+@dataclass(slots=True)
+class SearchResult:
+    url: str
+    title: str = ""
+    snippet: str = ""
+    label: str = ""  # evidence_scorer pre-check label (match / unverified), "" when not scored
+    reasons: tuple[str, ...] = ()
+    matched_queries: int = 1
+    id: str = ""
+
+    @classmethod
+    def from_firecrawl(cls, result: dict) -> "SearchResult":
+        return cls(
+            url=result.get("url") or "",
+            title=result.get("title") or "No title",
+            snippet=result.get("description") or (result.get("markdown") or "")[:SNIPPET_CHARS],
+            matched_queries=result.get("matched_queries", 1),
+        )
+
+    @property
+    def tag(self) -> str:
+        if not self.label:
+            return ""
+        return f"[pre-check: {self.label}{' - ' + ', '.join(self.reasons) if self.reasons else ''}]"
+
+    def render(self) -> str:
+        title = self.title + (f" (matched {self.matched_queries} queries)" if self.matched_queries > 1 else "")
+        lines = [f"[{self.id}] {self.tag + ' ' if self.tag else ''}{title}", f"   URL: {self.url}"]
+        if self.snippet:
+            lines.append(f"   {_clip(self.snippet, SNIPPET_CHARS)}")
+        return "\n".join(lines)
+
+    def render_seen(self) -> str:
+        return f"[{self.id}] (already returned earlier in this run) {self.title}"
+
+    def source_line(self) -> str:
+        return f"{self.id}: {self.url}" + (f" {self.tag}" if self.tag else "")
+
+
+class EvidenceStore:
+    """
+    Everything the tools returned in one run, by stable ID. Web results are de-duplicated by
+    normalized URL, so a result returned by several searches keeps its first ID. Also keeps the
+    run's distinct search queries (for change detection). Thread-safe: searches run concurrently.
+    """
+
+    def __init__(self):
+        self._records: dict[str, object] = {}
+        self._web_ids: dict[str, str] = {}
+        self._queries: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def note_query(self, query: str) -> None:
+        with self._lock:
+            self._queries.setdefault(normalize_query(query), query.strip())
+
+    @property
+    def queries(self) -> list[str]:
+        """Distinct queries searched in this run, in first-seen order."""
+        with self._lock:
+            return list(self._queries.values())
+
+    def add_profile(self, profile: Profile) -> Profile:
+        """Store the profile and its experience and education records under their IDs."""
+        with self._lock:
+            for record in [profile, *profile.experiences, *profile.education]:
+                self._records[record.id] = record
+        return profile
+
+    def add_result(self, result: SearchResult) -> tuple[SearchResult, bool]:
+        """Return (stored record, is_new); a URL seen before keeps its first record and ID."""
+        key = normalize_result_url(result.url) if result.url else f"untitled:{result.title}"
+        with self._lock:
+            if key in self._web_ids:
+                return self._records[self._web_ids[key]], False
+            result.id = f"W{len(self._web_ids) + 1}"
+            self._web_ids[key] = result.id
+            self._records[result.id] = result
+            return result, True
+
+    def get(self, evidence_id: str):
+        with self._lock:
+            return self._records.get(evidence_id)
+
+    def results(self, label: str | None = None) -> list[SearchResult]:
+        """Web results in ID order, optionally only those with the given pre-check label."""
+        with self._lock:
+            results = [self._records[i] for i in self._web_ids.values()]
+        return [r for r in results if label is None or r.label == label]
+
+    def cited_ids(self, text: str) -> list[str]:
+        """IDs of stored records cited in text, in first-cited order."""
+        with self._lock:
+            return list(dict.fromkeys(i for i in EVIDENCE_ID.findall(text or "") if i in self._records))
+
+    def with_sources(self, text: str) -> str:
+        """
+        text with its "Sources:" block rebuilt from the IDs it cites: one line per cited web result
+        (URL and pre-check label) and one for the LinkedIn profile if any profile record is cited.
+        """
+        body = strip_sources(text)
+        lines, profile_cited = [], False
+        for evidence_id in self.cited_ids(body):
+            record = self.get(evidence_id)
+            if isinstance(record, SearchResult):
+                lines.append(record.source_line())
+            elif not profile_cited:
+                profile_cited = True
+                profile = self.get("P1")
+                lines.insert(0, f"P1: LinkedIn profile {profile.linkedin_url if profile else ''}".rstrip())
+        return body + ("\n\n" + SOURCES_HEADING + "\n" + "\n".join(lines) if lines else "")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._records)
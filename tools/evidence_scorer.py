@@ -0,0 +1,151 @@
+"""
+Deterministic local scoring of web search results against the target person's identity.
+
+Uses the --name/--current-work inputs and, once the LinkedIn tool has fetched it, the Proxycurl
+profile (full name, companies, schools) to drop results that clearly do not mention the person and
+tag results that clearly do, before any LLM sees them.
+"""
+import re
+import threading
+import unicodedata
+from typing import Optional
+
+MATCH = "match"
+UNVERIFIED = "unverified"
+DROP = "drop"
+
+# Score at or above which a result is tagged as a clear match (e.g. full name + a known company).
+MATCH_THRESHOLD = 5.0
+
+_COMPANY_SUFFIXES = re.compile(
+    r"\b(inc|llc|ltd|limited|corp|corporation|co|company|gmbh|plc|sa|ag|bv|pty)\b\.?", re.IGNORECASE
+)
+_PROFILE_SLUG = re.compile(r"linkedin\.com/in/([^/?#]+)", re.IGNORECASE)
+
+
+def _fold(text: str) -> str:
+    """Lower-case, strip accents and collapse non-alphanumerics to single spaces."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    return re.sub(r"[^a-z0-9]+", " ", text).strip()
+
+
+def normalize_company(company: str) -> str:
+    """Comparable company name: folded, legal suffixes removed (e.g. 'Acme, Inc.' -> 'acme')."""
+    return _fold(_COMPANY_SUFFIXES.sub(" ", company or ""))
+
+
+def company_from_current_work(current_work: str) -> str:
+    """
+    Company from a free-form role string, e.g. 'CTO at Acme Inc' -> 'Acme Inc'. Only an explicit
+    " at " or "@" marks the company; without one ('CTO', 'Acme, Inc.', 'VP Eng, Payments') the text
+    may be a role or a legal suffix, so "" is returned.
+    """
+    text = (current_work or "").strip()
+    for sep in (" at ", " @ ", "@"):
+        if sep in text:
+            return text.rsplit(sep, 1)[1].strip()
+    return ""
+
+
+def _contains(haystack: str, phrase: str) -> bool:
+    return bool(phrase) and f" {phrase} " in f" {haystack} "
+
+
+class TargetIdentity:
+    """
+    What is known about the target person in this run. Shared by the LinkedIn tool (which enriches
+    it from the profile) and the Firecrawl tools (which score results against it).
+    """
+
+    def __init__(
+        self,
+        linkedin_url: Optional[str] = None,
+        name: Optional[str] = None,
+        current_work: Optional[str] = None,
+    ):
+        self._lock = threading.Lock()
+        match = _PROFILE_SLUG.search(linkedin_url or "")
+        self.profile_slug = match.group(1).lower() if match else None
+        self.names: set[str] = set()
+        self.companies: set[str] = set()
+        self.schools: set[str] = set()
+        if name:
+            self.add_name(name)
+        if current_work:
+            self.add_company(company_from_current_work(current_work))
+
+    def add_name(self, name: str) -> None:
+        folded = _fold(name)
+        if folded:
+            with self._lock:
+                self.names.add(folded)
+
+    def add_company(self, company: str) -> None:
+        normalized = normalize_company(company)
+        if len(normalized) >= 2:
+            with self._lock:
+                self.companies.add(normalized)
+
+    def update_from_profile(self, data: dict) -> None:
+        """Add the full name, companies and schools from a Proxycurl profile."""
+        if data.get("full_name"):
+            self.add_name(data["full_name"])
+        for exp in data.get("experiences") or []:
+            if exp.get("company"):
+                self.add_company(exp["company"])
+        for edu in data.get("education") or []:
+            school = _fold(edu.get("school") or "")
+            if school:
+                with self._lock:
+                    self.schools.add(school)
+
+    def score(self, result: dict) -> tuple[float, str, list[str]]:
+        """
+        Score one Firecrawl result. Returns (score, label, reasons) where label is MATCH, UNVERIFIED
+        or DROP. Results are only dropped when a name is known and the result shows no trace of it,
+        or when it is a different person's LinkedIn profile.
+        """
+        url = result.get("url") or ""
+        text = _fold(" ".join([result.get("title") or "", result.get("description") or "",
+                               (result.get("markdown") or "")[:2000], url]))
+        with self._lock:
+            names, companies, schools = set(self.names), set(self.companies), set(self.schools)
+
+        slug = _PROFILE_SLUG.search(url)
+        if slug and self.profile_slug:
+            if slug.group(1).lower() == self.profile_slug:
+                return 10.0, MATCH, ["their LinkedIn profile"]
+            return -10.0, DROP, ["another person's LinkedIn profile"]
+
+        score, reasons = 0.0, []
+        name_hit = False
+        if any(_contains(text, full) for full in names):
+            score += 3.0
+            reasons.append("full name")
+            name_hit = True
+        elif any(len(full.split()) > 1 and all(_contains(text, t) for t in full.split()) for full in names):
+            score += 2.0
+            reasons.append("all name parts")
+            name_hit = True
+        elif any(len(full.split()) > 1 and _contains(text, full.split()[-1]) for full in names):
+            score += 0.5
+            reasons.append("surname only")
+
+        company_hits = [c for c in companies if _contains(text, c)]
+        if company_hits:
+            score += 2.0
+            reasons.append("company " + company_hits[0])
+        host = re.sub(r"^www\.", "", url.split("://")[-1].split("/")[0].lower())
+        if any(c.replace(" ", "") in host.replace("-", "") for c in companies if len(c) >= 3):
+            score += 1.0
+            reasons.append("company domain")
+        if any(_contains(text, s) for s in schools):
+            score += 1.0
+            reasons.append("school")
+
+        if names and not name_hit and score <= 1.0:
+            return score, DROP, reasons or ["name not mentioned"]
+        if name_hit and score >= MATCH_THRESHOLD:
+            return score, MATCH, reasons
+        return score, UNVERIFIED, reasons
@@ -3,17 +3,30 @@ Dynamic web search tool using Firecrawl API so agents can pass a query at runtim
 """
 import os
 import logging
-from typing import Type
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional, Type
 
 import requests
 from pydantic import BaseModel, Field
 
-from crewai.tools import BaseTool
+from .base import InstrumentedTool, new_call_record
+from .cache import TTLCache
+from .evidence import EvidenceStore, SearchResult
+from .evidence_scorer import DROP
+from .http_client import request
+from .rate_limit import FIRECRAWL
+from .urls import normalize_query, normalize_result_url
 
 # Set up logging for Firecrawl debugging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+FIRECRAWL_API_URL = os.getenv("FIRECRAWL_API_URL", "https://api.firecrawl.dev/v1/search")
+SEARCH_LIMIT = 8
+# Upper bound on queries per multi-search call (and on concurrent Firecrawl requests it makes).
+MAX_MULTI_QUERIES = 6
+# Raw Firecrawl results are cached per normalized query; override the TTL with FIRECRAWL_CACHE_TTL_HOURS.
+DEFAULT_CACHE_TTL_HOURS = 24
 
 class FirecrawlSearchInput(BaseModel):
     """Input schema for dynamic Firecrawl search."""
@@ -21,78 +34,229 @@ class FirecrawlSearchInput(BaseModel):
     query: str = Field(..., description="Search query for web, blog, or video search")
 
 
-class FirecrawlSearchTool(BaseTool):
+class FirecrawlSearchTool(InstrumentedTool):
     """Tool to search the web via Firecrawl API. Use for general web, blog, and video search. Pass the search query when calling."""
 
     name: str = "Firecrawl Web Search"
     description: str = (
         "Searches the web using Firecrawl. Use this for general web search, blog posts, or video content. "
-        "Provide a clear search query string."
+        "Provide a clear search query string. Each result has an evidence ID (e.g. W3) to cite it by; results "
+        "already returned earlier in this run are shown as a one-line back-reference instead of being repeated."
     )
     args_schema: Type[BaseModel] = FirecrawlSearchInput
+    # tools.evidence.EvidenceStore shared per run (see agents.bind_run) so repeated URLs collapse across queries.
+    evidence: Any = Field(default_factory=EvidenceStore)
+    # Optional TargetIdentity shared with the LinkedIn tool; when set, results are scored locally.
+    identity: Any = None
+    refresh: bool = False
+    cache_ttl_hours: float = float(os.getenv("FIRECRAWL_CACHE_TTL_HOURS", DEFAULT_CACHE_TTL_HOURS))
 
-    def _run(self, query: str) -> str:
-        api_key = os.getenv("FIRECRAWL_API_KEY")
-        if not api_key:
-            return "Error: FIRECRAWL_API_KEY is not set in the environment."
+    def _cache(self) -> TTLCache:
+        return TTLCache("firecrawl", ttl=self.cache_ttl_hours * 3600)
+
+    def search(self, query: str, limit: int = SEARCH_LIMIT, call: Optional[dict] = None) -> list[dict]:
+        """
+        Return raw Firecrawl results for a query, served from the on-disk cache when fresh.
+        Raises requests exceptions on HTTP errors and ValueError on an unsuccessful API response.
+        call is the telemetry record of the current tool call, if any.
+        """
+        call = call if call is not None else new_call_record()
+        self.evidence.note_query(query)
+        cache = self._cache()
+        key = f"{limit}:{normalize_query(query)}"
+        if not self.refresh:
+            cached = cache.get(key)
+            if cached is not None:
+                print(f"💾 FIRECRAWL CACHE HIT: {query}")
+                call["cache_hits"] += 1
+                return cached
 
-        url = "https://api.firecrawl.dev/v1/search"
+        url = FIRECRAWL_API_URL
         headers = {
-            "Authorization": f"Bearer {api_key}",
+            "Authorization": f"Bearer {os.getenv('FIRECRAWL_API_KEY')}",
             "Content-Type": "application/json",
         }
-        payload = {"query": query, "limit": 8}
+        payload = {"query": query, "limit": limit}
+
+        response = request("POST", url, headers=headers, json=payload, provider=FIRECRAWL)
+        call["api_calls"] += 1
+        call["http_statuses"].append(response.status_code)
+        response.raise_for_status()
+        data = response.json()
+
+        # Log raw response for debugging
+        logger.info(f"Firecrawl API response status: {response.status_code}")
+        logger.info(f"Firecrawl response keys: {data.keys() if isinstance(data, dict) else 'Not a dict'}")
+
+        if not isinstance(data, dict) or not data.get("success") or "data" not in data:
+            raise ValueError(f"Firecrawl error response: {data}")
+
+        results = data.get("data") or []
+        cache.set(key, results)
+        return results
+
+    def format_results(self, results: list[dict]) -> str:
+        """
+        Add results to the run's evidence store and render them for the LLM, collapsing URLs already
+        returned earlier in this run. With a target identity, results that clearly do not refer to the
+        person are dropped (and not stored) and the rest are tagged.
+        """
+        parts = []
+        dropped = 0
+        for r in results:
+            record = SearchResult.from_firecrawl(r)
+            if self.identity is not None:
+                _, record.label, reasons = self.identity.score(r)
+                record.reasons = tuple(reasons)
+                if record.label == DROP:
+                    dropped += 1
+                    print(f"\n[dropped] {record.title} ({', '.join(reasons)})")
+                    continue
+            record, is_new = self.evidence.add_result(record)
+
+            if not is_new:
+                print(f"\n[{record.id}] (seen earlier) {record.title}")
+                parts.append(record.render_seen())
+                continue
+
+            # Print each result for visibility
+            print(f"\n[{record.id}] {record.title}")
+            print(f"    🔗 {record.url}")
+            print(f"    📄 {record.snippet[:200]}...")
+
+            parts.append(record.render())
+        if dropped:
+            parts.append(f"(Local pre-check dropped {dropped} result(s) that do not refer to the target person.)")
+        return "\n\n".join(parts) if parts else "No search results found."
+
+    def _run(self, query: str) -> str:
+        api_key = os.getenv("FIRECRAWL_API_KEY")
+        if not api_key:
+            return "Error: FIRECRAWL_API_KEY is not set in the environment."
 
         # Log the query being sent
         print("\n" + "="*80)
         print(f"🔍 FIRECRAWL SEARCH QUERY: {query}")
         print("="*80)
 
-        try:
-            response = requests.post(url, headers=headers, json=payload, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Log raw response for debugging
-            logger.info(f"Firecrawl API response status: {response.status_code}")
-            logger.info(f"Firecrawl response keys: {data.keys() if isinstance(data, dict) else 'Not a dict'}")
-            
-            if not data.get("success") or "data" not in data:
-                print(f"⚠️  FIRECRAWL ERROR RESPONSE: {data}")
-                return str(data)
-            
-            results = data.get("data", [])
-            if not results:
+        with self._track() as call:
+            try:
+                results = self.search(query, call=call)
+                if not results:
+                    print("⚠️  FIRECRAWL: No search results found.")
+                    return "No search results found."
+
+                # Log number of results
+                print(f"✅ FIRECRAWL FOUND {len(results)} RESULTS:")
+                print("-"*80)
+                formatted = self.format_results(results)
+                print("="*80 + "\n")
+
+                return formatted
+            except requests.exceptions.RequestException as e:
+                error_msg = f"Firecrawl API error: {e}"
+                call["error"] = error_msg
+                print(f"❌ {error_msg}")
+                logger.error(f"Firecrawl request error: {e}", exc_info=True)
+                return error_msg
+            except ValueError as e:
+                call["error"] = str(e)
+                print(f"⚠️  FIRECRAWL ERROR RESPONSE: {e}")
+                return str(e)
+            except Exception as e:
+                error_msg = f"Error during search: {e}"
+                call["error"] = error_msg
+                print(f"❌ {error_msg}")
+                logger.error(f"Firecrawl unexpected error: {e}", exc_info=True)
+                return error_msg
+
+
+def merge_results(results_per_query: list[list[dict]]) -> list[dict]:
+    """
+    Merge several result lists, de-duplicated by URL and ranked by reciprocal-rank fusion:
+    a URL returned near the top of several queries ranks above one found once.
+    Each merged result gets a "matched_queries" count.
+    """
+    merged: dict[str, dict] = {}
+    scores: dict[str, float] = {}
+    for results in results_per_query:
+        for rank, r in enumerate(results, 1):
+            key = normalize_result_url(r.get("url", "")) or f"untitled:{r.get('title', '')}"
+            if key not in merged:
+                merged[key] = dict(r, matched_queries=0)
+                scores[key] = 0.0
+            merged[key]["matched_queries"] += 1
+            scores[key] += 1.0 / (rank + 1)
+    return [merged[key] for key in sorted(merged, key=lambda k: scores[k], reverse=True)]
+
+
+class FirecrawlMultiSearchInput(BaseModel):
+    """Input schema for running several Firecrawl searches in one call."""
+
+    queries: List[str] = Field(
+        ...,
+        description=f"List of distinct search queries (up to {MAX_MULTI_QUERIES}), e.g. full name in quotes, name + company, name + 'talk'",
+    )
+
+
+class FirecrawlMultiSearchTool(FirecrawlSearchTool):
+    """Runs several Firecrawl searches concurrently and returns one merged, de-duplicated, ranked result list."""
+
+    name: str = "Firecrawl Multi Search"
+    description: str = (
+        "Runs several web searches at once using Firecrawl and returns one combined list, de-duplicated by URL "
+        "and ranked so results matching several queries come first. Prefer this over single searches when you "
+        f"have multiple targeted queries. Pass up to {MAX_MULTI_QUERIES} query strings."
+    )
+    args_schema: Type[BaseModel] = FirecrawlMultiSearchInput
+
+    def _run(self, queries: List[str]) -> str:
+        api_key = os.getenv("FIRECRAWL_API_KEY")
+        if not api_key:
+            return "Error: FIRECRAWL_API_KEY is not set in the environment."
+
+        # Drop blanks and normalized duplicates; keep the caller's order.
+        unique = {}
+        for q in queries if isinstance(queries, list) else [queries]:
+            if isinstance(q, str) and q.strip():
+                unique.setdefault(normalize_query(q), q.strip())
+        queries = list(unique.values())[:MAX_MULTI_QUERIES]
+        if not queries:
+            return "Error: provide at least one non-empty search query."
+
+        print("\n" + "="*80)
+        print(f"🔍 FIRECRAWL MULTI SEARCH ({len(queries)} queries):")
+        for q in queries:
+            print(f"   - {q}")
+        print("="*80)
+
+        def run_query(query: str):
+            # Each query fills its own record; they are merged below on this thread.
+            query_call = new_call_record()
+            try:
+                return self.search(query, call=query_call), None, query_call
+            except Exception as e:
+                logger.error(f"Firecrawl error for query {query!r}: {e}", exc_info=True)
+                return [], f"{e}", query_call
+
+        with self._track() as call:
+            with ThreadPoolExecutor(max_workers=len(queries)) as pool:
+                outcomes = list(pool.map(run_query, queries))
+            for _, _, query_call in outcomes:
+                call["api_calls"] += query_call["api_calls"]
+                call["cache_hits"] += query_call["cache_hits"]
+                call["http_statuses"].extend(query_call["http_statuses"])
+
+            errors = [f"Query {q!r} failed: {err}" for q, (_, err, _) in zip(queries, outcomes) if err]
+            if errors:
+                call["error"] = "; ".join(errors)
+            merged = merge_results([results for results, _, _ in outcomes])
+            if not merged:
                 print("⚠️  FIRECRAWL: No search results found.")
-                return "No search results found."
-            
-            # Log number of results
-            print(f"✅ FIRECRAWL FOUND {len(results)} RESULTS:")
+                return "\n".join(errors) if errors else "No search results found."
+
+            print(f"✅ FIRECRAWL FOUND {len(merged)} UNIQUE RESULTS:")
             print("-"*80)
-            
-            parts = []
-            for i, r in enumerate(results, 1):
-                title = r.get("title", "No title")
-                url_link = r.get("url", "")
-                desc = r.get("description", "") or r.get("markdown", "")[:300]
-                
-                # Print each result for visibility
-                print(f"\n[{i}] {title}")
-                print(f"    🔗 {url_link}")
-                print(f"    📄 {desc[:200]}...")
-                
-                parts.append(f"{i}. {title}\n   URL: {url_link}\n   {desc}")
-            
+            formatted = self.format_results(merged)
             print("="*80 + "\n")
-            
-            return "\n\n".join(parts)
-        except requests.exceptions.RequestException as e:
-            error_msg = f"Firecrawl API error: {e}"
-            print(f"❌ {error_msg}")
-            logger.error(f"Firecrawl request error: {e}", exc_info=True)
-            return error_msg
-        except Exception as e:
-            error_msg = f"Error during search: {e}"
-            print(f"❌ {error_msg}")
-            logger.error(f"Firecrawl unexpected error: {e}", exc_info=True)
-            return error_msg
+            return "\n".join(errors + [formatted]) if errors else formatted
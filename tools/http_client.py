@@ -0,0 +1,106 @@
+"""
+Shared HTTP session for all tools: keep-alive connection pooling, separate connect/read timeouts,
+and retries with jittered exponential backoff that honor Retry-After on 429/5xx responses.
+Requests tagged with a provider also go through its shared rate limiter (see rate_limit.py).
+"""
+import logging
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .rate_limit import CREDITS_PER_CALL, get_limiter
+
+logger = logging.getLogger(__name__)
+
+CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", 5))
+READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", 30))
+MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", 3))
+# Connections kept open per host; requests beyond this wait for a free connection instead of opening more.
+POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", 10))
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 30.0
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                # Retries are handled in request() so backoff and Retry-After apply uniformly.
+                adapter = HTTPAdapter(pool_connections=8, pool_maxsize=POOL_MAXSIZE, pool_block=True, max_retries=0)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)]."""
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)))
+
+
+def _retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Parse a Retry-After header given either as seconds or as an HTTP date."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def request(
+    method: str, url: str, *, max_retries: int = MAX_RETRIES, provider: Optional[str] = None, **kwargs
+) -> requests.Response:
+    """
+    Send a request through the shared session, retrying connection errors, timeouts and
+    429/5xx responses up to max_retries times. Returns the final response (callers still call
+    raise_for_status) and re-raises the last connection error once retries are exhausted.
+    With a provider, every attempt first waits for that provider's rate limiter (raising
+    rate_limit.RateLimitError or QuotaExceeded instead), a 429 makes all its callers back off,
+    and successful calls are charged against its daily credit budget.
+    """
+    kwargs.setdefault("timeout", (CONNECT_TIMEOUT, READ_TIMEOUT))
+    session = get_session()
+    limiter = get_limiter(provider) if provider else None
+    for attempt in range(max_retries + 1):
+        if limiter:
+            limiter.acquire()
+        try:
+            response = session.request(method, url, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            if attempt >= max_retries:
+                raise
+            delay = backoff_delay(attempt)
+            logger.warning(f"{method} {url} failed ({e}); retrying in {delay:.1f}s")
+            time.sleep(delay)
+            continue
+
+        if limiter and response.status_code == 429:
+            limiter.throttle()
+        if response.status_code not in RETRY_STATUSES or attempt >= max_retries:
+            if limiter and response.ok:
+                limiter.record(spent=CREDITS_PER_CALL.get(provider, 1))
+            return response
+        retry_after = _retry_after_seconds(response)
+        delay = min(BACKOFF_CAP, retry_after) if retry_after is not None else backoff_delay(attempt)
+        logger.warning(f"{method} {url} returned {response.status_code}; retrying in {delay:.1f}s")
+        response.close()
+        time.sleep(delay)
@@ -0,0 +1,206 @@
+"""
+Safe, de-duplicated appends to my_interests.md (used by AppendInterestsTool and batch mode).
+
+Writes are safe under concurrent runs: each read-modify-write holds an exclusive lock on
+my_interests.md.lock and replaces the file atomically (temp file + os.replace). New lines are
+checked against every existing bullet (all sections), normalized and fuzzy-matched, so the same
+interest is not added twice. Batch runs can buffer appends in an InterestBuffer and write them once.
+"""
+import difflib
+import os
+import re
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DEFAULT_INTERESTS_PATH = Path(__file__).resolve().parent.parent / "my_interests.md"
+# difflib ratio at or above which two normalized bullets count as the same interest.
+FUZZY_CUTOFF = 0.9
+
+_BULLET = re.compile(r"^\s*(?:[-*•+]|\d+[.)])\s+(.*\S)\s*$")
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Exclusive lock on {path}.lock, held across processes and threads until the block exits."""
+    lock_path = path.with_name(path.name + ".lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)  # retries for ~10s before raising
+                    break
+                except OSError:
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Write text to a temp file in the same directory, fsync it, then atomically replace path."""
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def normalize_interest(line: str) -> str:
+    """Comparison key for a bullet: no list marker, lowercase, '&' as 'and', punctuation and extra spaces removed."""
+    match = _BULLET.match(line)
+    text = (match.group(1) if match else line).lower().replace("&", " and ")
+    return " ".join(re.sub(r"[^\w\s]", " ", text).split())
+
+
+class InterestIndex:
+    """Normalized bullets of an interests file (all sections), for exact and fuzzy duplicate lookups."""
+
+    def __init__(self, text: str = ""):
+        self._keys: dict[str, str] = {}
+        for line in text.splitlines():
+            match = _BULLET.match(line)
+            if match:
+                self.add(match.group(1))
+
+    def add(self, line: str) -> None:
+        key = normalize_interest(line)
+        if key:
+            self._keys.setdefault(key, line.strip())
+
+    def match(self, line: str) -> Optional[str]:
+        """The existing bullet that line duplicates (exactly or nearly), or None."""
+        key = normalize_interest(line)
+        if not key:
+            return None
+        if key in self._keys:
+            return self._keys[key]
+        # Near matches that differ in a number ("Python 2" / "Python 3") are different interests.
+        digits = re.findall(r"\d+", key)
+        for close in difflib.get_close_matches(key, list(self._keys), n=3, cutoff=FUZZY_CUTOFF):
+            if re.findall(r"\d+", close) == digits:
+                return self._keys[close]
+        return None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+# path -> ((mtime_ns, size), InterestIndex): re-parsed only when the file changes.
+_index_cache: dict = {}
+_index_cache_lock = threading.Lock()
+
+
+def read_interests(path: Path) -> Tuple[str, InterestIndex]:
+    """Current file text and its index (cached by mtime and size)."""
+    try:
+        text = path.read_text(encoding="utf-8")
+        stat = path.stat()
+    except FileNotFoundError:
+        return "", InterestIndex()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    with _index_cache_lock:
+        cached = _index_cache.get(str(path))
+        if cached and cached[0] == stamp:
+            return text, cached[1]
+    index = InterestIndex(text)
+    with _index_cache_lock:
+        _index_cache[str(path)] = (stamp, index)
+    return text, index
+
+
+def _insert_interests(existing: str, lines: List[str]) -> str:
+    """Add lines as bullets at the end of the '## Interests' section (created if missing)."""
+    new_lines = "".join(f"- {line}\n" for line in lines)
+    marker = "## Interests"
+    idx = existing.find(marker)
+    if idx == -1:
+        if existing and not existing.endswith("\n"):
+            existing += "\n"
+        return existing + f"\n{marker}\n" + new_lines
+    line_end = existing.find("\n", idx)
+    if line_end == -1:
+        return existing + "\n" + new_lines
+    next_section = existing.find("\n## ", line_end)
+    section_end = len(existing) if next_section == -1 else next_section + 1
+    # Insert after the section's last non-blank line, keeping one blank line before the next heading.
+    trimmed = existing[line_end + 1:section_end].rstrip("\n")
+    insert_pos = line_end + 1 + len(trimmed)
+    rest = existing[insert_pos:].lstrip("\n")
+    return existing[:insert_pos] + ("\n" if trimmed else "") + new_lines + ("\n" + rest if rest else "")
+
+
+def append_interests(path: Path, lines: List[str]) -> List[str]:
+    """
+    Append the lines that are not already present (or near-duplicates of each other) under
+    '## Interests', in one locked, atomic write. Returns the lines actually added.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with file_lock(path):
+        existing = path.read_text(encoding="utf-8") if path.exists() else ""
+        index = InterestIndex(existing)
+        added = []
+        for line in lines:
+            line = line.strip()
+            if line and index.match(line) is None:
+                index.add(line)
+                added.append(line)
+        if added:
+            atomic_write_text(path, _insert_interests(existing, added))
+    return added
+
+
+class InterestBuffer:
+    """
+    Collects appends from many runs (e.g. batch threads) and writes them to the interests file in
+    one locked write on flush(). Near-duplicates of queued lines are rejected when added.
+    """
+
+    def __init__(self, path: Path = DEFAULT_INTERESTS_PATH):
+        self.path = Path(path)
+        self._pending: List[str] = []
+        self._index = InterestIndex()
+        self._lock = threading.Lock()
+
+    def add(self, line: str) -> Optional[str]:
+        """Queue line; returns the already-queued line it duplicates instead, if any."""
+        with self._lock:
+            duplicate = self._index.match(line)
+            if duplicate is None:
+                self._index.add(line)
+                self._pending.append(line.strip())
+            return duplicate
+
+    def flush(self) -> List[str]:
+        """Write queued lines to the file; returns the ones added (others were already present)."""
+        with self._lock:
+            pending, self._pending, self._index = self._pending, [], InterestIndex()
+        return append_interests(self.path, pending) if pending else []
+
+    def __len__(self) -> int:
+        return len(self._pending)
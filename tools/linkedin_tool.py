@@ -2,12 +2,23 @@
 Custom CrewAI tool to fetch LinkedIn profile data via Proxycurl API.
 """
 import os
-from typing import Type
+from typing import Any, Optional, Type
 
 import requests
 from pydantic import BaseModel, Field
 
-from crewai.tools import BaseTool
+from .base import InstrumentedTool, new_call_record
+from .cache import TTLCache
+from .evidence import Profile
+from .http_client import request
+from .rate_limit import PROXYCURL
+from .urls import normalize_linkedin_url
+
+PROXYCURL_API_URL = os.getenv("PROXYCURL_API_URL", "https://nubela.co/proxycurl/api/v2/linkedin")
+# Raw Proxycurl JSON is cached per normalized profile URL; override the TTL with PROXYCURL_CACHE_TTL_HOURS.
+DEFAULT_CACHE_TTL_HOURS = 24 * 7
+# Tokens the formatted profile may use (it is carried into every later prompt); 0 means no limit.
+DEFAULT_PROFILE_TOKEN_BUDGET = 1200
 
 
 class LinkedInToolInput(BaseModel):
@@ -19,16 +30,55 @@ class LinkedInToolInput(BaseModel):
     )
 
 
-class LinkedInTool(BaseTool):
+class LinkedInTool(InstrumentedTool):
     """Tool to scrape a LinkedIn profile using the Proxycurl API (nubela.co)."""
 
     name: str = "LinkedIn Profile Scraper"
     description: str = (
         "Fetches structured data for a LinkedIn profile given its URL. "
         "Use this to get the person's headline, experience, education, skills, "
-        "and summary. Input must be the full LinkedIn profile URL."
+        "and summary. Input must be the full LinkedIn profile URL. Each line starts with an evidence ID "
+        "(P1 for the profile, E1.. for roles, S1.. for schools) to cite it by."
     )
     args_schema: Type[BaseModel] = LinkedInToolInput
+    # refresh=True bypasses the cache for reads (the fresh response is still stored).
+    refresh: bool = False
+    cache_ttl_hours: float = float(os.getenv("PROXYCURL_CACHE_TTL_HOURS", DEFAULT_CACHE_TTL_HOURS))
+    # Optional TargetIdentity shared with the Firecrawl tools; enriched with the fetched profile.
+    identity: Any = None
+    # Optional tools.evidence.EvidenceStore for the run; the parsed profile is added to it.
+    evidence: Any = None
+    token_budget: int = int(os.getenv("LINKEDIN_PROFILE_TOKEN_BUDGET", DEFAULT_PROFILE_TOKEN_BUDGET))
+
+    def _cache(self) -> TTLCache:
+        return TTLCache("proxycurl", ttl=self.cache_ttl_hours * 3600)
+
+    def fetch_profile(self, linkedin_url: str, call: Optional[dict] = None) -> dict:
+        """
+        Return the raw Proxycurl JSON for a profile, served from the on-disk cache when fresh.
+        Raises requests exceptions on API errors; requires PROXYCURL_API_KEY.
+        call is the telemetry record of the current tool call, if any.
+        """
+        call = call if call is not None else new_call_record()
+        cache = self._cache()
+        key = normalize_linkedin_url(linkedin_url)
+        if not self.refresh:
+            cached = cache.get(key)
+            if cached is not None:
+                call["cache_hits"] += 1
+                return cached
+
+        url = PROXYCURL_API_URL
+        headers = {"Authorization": f"Bearer {os.getenv('PROXYCURL_API_KEY')}"}
+        params = {"url": linkedin_url}
+
+        response = request("GET", url, headers=headers, params=params, provider=PROXYCURL)
+        call["api_calls"] += 1
+        call["http_statuses"].append(response.status_code)
+        response.raise_for_status()
+        data = response.json()
+        cache.set(key, data)
+        return data
 
     def _run(self, linkedin_url: str) -> str:
         api_key = os.getenv("PROXYCURL_API_KEY")
@@ -40,65 +90,26 @@ class LinkedInTool(BaseTool):
                 "Extract the same kind of information you would from LinkedIn."
             )
 
-        url = "https://nubela.co/proxycurl/api/v2/linkedin"
-        headers = {"Authorization": f"Bearer {api_key}"}
-        params = {"url": linkedin_url}
-
-        try:
-            response = requests.get(url, headers=headers, params=params, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-            # Return a readable summary for the agent (full JSON can be large)
-            return self._format_profile(data)
-        except requests.exceptions.RequestException as e:
-            return f"Proxycurl API error: {e}"
-        except Exception as e:
-            return f"Error fetching LinkedIn profile: {e}"
-
-    @staticmethod
-    def _format_profile(data: dict) -> str:
-        """Turn Proxycurl JSON into a concise text summary for agents."""
-        parts = []
-
-        if data.get("full_name"):
-            parts.append(f"Name: {data['full_name']}")
-        if data.get("headline"):
-            parts.append(f"Headline: {data['headline']}")
-        if data.get("summary"):
-            parts.append(f"Summary: {data['summary']}")
-
-        if data.get("experiences"):
-            parts.append("\n## Experience")
-            for exp in data["experiences"][:10]:
-                title = exp.get("title", "N/A")
-                company = exp.get("company", "N/A")
-                start = exp.get("starts_at", {})
-                end = exp.get("ends_at", {})
-                start_str = f"{start.get('year', '')}-{start.get('month', '')}" if start else "?"
-                end_str = f"{end.get('year', '')}-{end.get('month', '')}" if end else "Present"
-                parts.append(f"- {title} at {company} ({start_str} to {end_str})")
-                if exp.get("description"):
-                    parts.append(f"  {exp['description'][:200]}...")
-
-        if data.get("education"):
-            parts.append("\n## Education")
-            for edu in data["education"][:5]:
-                school = edu.get("school", "N/A")
-                degree = edu.get("degree_name") or edu.get("field_of_study") or ""
-                parts.append(f"- {school} - {degree}")
-
-        if data.get("skills"):
-            parts.append("\n## Skills")
-            skills = data["skills"][:20] if isinstance(data["skills"], list) else []
-            parts.append(", ".join(skills) if skills else str(data["skills"]))
-
-        if data.get("languages"):
-            parts.append("\n## Languages")
-            parts.append(", ".join(data["languages"]))
-
-        if data.get("certifications"):
-            parts.append("\n## Certifications")
-            for cert in data["certifications"][:5]:
-                parts.append(f"- {cert.get('name', cert)}")
-
-        return "\n".join(parts) if parts else str(data)
+        with self._track() as call:
+            try:
+                data = self.fetch_profile(linkedin_url, call)
+                if self.identity is not None:
+                    self.identity.update_from_profile(data)
+                # Return a terse summary for the agent (full JSON can be large)
+                return self._format_profile(data, linkedin_url)
+            except requests.exceptions.RequestException as e:
+                call["error"] = str(e)
+                return f"Proxycurl API error: {e}"
+            except Exception as e:
+                call["error"] = str(e)
+                return f"Error fetching LinkedIn profile: {e}"
+
+    def _format_profile(self, data: dict, linkedin_url: str = "") -> str:
+        """
+        Parse Proxycurl JSON into a Profile record, add it to the run's evidence store and render it for
+        agents within token_budget (recent and long-tenure roles first, see Profile.render).
+        """
+        profile = Profile.from_proxycurl(data, linkedin_url=linkedin_url)
+        if self.evidence is not None:
+            self.evidence.add_profile(profile)
+        return profile.render(budget=self.token_budget or None)
@@ -0,0 +1,271 @@
+"""
+Shared rate limiter and daily quota guard for the paid APIs (OpenAI, Firecrawl, Proxycurl).
+
+Token buckets live in the SQLite cache file, so every thread and process on the machine (batch
+workers, service jobs, separate CLI runs) draws from the same per-provider budget. A call that
+would exceed the requests-per-minute or tokens-per-minute limit waits until the bucket refills
+instead of being sent and rejected with a 429. Once a provider's daily budget (credits for the
+tool APIs, tokens for OpenAI) is spent, further calls fail fast with QuotaExceeded.
+
+Limits come from RATE_LIMIT_<PROVIDER>_RPM, RATE_LIMIT_<PROVIDER>_TPM and RATE_LIMIT_<PROVIDER>_DAILY
+(0 disables a limit); RATE_LIMIT_MAX_WAIT caps how long one call may queue. OpenAI limits apply per
+model, as OpenAI enforces them: each model has its own buckets and daily budget, and
+RATE_LIMIT_OPENAI_<MODEL>_<KIND> (e.g. RATE_LIMIT_OPENAI_GPT_4O_MINI_TPM) overrides the provider value.
+"""
+import logging
+import re
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .cache import DEFAULT_CACHE_PATH
+
+logger = logging.getLogger(__name__)
+
+OPENAI = "openai"
+FIRECRAWL = "firecrawl"
+PROXYCURL = "proxycurl"
+
+# provider -> (requests per minute, tokens per minute, daily budget); 0 means unlimited.
+# Daily budgets are in the provider's billing unit: credits for Firecrawl/Proxycurl, tokens for OpenAI.
+DEFAULT_LIMITS = {
+    OPENAI: (500, 30000, 0),
+    FIRECRAWL: (100, 0, 0),
+    PROXYCURL: (300, 0, 0),
+}
+# Credits charged per successful API call (see COST_ESTIMATE.md).
+CREDITS_PER_CALL = {FIRECRAWL: 2, PROXYCURL: 1}
+MAX_WAIT = float(os.getenv("RATE_LIMIT_MAX_WAIT", 120))
+# A throttled caller re-checks the bucket at least this often (other processes may return capacity).
+MAX_SLEEP = 2.0
+
+
+class RateLimitError(RuntimeError):
+    """A call could not be admitted within RATE_LIMIT_MAX_WAIT seconds."""
+
+
+class QuotaExceeded(RateLimitError):
+    """The provider's daily budget is used up."""
+
+
+def _env_name(provider: str, scope: Optional[str] = None) -> str:
+    """RATE_LIMIT_ prefix for a provider, or for one model of it (gpt-4o-mini -> ..._GPT_4O_MINI)."""
+    name = f"RATE_LIMIT_{provider.upper()}"
+    if scope:
+        name += "_" + re.sub(r"[^A-Z0-9]+", "_", scope.upper()).strip("_")
+    return name
+
+
+def _limit(provider: str, kind: str, default: float, scope: Optional[str] = None) -> float:
+    for prefix in ([_env_name(provider, scope)] if scope else []) + [_env_name(provider)]:
+        value = os.getenv(f"{prefix}_{kind}")
+        if value in (None, ""):
+            continue
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            logger.warning(f"Ignoring invalid {prefix}_{kind}={value!r}")
+    return float(default)
+
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute buckets plus a daily budget for one provider (or one
+    model of it, when scope is given), stored in SQLite. Buckets hold up to one minute of capacity and refill continuously. Token usage that is
+    only known after a call (LLM output) is charged with record() and may take a bucket below zero,
+    which makes later callers wait for the overdraft to refill.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        rpm: float = 0,
+        tpm: float = 0,
+        daily: float = 0,
+        path: Optional[Path] = None,
+        scope: Optional[str] = None,
+    ):
+        self.provider = provider
+        self.scope = scope
+        # Bucket and daily usage key: the provider, or provider:model for per-model limits.
+        self.key = f"{provider}:{scope}" if scope else provider
+        self.rpm = rpm
+        self.tpm = tpm
+        self.daily = daily
+        self.path = Path(path or DEFAULT_CACHE_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._transaction() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_buckets ("
+                " bucket TEXT PRIMARY KEY, level REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_usage ("
+                " provider TEXT NOT NULL, day TEXT NOT NULL, used REAL NOT NULL, PRIMARY KEY (provider, day))"
+            )
+
+    @classmethod
+    def from_env(cls, provider: str, scope: Optional[str] = None) -> "RateLimiter":
+        rpm, tpm, daily = DEFAULT_LIMITS.get(provider, (0, 0, 0))
+        return cls(
+            provider,
+            rpm=_limit(provider, "RPM", rpm, scope),
+            tpm=_limit(provider, "TPM", tpm, scope),
+            daily=_limit(provider, "DAILY", daily, scope),
+            scope=scope,
+        )
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # BEGIN IMMEDIATE takes the write lock up front, so read-refill-debit is atomic across processes.
+        conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def _buckets(self) -> dict:
+        """bucket name -> capacity (per minute) for the enabled limits."""
+        buckets = {}
+        if self.rpm:
+            buckets[f"{self.key}:rpm"] = self.rpm
+        if self.tpm:
+            buckets[f"{self.key}:tpm"] = self.tpm
+        return buckets
+
+    @staticmethod
+    def _level(conn: sqlite3.Connection, bucket: str, capacity: float, now: float) -> float:
+        row = conn.execute("SELECT level, updated_at FROM rate_buckets WHERE bucket = ?", (bucket,)).fetchone()
+        if row is None:
+            return capacity
+        level, updated_at = row
+        return min(capacity, level + max(0.0, now - updated_at) * capacity / 60.0)
+
+    @staticmethod
+    def _store(conn: sqlite3.Connection, bucket: str, level: float, now: float) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO rate_buckets (bucket, level, updated_at) VALUES (?, ?, ?)", (bucket, level, now)
+        )
+
+    def _used_today(self, conn: sqlite3.Connection) -> float:
+        row = conn.execute(
+            "SELECT used FROM rate_usage WHERE provider = ? AND day = ?", (self.key, date.today().isoformat())
+        ).fetchone()
+        return row[0] if row else 0.0
+
+    def acquire(self, tokens: float = 0, max_wait: Optional[float] = None) -> float:
+        """
+        Take one request (and tokens, for token-limited providers) from the buckets, waiting for them
+        to refill if needed. Returns the seconds waited. Raises QuotaExceeded when the daily budget is
+        spent and RateLimitError when admission would take longer than max_wait.
+        """
+        max_wait = MAX_WAIT if max_wait is None else max_wait
+        started = time.monotonic()
+        while True:
+            now = time.time()
+            with self._transaction() as conn:
+                if self.daily and self._used_today(conn) >= self.daily:
+                    raise QuotaExceeded(f"Daily {self.key} budget of {self.daily:g} is used up")
+                wait = 0.0
+                levels = {}
+                for bucket, capacity in self._buckets().items():
+                    # A request larger than a whole minute of capacity waits for a full bucket, then overdraws it.
+                    need = 1.0 if bucket.endswith(":rpm") else min(float(tokens), capacity)
+                    levels[bucket] = self._level(conn, bucket, capacity, now)
+                    if levels[bucket] < need:
+                        wait = max(wait, (need - levels[bucket]) * 60.0 / capacity)
+                if not wait:
+                    for bucket, level in levels.items():
+                        self._store(conn, bucket, level - (1.0 if bucket.endswith(":rpm") else tokens), now)
+                    waited = time.monotonic() - started
+                    if waited >= 1:
+                        logger.info(f"{self.key} call waited {waited:.1f}s for rate limit")
+                    return waited
+            waited = time.monotonic() - started
+            if waited + wait > max_wait:
+                raise RateLimitError(
+                    f"{self.key} rate limit: call would wait {waited + wait:.0f}s (RATE_LIMIT_MAX_WAIT={max_wait:g})"
+                )
+            time.sleep(min(wait, MAX_SLEEP))
+
+    def record(self, tokens: float = 0, spent: float = 0) -> None:
+        """
+        Charge usage known only after a call: tokens beyond what acquire() took go against the
+        tokens-per-minute bucket, and spent (tokens for OpenAI, credits for the tool APIs) against
+        today's budget.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            if tokens and self.tpm:
+                bucket = f"{self.key}:tpm"
+                self._store(conn, bucket, self._level(conn, bucket, self.tpm, now) - tokens, now)
+            if spent:
+                conn.execute(
+                    "INSERT INTO rate_usage (provider, day, used) VALUES (?, ?, ?)"
+                    " ON CONFLICT (provider, day) DO UPDATE SET used = used + excluded.used",
+                    (self.key, date.today().isoformat(), spent),
+                )
+
+    def throttle(self) -> None:
+        """Empty the request bucket after a 429, so every caller backs off instead of just this one."""
+        if not self.rpm:
+            return
+        with self._transaction() as conn:
+            self._store(conn, f"{self.key}:rpm", 0.0, time.time())
+
+    def used_today(self) -> float:
+        with self._transaction() as conn:
+            return self._used_today(conn)
+
+
+_limiters: dict = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(provider: str, scope: Optional[str] = None) -> RateLimiter:
+    """Process-wide limiter for provider (or one model of it), configured from the environment on first use."""
+    key = (provider, scope, str(DEFAULT_CACHE_PATH))
+    with _limiters_lock:
+        if key not in _limiters:
+            _limiters[key] = RateLimiter.from_env(provider, scope)
+        return _limiters[key]
+
+
+def limit_llm(llm, provider: str = OPENAI):
+    """
+    Wrap llm.call so each call first takes its estimated input tokens from the buckets of the LLM's
+    current model (read per call, so a model switched by routing.py is limited as itself); output
+    tokens are charged once the response is back. Safe to call again on the same LLM.
+    """
+    from .tokens import count_tokens, messages_text
+
+    if getattr(llm, "_rate_limited", False):
+        return llm
+    original_call = llm.call
+
+    def call(messages, *args, **kwargs):
+        model = getattr(llm, "model", "unknown")
+        limiter = get_limiter(provider, model)
+        input_tokens = count_tokens(messages_text(messages), model)
+        limiter.acquire(tokens=input_tokens)
+        response = original_call(messages, *args, **kwargs)
+        output_tokens = count_tokens(response if isinstance(response, str) else str(response), model)
+        limiter.record(tokens=output_tokens, spent=input_tokens + output_tokens)
+        return response
+
+    # object.__setattr__ so this also works when the LLM class is a pydantic model.
+    object.__setattr__(llm, "call", call)
+    object.__setattr__(llm, "_rate_limited", True)
+    return llm
@@ -0,0 +1,57 @@
+"""
+Token counting for prompt budgeting. Uses tiktoken when it is installed and its encoding can be loaded
+(it is downloaded on first use, so this can fail offline), otherwise a ~4 characters per token estimate.
+"""
+import json
+from functools import lru_cache
+
+DEFAULT_MODEL = "gpt-4o"
+
+
+@lru_cache(maxsize=8)
+def _encoding(model: str):
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # Cached like an encoding, so the estimate is used for the rest of the process.
+        print(f"tiktoken encoding for {model} unavailable ({type(e).__name__}: {e}); estimating ~4 characters per token")
+        return None
+
+
+def count_tokens(text: str, model: str = DEFAULT_MODEL) -> int:
+    """Number of tokens text would use for the given model."""
+    if not text:
+        return 0
+    encoding = _encoding(model)
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_tokens(text: str, max_tokens: int, model: str = DEFAULT_MODEL) -> str:
+    """The start of text, at most max_tokens tokens long."""
+    if max_tokens <= 0 or not text:
+        return ""
+    encoding = _encoding(model)
+    if encoding is None:
+        return text[: max_tokens * 4]
+    tokens = encoding.encode(text, disallowed_special=())
+    return text if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens])
+
+
+def messages_text(messages) -> str:
+    """Plain text of an LLM call's messages (a prompt string or a list of chat messages)."""
+    if isinstance(messages, str):
+        return messages
+    parts = []
+    for message in messages or []:
+        content = message.get("content") if isinstance(message, dict) else message
+        parts.append(content if isinstance(content, str) else json.dumps(content, default=str))
+    return "\n".join(parts)
@@ -0,0 +1,53 @@
+"""
+URL and search query normalization (LinkedIn profiles, web results, Firecrawl queries), kept free of
+heavy imports so report indexing, change detection and the evidence store can use it without loading
+the tools.
+"""
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Trailing locale segment LinkedIn appends to profile URLs, e.g. /in/jane-doe/en or /in/jane-doe/de-de
+_LOCALE_SEGMENT = re.compile(r"^[a-z]{2}(-[a-z]{2})?$")
+
+# Typographic quotes to ASCII. Apostrophes stay apostrophes ("O'Brien"): only double quotes are phrase operators.
+_QUOTES = str.maketrans({"“": '"', "”": '"', "„": '"', "‘": "'", "’": "'"})
+
+
+def normalize_linkedin_url(linkedin_url: str) -> str:
+    """
+    Canonical cache key for a profile URL: lower-case host and path without scheme, "www." or
+    country subdomain, query string, fragment, trailing slash or locale subpath.
+    e.g. "https://uk.linkedin.com/in/Jane-Doe/en/?trk=x" -> "linkedin.com/in/jane-doe"
+    """
+    raw = linkedin_url.strip()
+    if "://" not in raw:
+        raw = "https://" + raw
+    parts = urlsplit(raw)
+    host = parts.netloc.lower().split("@")[-1].split(":")[0]
+    if host.endswith("linkedin.com"):
+        host = "linkedin.com"
+    segments = [seg for seg in parts.path.lower().split("/") if seg]
+    # Profile paths are /in/<slug>; anything after the slug is a locale or sub-page.
+    if len(segments) >= 2 and segments[0] in ("in", "pub"):
+        segments = segments[:2]
+    elif segments and _LOCALE_SEGMENT.match(segments[-1]):
+        segments = segments[:-1]
+    return "/".join([host] + segments)
+
+
+def normalize_result_url(url: str) -> str:
+    """Identity of a search result: host/path without scheme, www., fragment, trailing slash or utm_* params."""
+    raw = url.strip()
+    if raw and "://" not in raw:
+        raw = "https://" + raw
+    parts = urlsplit(raw)
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode([(k, v) for k, v in parse_qsl(parts.query) if not k.lower().startswith("utm_")])
+    return urlunsplit(("", host, parts.path.rstrip("/"), query, "")).lstrip("/")
+
+
+def normalize_query(query: str) -> str:
+    """Cache key for a query: case, whitespace and typographic quote style do not change what Firecrawl returns."""
+    return re.sub(r"\s+", " ", query.translate(_QUOTES)).strip().lower()